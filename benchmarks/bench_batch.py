@@ -0,0 +1,24 @@
+"""Benchmarks for :mod:`composites.batch`
+
+"""
+import numpy as np
+
+from composites.batch import evaluate_stacks
+
+
+materials = np.array([[142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9, 1600.]])
+
+
+class Batch:
+    params = [16, 64]
+    param_names = ['num_plies']
+
+    def setup(self, num_plies):
+        rng = np.random.default_rng(0)
+        num = 10000
+        self.rows = np.hstack((
+            rng.choice([0., 45., -45., 90.], (num, num_plies)),
+            np.full((num, num_plies), 0.125e-3), np.zeros((num, 2))))
+
+    def time_evaluate_stacks(self, num_plies):
+        evaluate_stacks(self.rows, materials)
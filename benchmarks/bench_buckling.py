@@ -0,0 +1,25 @@
+"""Benchmarks for :mod:`composites.buckling`
+
+"""
+import numpy as np
+
+from composites.buckling import calc_buckling_factors
+
+
+D = [0.66, 0.47, 0.05, 0.66, 0.05, 0.49]
+a = 0.508
+b = 0.254
+
+
+class CalcBucklingFactors:
+    params = [[1, 1000], [4, 8]]
+    param_names = ['num_panels', 'num_terms']
+
+    def setup(self, num_panels, num_terms):
+        rng = np.random.default_rng(0)
+        self.D = np.array(D)*rng.uniform(0.8, 1.2, (num_panels, 6))
+        self.loads = rng.uniform(-100, 100, (10, 3))
+        calc_buckling_factors(a, b, self.D, self.loads, num_terms, num_terms)
+
+    def time_calc_buckling_factors(self, num_panels, num_terms):
+        calc_buckling_factors(a, b, self.D, self.loads, num_terms, num_terms)
@@ -0,0 +1,36 @@
+"""Benchmarks for :mod:`composites.cards`
+
+"""
+import io
+
+import numpy as np
+
+from composites.core import calc_ABD_batch
+from composites.utils import read_laminaprop, laminated_plate
+from composites.cards import write_nastran_pshell, write_nastran_pcomp
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+plyt = 0.125e-3
+
+
+class NastranCards:
+    def setup(self):
+        rng = np.random.default_rng(0)
+        stacks = rng.choice([0., 45., -45., 90.], (10000, 16))
+        plyts = np.full(16, plyt)
+        ABD, Atrans = calc_ABD_batch(stacks, plyts,
+                                     read_laminaprop(laminaprop))
+        # NOTE each laminate repeated 10 times, as in a finite element model
+        self.ABD = np.repeat(np.asarray(ABD), 10, axis=0)
+        self.Atrans = np.repeat(np.asarray(Atrans), 10, axis=0)
+        self.h = np.full(self.ABD.shape[0], 16*plyt)
+        self.laminates = [laminated_plate(stack, plyt=plyt,
+                                          laminaprop=laminaprop)
+                          for stack in stacks[:1000]]*10
+
+    def time_write_nastran_pshell(self):
+        write_nastran_pshell(io.StringIO(), self.ABD, self.h, self.Atrans)
+
+    def time_write_nastran_pcomp(self):
+        write_nastran_pcomp(io.StringIO(), self.laminates)
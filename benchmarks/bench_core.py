@@ -0,0 +1,187 @@
+"""Benchmarks for :mod:`composites.core`
+
+Run with ``asv run``, see ``asv.conf.json`` at the root of the repository.
+
+"""
+import numpy as np
+
+from composites.utils import read_laminaprop, laminated_plate
+from composites.utils import n_double_laminate as n_double_laminate_utils
+from composites.stacking import (laminate_from_stack_notation,
+        blended_laminates)
+from composites.core import (GradABD, laminate_from_LaminationParameters,
+        n_double_laminate, calc_scf_batch, calc_ply_grad_batch, calc_ABD_batch,
+        calc_ABD_batch_into, calc_LP_batch, calc_ABD_from_LP_batch)
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+plyt = 0.125e-3
+
+
+def quasi_isotropic_stack(num_plies):
+    return [[0, 45, -45, 90][i % 4] for i in range(num_plies)]
+
+
+class LaminatedPlate:
+    params = ([4, 16, 64, 256, 1000], [True, False])
+    param_names = ['num_plies', 'calc_scf']
+
+    def setup(self, num_plies, calc_scf):
+        self.stack = quasi_isotropic_stack(num_plies)
+
+    def time_laminated_plate(self, num_plies, calc_scf):
+        laminated_plate(self.stack, plyt=plyt, laminaprop=laminaprop,
+                calc_scf=calc_scf)
+
+    def time_laminated_plate_lazy_intrho(self, num_plies, calc_scf):
+        laminated_plate(self.stack, plyt=plyt, laminaprop=laminaprop,
+                calc_scf=calc_scf, lazy=True).intrho
+
+
+class StackNotation:
+    params = [1, 4, 16, 64]
+    param_names = ['repeat']
+
+    def setup(self, repeat):
+        self.notation = '[(±45/0/90)_%d]_s' % repeat
+
+    def time_laminate_from_stack_notation(self, repeat):
+        laminate_from_stack_notation(self.notation, plyt, laminaprop)
+
+
+class BlendedLaminates:
+    params = [10, 100, 1000]
+    param_names = ['num_panels']
+
+    def setup(self, num_panels):
+        self.guide = laminated_plate(quasi_isotropic_stack(64), plyt=plyt,
+                laminaprop=laminaprop)
+        self.drop_order = np.arange(32, 0, -1)
+        self.num_plies = np.random.default_rng(0).integers(32, 65, num_panels)
+
+    def time_blended_laminates(self, num_panels):
+        blended_laminates(self.guide, self.drop_order, self.num_plies)
+
+
+class LaminateMethods:
+    params = [4, 16, 64, 256, 1000]
+    param_names = ['num_plies']
+
+    def setup(self, num_plies):
+        stack = quasi_isotropic_stack(num_plies)
+        self.lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop)
+
+    def time_calc_constitutive_matrix(self, num_plies):
+        self.lam.calc_constitutive_matrix()
+
+    def time_calc_scf(self, num_plies):
+        self.lam.calc_scf()
+
+    def time_calc_equivalent_properties(self, num_plies):
+        self.lam.calc_equivalent_properties()
+
+    def time_calc_lamination_parameters(self, num_plies):
+        self.lam.calc_lamination_parameters()
+
+
+class CalcSCFBatch:
+    params = [16, 64, 256]
+    param_names = ['num_plies']
+
+    def setup(self, num_plies):
+        self.thetadegs = np.array([quasi_isotropic_stack(num_plies)]*1000,
+                dtype=np.float64)
+        self.plyts = np.full(num_plies, plyt)
+        self.matlamina = read_laminaprop(laminaprop)
+
+    def time_calc_scf_batch(self, num_plies):
+        calc_scf_batch(self.thetadegs, self.plyts, self.matlamina)
+
+
+class CalcABDBatch:
+    params = [16, 64]
+    param_names = ['num_plies']
+
+    def setup(self, num_plies):
+        self.thetadegs = np.array([quasi_isotropic_stack(num_plies)]*10000,
+                dtype=np.float64)
+        self.plyts = np.full(num_plies, plyt)
+        self.matlamina = read_laminaprop(laminaprop)
+        self.ABD = np.empty((10000, 6, 6))
+        self.Atrans = np.empty((10000, 2, 2))
+        self.lam = laminated_plate(quasi_isotropic_stack(num_plies),
+                plyt=plyt, laminaprop=laminaprop)
+
+    def time_calc_ABD_batch(self, num_plies):
+        calc_ABD_batch(self.thetadegs, self.plyts, self.matlamina)
+
+    def time_calc_ABD_batch_into(self, num_plies):
+        calc_ABD_batch_into(self.thetadegs, self.plyts, self.matlamina,
+                self.ABD, self.Atrans)
+
+    def time_get_ABD_into(self, num_plies):
+        self.lam.get_ABD_into(self.ABD[0], self.Atrans[0])
+
+    def time_calc_LP_batch(self, num_plies):
+        calc_LP_batch(self.thetadegs, self.plyts)
+
+
+class CalcPlyGradBatch:
+    params = [16, 64]
+    param_names = ['num_plies']
+
+    def setup(self, num_plies):
+        self.thetadegs = np.array([quasi_isotropic_stack(num_plies)]*100,
+                dtype=np.float64)
+        self.plyts = np.full(num_plies, plyt)
+        self.matlamina = read_laminaprop(laminaprop)
+        self.lam = laminated_plate(quasi_isotropic_stack(num_plies),
+                plyt=plyt, laminaprop=laminaprop)
+
+    def time_calc_ply_grad(self, num_plies):
+        self.lam.calc_ply_grad()
+
+    def time_calc_ply_grad_batch(self, num_plies):
+        calc_ply_grad_batch(self.thetadegs, self.plyts, self.matlamina)
+
+
+class LaminationParametersToABD:
+    def setup(self):
+        stack = quasi_isotropic_stack(16)
+        lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop)
+        self.lp = lam.calc_lamination_parameters()
+        self.matlamina = read_laminaprop(laminaprop)
+        self.thickness = lam.h
+        self.gradABD = GradABD()
+        lps = [[self.lp.xiA1, self.lp.xiA2, self.lp.xiA3, self.lp.xiA4,
+                self.lp.xiB1, self.lp.xiB2, self.lp.xiB3, self.lp.xiB4,
+                self.lp.xiD1, self.lp.xiD2, self.lp.xiD3, self.lp.xiD4,
+                self.lp.xiAtrans1, self.lp.xiAtrans2]]*10000
+        self.lps = np.array(lps)
+        self.thicknesses = np.full(10000, lam.h)
+
+    def time_laminate_from_LaminationParameters(self):
+        laminate_from_LaminationParameters(self.thickness, self.matlamina,
+                self.lp)
+
+    def time_calc_ABD_from_LP_batch(self):
+        calc_ABD_from_LP_batch(self.thicknesses, self.lps, self.matlamina)
+
+    def time_calc_LP_grad(self):
+        self.gradABD.calc_LP_grad(self.thickness, self.matlamina, self.lp)
+
+
+class NDoubleLaminate:
+    params = [2, 4, 8]
+    param_names = ['n']
+
+    def setup(self, n):
+        self.angles_deg = np.linspace(0., 90., n)
+
+    def time_core_n_double_laminate(self, n):
+        # NOTE trace_normalize_plane_stress() modifies the material in place
+        matlamina = read_laminaprop(laminaprop)
+        n_double_laminate(1.e-3, n, self.angles_deg, matlamina)
+
+    def time_utils_n_double_laminate(self, n):
+        n_double_laminate_utils(1.e-3, list(self.angles_deg), laminaprop)
@@ -0,0 +1,21 @@
+"""Benchmarks for :mod:`composites.design_rules`
+
+"""
+import numpy as np
+
+from composites.design_rules import calc_rule_violations, is_feasible_stack
+
+
+class DesignRules:
+    params = [16, 64]
+    param_names = ['num_plies']
+
+    def setup(self, num_plies):
+        rng = np.random.default_rng(0)
+        self.stacks = rng.choice([0., 45., -45., 90.], (100000, num_plies))
+
+    def time_calc_rule_violations(self, num_plies):
+        calc_rule_violations(self.stacks)
+
+    def time_is_feasible_stack(self, num_plies):
+        is_feasible_stack(self.stacks, rules=('balance', 'contiguity'))
@@ -0,0 +1,26 @@
+"""Benchmarks for :mod:`composites.envelope`
+
+"""
+import numpy as np
+
+from composites.utils import laminated_plate
+from composites.envelope import calc_min_reserve_factors
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+
+
+class CalcMinReserveFactors:
+    params = [10, 100]
+    param_names = ['num_panels']
+
+    def setup(self, num_panels):
+        rng = np.random.default_rng(0)
+        self.ABD = np.array([laminated_plate(rng.choice([0, 45, -45, 90], 16),
+                plyt=0.125e-3, laminaprop=laminaprop).ABD
+                for _ in range(num_panels)])
+        self.loads = rng.uniform(-2e4, 2e4, (1000, 3))
+
+    def time_calc_min_reserve_factors(self, num_panels):
+        calc_min_reserve_factors(0.5, 0.25, self.ABD, self.loads,
+                allowables=(4500e-6, 3500e-6, 7000e-6))
@@ -0,0 +1,31 @@
+"""Benchmarks for :mod:`composites.evaluator`
+
+"""
+import asyncio
+
+import numpy as np
+
+from composites.evaluator import LaminateEvaluator
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+
+
+class EvaluatorRequests:
+    params = [1, 1000]
+    param_names = ['max_batch_size']
+
+    def setup(self, max_batch_size):
+        rng = np.random.default_rng(0)
+        self.stacks = rng.choice([0., 45., -45., 90.], (1000, 16))
+
+    def time_concurrent_requests(self, max_batch_size):
+
+        async def run():
+            async with LaminateEvaluator(max_batch_size=max_batch_size,
+                                         max_delay=0.001) as evaluator:
+                await asyncio.gather(*(evaluator.evaluate(stack,
+                        plyt=0.125e-3, laminaprop=laminaprop, a=0.5, b=0.3,
+                        load=(1000., 0., 0.)) for stack in self.stacks))
+
+        asyncio.run(run())
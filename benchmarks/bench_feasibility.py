@@ -0,0 +1,21 @@
+"""Benchmarks for :mod:`composites.feasibility`
+
+"""
+import numpy as np
+
+from composites.feasibility import is_feasible_lp, sample_feasible_lp
+
+
+class Feasibility:
+    def setup(self):
+        rng = np.random.default_rng(0)
+        self.lp = rng.uniform(-1, 1, (100000, 14))
+
+    def time_is_feasible_lp(self):
+        is_feasible_lp(self.lp)
+
+    def time_sample_feasible_lp(self):
+        sample_feasible_lp(1000, rng=0)
+
+    def time_sample_feasible_lp_symmetric(self):
+        sample_feasible_lp(1000, symmetric=True, rng=0)
@@ -0,0 +1,32 @@
+"""Benchmarks for :mod:`composites.kassapoglou`
+
+"""
+from composites.kassapoglou import (calc_Nxx_crit, calc_Nxy_crit,
+        calc_Nxx_crit_combined_shear, calc_Nxx_crit_combined_shear_full,
+        calc_beff)
+
+
+D11, D12, D16, D22, D26, D66 = 0.66, 0.47, 0.05, 0.66, 0.05, 0.49
+a = 0.508
+b = 0.254
+
+
+class Kassapoglou:
+    def time_calc_Nxx_crit(self):
+        calc_Nxx_crit(a, b, 1, 1, D11, D12, D22, D66)
+
+    def time_calc_Nxx_crit_search_m(self):
+        calc_Nxx_crit(a, b, None, 1, D11, D12, D22, D66)
+
+    def time_calc_Nxy_crit(self):
+        calc_Nxy_crit(a, D11, D12, D16, D22, D66)
+
+    def time_calc_Nxx_crit_combined_shear(self):
+        calc_Nxx_crit_combined_shear(0.5, a, b, D11, D12, D22, D66)
+
+    def time_calc_Nxx_crit_combined_shear_full(self):
+        calc_Nxx_crit_combined_shear_full(100., a, b, D11, D12, D16, D22,
+                D26, D66)
+
+    def time_calc_beff(self):
+        calc_beff(b, 10., 1., 1.e7, 0.3e7, 1.e7)
@@ -0,0 +1,21 @@
+"""Benchmarks for :mod:`composites.montecarlo`
+
+"""
+from composites.montecarlo import monte_carlo
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+
+
+class MonteCarlo:
+    def setup(self):
+        self.stack = [[0, 45, -45, 90][i % 4] for i in range(16)]
+
+    def time_monte_carlo_ABD(self):
+        monte_carlo(self.stack, 0.125e-3, laminaprop, 10000, cv_e1=0.05,
+                cv_e2=0.05, cv_g12=0.05, cv_plyt=0.03, std_theta=1., rng=0)
+
+    def time_monte_carlo_buckling(self):
+        monte_carlo(self.stack, 0.125e-3, laminaprop, 1000, cv_e1=0.05,
+                cv_e2=0.05, cv_g12=0.05, cv_plyt=0.03, std_theta=1., a=0.4,
+                b=0.3, loads=[[1, 0, 0], [0, 0, 1]], rng=0)
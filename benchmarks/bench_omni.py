@@ -0,0 +1,30 @@
+"""Benchmarks for :mod:`composites.omni`
+
+"""
+import numpy as np
+
+from composites.utils import read_laminaprop
+from composites.omni import (omni_strain_envelope, calc_omni_reserve_factors,
+        _omni_table)
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+
+
+class Omni:
+    def setup(self):
+        self.matlamina = read_laminaprop(laminaprop)
+        self.matlamina.st1 = 2280e6
+        self.matlamina.sc1 = 1440e6
+        self.matlamina.st2 = 57e6
+        self.matlamina.sc2 = 228e6
+        self.matlamina.ss12 = 71e6
+        rng = np.random.default_rng(0)
+        self.strains = rng.uniform(-5e-3, 5e-3, (1000, 100, 3))
+
+    def time_omni_strain_envelope(self):
+        _omni_table.cache_clear()
+        omni_strain_envelope(self.matlamina)
+
+    def time_calc_omni_reserve_factors(self):
+        calc_omni_reserve_factors(self.matlamina, self.strains)
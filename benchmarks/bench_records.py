@@ -0,0 +1,28 @@
+"""Benchmarks for :mod:`composites.records`
+
+"""
+import numpy as np
+
+from composites.utils import laminated_plate
+from composites.records import (records_from_laminates, ABD_from_records,
+        laminate_from_record)
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+
+
+class Records:
+    def setup(self):
+        rng = np.random.default_rng(0)
+        self.lams = [laminated_plate(rng.choice([0, 45, -45, 90], 16),
+                plyt=0.125e-3, laminaprop=laminaprop) for _ in range(1000)]
+        self.records = records_from_laminates(self.lams, float32=True)
+
+    def time_records_from_laminates(self):
+        records_from_laminates(self.lams)
+
+    def time_ABD_from_records(self):
+        ABD_from_records(self.records)
+
+    def time_laminate_from_record(self):
+        laminate_from_record(self.records[0])
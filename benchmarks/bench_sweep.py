@@ -0,0 +1,27 @@
+"""Benchmarks for :mod:`composites.sweep`
+
+"""
+import tempfile
+
+import numpy as np
+
+from composites.sweep import Sweep, stacks_from_indices
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+
+
+class SweepShard:
+    def setup(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.sweep = Sweep(self.tmp.name, [0, 45, -45, 90, 30, -30], 16,
+                           0.125e-3, laminaprop, shard_size=10000)
+
+    def teardown(self):
+        self.tmp.cleanup()
+
+    def time_stacks_from_indices(self):
+        stacks_from_indices(np.arange(100000), [0, 45, -45, 90], 16)
+
+    def time_evaluate_shard(self):
+        self.sweep.evaluate(1)
@@ -0,0 +1,31 @@
+"""Benchmarks for :mod:`composites.thermal`
+
+"""
+import numpy as np
+
+from composites.utils import laminated_plate
+from composites.thermal import ThermalLaminate
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+
+
+class Thermal:
+    def setup(self):
+        stack = [[0, 45, -45, 90][i % 4] for i in range(32)]
+        self.lam = laminated_plate(stack, plyt=0.125e-3, laminaprop=laminaprop)
+        for ply in self.lam.plies:
+            ply.matlamina.a1 = -0.3e-6
+            ply.matlamina.a2 = 28e-6
+            ply.matlamina.tref = 180.
+        self.thermal = ThermalLaminate(self.lam)
+        self.T = np.linspace(-55., 120., 100000)
+
+    def time_ThermalLaminate(self):
+        ThermalLaminate(self.lam)
+
+    def time_calc_resultants(self):
+        self.thermal.calc_resultants(self.T, 100.)
+
+    def time_calc_ply_stresses(self):
+        self.thermal.calc_ply_stresses(self.T[:1000], 100.)
@@ -64,6 +64,51 @@ and when transverse shear stiffnesses are required, with ``shape=(2, 2)``::
 .. automodule:: composites.kassapoglou
     :members:
 
+.. automodule:: composites.stacking
+    :members:
+
+.. automodule:: composites.buckling
+    :members:
+
+.. automodule:: composites.envelope
+    :members:
+
+.. automodule:: composites.records
+    :members:
+
+.. automodule:: composites.field
+    :members:
+
+.. automodule:: composites.thermal
+    :members:
+
+.. automodule:: composites.feasibility
+    :members:
+
+.. automodule:: composites.omni
+    :members:
+
+.. automodule:: composites.montecarlo
+    :members:
+
+.. automodule:: composites.batch
+    :members:
+
+.. automodule:: composites.sweep
+    :members:
+
+.. automodule:: composites.evaluator
+    :members:
+
+.. automodule:: composites.design_rules
+    :members:
+
+.. automodule:: composites.cards
+    :members:
+
+.. automodule:: composites.profiling
+    :members:
+
 """
 import os
 
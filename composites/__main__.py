@@ -0,0 +1,81 @@
+r"""Command line interface, see ``python -m composites --help``"""
+import argparse
+import sys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m composites',
+            description='Methods for analysis and design of composites')
+    subparsers = parser.add_subparsers(dest='command')
+
+    batch = subparsers.add_parser('batch',
+            help='evaluate stacking sequences from a CSV or .npy file',
+            description='Evaluate the stacking sequences of a CSV or .npy '
+            'file with rows (angles, ply thicknesses, material id, offset) '
+            'and write the ABD matrices, lamination parameters and '
+            'equivalent properties to a .npy or .csv file, see '
+            'composites.batch.')
+    batch.add_argument('input', help='stacks file (.csv or .npy)')
+    batch.add_argument('output', help='results file (.csv or .npy)')
+    batch.add_argument('--materials', required=True,
+            help='materials file (.csv or .npy) with rows (e1, e2, nu12, '
+            'g12, g13, g23[, rho])')
+    batch.add_argument('--chunk-size', type=int, default=10000,
+            help='number of rows evaluated at once (default: %(default)s)')
+    batch.add_argument('--workers', type=int, default=1,
+            help='number of worker processes (default: %(default)s)')
+    batch.add_argument('--float32', action='store_true',
+            help='store the results in single precision')
+
+    sweep = subparsers.add_parser('sweep',
+            help='evaluate all the stacking sequences with a number of plies',
+            description='Evaluate all the stacking sequences with a number '
+            'of plies in resumable shards written to a directory. Several '
+            'processes can run the same sweep at the same time, see '
+            'composites.sweep.')
+    sweep.add_argument('directory', help='directory of the sweep')
+    sweep.add_argument('--angles', type=float, nargs='+', required=True,
+            help='possible ply angles in degrees')
+    sweep.add_argument('--num-plies', type=int, required=True,
+            help='number of plies')
+    sweep.add_argument('--plyt', type=float, required=True,
+            help='ply thickness')
+    sweep.add_argument('--laminaprop', type=float, nargs='+', required=True,
+            help='material properties, see composites.utils.read_laminaprop')
+    sweep.add_argument('--rho', type=float, default=0.,
+            help='material density (default: %(default)s)')
+    sweep.add_argument('--offset', type=float, default=0.,
+            help='laminate offset (default: %(default)s)')
+    sweep.add_argument('--symmetric', action='store_true',
+            help='enumerate only symmetric stacking sequences')
+    sweep.add_argument('--shard-size', type=int, default=100000,
+            help='stacking sequences per shard (default: %(default)s)')
+    sweep.add_argument('--float32', action='store_true',
+            help='store the results in single precision')
+    sweep.add_argument('--max-shards', type=int, default=None,
+            help='maximum number of shards evaluated by this process')
+
+    args = parser.parse_args(argv)
+    if args.command == 'batch':
+        from .batch import run_batch
+        num = run_batch(args.input, args.output, args.materials,
+                        chunk_size=args.chunk_size, workers=args.workers,
+                        float32=args.float32)
+        print('%d laminates written to %s' % (num, args.output))
+    elif args.command == 'sweep':
+        from .sweep import Sweep
+        sweep = Sweep(args.directory, args.angles, args.num_plies, args.plyt,
+                      args.laminaprop, rho=args.rho, offset=args.offset,
+                      symmetric=args.symmetric, shard_size=args.shard_size,
+                      float32=args.float32)
+        num = sweep.run(max_shards=args.max_shards)
+        print('%d shards evaluated, %d of %d shards written to %s' % (num,
+              len(sweep.done_shards()), sweep.num_shards, args.directory))
+    else:
+        parser.print_help()
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,379 @@
+r"""
+====================================
+Batch runs (:mod:`composites.batch`)
+====================================
+
+.. currentmodule::composites.batch
+
+Evaluation of large numbers of stacking sequences read from CSV or ``.npy``
+files, also available from the command line::
+
+    python -m composites batch stacks.csv results.npy --materials mat.csv --workers 4
+
+Each input row contains the ply angles, the ply thicknesses, the material
+id and the offset of one laminate, i.e. ``2*n_plies + 2`` columns. The
+material id is the row of the materials file, whose columns are ``(e1, e2,
+nu12, g12, g13, g23)``, optionally followed by the density ``rho``.
+
+The rows are read in chunks, evaluated with
+:func:`composites.core.calc_ABD_LP_batch`, optionally in several worker
+processes, and the results are appended to the output file, such that the
+memory does not depend on the number of rows. The results are records with
+the fields of :func:`composites.records.laminate_dtype` followed by the
+equivalent properties of :data:`.EQUIVALENT_NAMES`. A ``.npy`` output is a
+structured array that can be used with :mod:`composites.records`, and a
+``.csv`` output has one column per term, where the terms of the lower-left
+``B`` block of the ``ABD`` matrix are named ``B21``, ``B61`` and ``B62``.
+
+"""
+import os
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from .core import calc_ABD_LP_batch
+from .records import (laminate_dtype, records_from_arrays, _ATRANS_NAMES,
+                      _LP_NAMES)
+from .montecarlo import EQUIVALENT_NAMES, _equivalent_properties
+
+
+def result_dtype(float32=False):
+    r"""Structured dtype of the results
+
+    Parameters
+    ----------
+    float32 : bool, optional
+        If the fields are stored in single precision.
+
+    Returns
+    -------
+    dtype : np.dtype
+        The fields of :func:`composites.records.laminate_dtype` followed by
+        the equivalent properties of :data:`.EQUIVALENT_NAMES`.
+
+    """
+    t = np.float32 if float32 else np.float64
+    return np.dtype(laminate_dtype(float32).descr
+                    + [(name, t) for name in EQUIVALENT_NAMES])
+
+
+def _is_header(line):
+    try:
+        float(line.split(',')[0])
+    except ValueError:
+        return True
+    return False
+
+
+def _csv_lines(f):
+    # NOTE skipping empty lines, comments and an optional header line
+    first = True
+    for line in f:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if first:
+            first = False
+            if _is_header(line):
+                continue
+        yield line
+
+
+def _load(path):
+    if os.path.splitext(path)[1] == '.npy':
+        return np.load(path, mmap_mode='r')
+    with open(path) as f:
+        return np.loadtxt(list(_csv_lines(f)), delimiter=',', ndmin=2)
+
+
+def read_materials(materials):
+    r"""Materials of the batch runs
+
+    Parameters
+    ----------
+    materials : str or array-like
+        Path to a CSV or ``.npy`` file, or array with ``shape=(n_materials,
+        6)`` or ``(n_materials, 7)``, see :mod:`composites.batch`. The CSV
+        file may have a header line, as in :func:`.iter_stack_chunks`.
+
+    Returns
+    -------
+    materials : array
+        The materials with ``shape=(n_materials, 7)``, with a null density
+        when not given.
+
+    """
+    if isinstance(materials, str):
+        materials = _load(materials)
+    materials = np.atleast_2d(np.asarray(materials, dtype=np.float64))
+    if materials.shape[1] == 6:
+        materials = np.hstack((materials, np.zeros((materials.shape[0], 1))))
+    if materials.ndim != 2 or materials.shape[1] != 7:
+        raise ValueError('materials must have 6 or 7 columns')
+    return materials
+
+
+def iter_stack_chunks(path, chunk_size=10000):
+    r"""Read the rows of a stacks file in chunks
+
+    Parameters
+    ----------
+    path : str
+        Path to a ``.npy`` file with a 2D array, or to a CSV file with
+        comma-separated values, optionally with a header line. Lines
+        starting with ``#`` are ignored.
+    chunk_size : int, optional
+        Maximum number of rows of each chunk.
+
+    Yields
+    ------
+    rows : array
+        The rows with ``shape=(n, 2*n_plies + 2)``.
+
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+    if os.path.splitext(path)[1] == '.npy':
+        stacks = np.load(path, mmap_mode='r')
+        if stacks.ndim != 2:
+            raise ValueError('The stacks array must be 2D')
+        for start in range(0, stacks.shape[0], chunk_size):
+            yield np.array(stacks[start:start + chunk_size], dtype=np.float64)
+        return
+    with open(path) as f:
+        lines = []
+        for line in _csv_lines(f):
+            lines.append(line)
+            if len(lines) == chunk_size:
+                yield np.loadtxt(lines, delimiter=',', ndmin=2)
+                lines = []
+        if lines:
+            yield np.loadtxt(lines, delimiter=',', ndmin=2)
+
+
+def evaluate_stacks(rows, materials, float32=False):
+    r"""Evaluate rows of stacking sequences
+
+    Parameters
+    ----------
+    rows : array-like
+        The rows with ``shape=(N, 2*n_plies + 2)``, see
+        :mod:`composites.batch`.
+    materials : array-like
+        The materials, see :func:`.read_materials`.
+    float32 : bool, optional
+        If the results are stored in single precision.
+
+    Returns
+    -------
+    results : array
+        Structured array with ``shape=(N,)`` and dtype
+        :func:`.result_dtype`.
+
+    """
+    rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+    materials = read_materials(materials)
+    num_cols = rows.shape[1]
+    if num_cols < 4 or num_cols % 2 != 0:
+        raise ValueError('Each row must have 2*n_plies + 2 columns')
+    n = (num_cols - 2)//2
+    thetadegs = np.ascontiguousarray(rows[:, :n])
+    plyts = np.ascontiguousarray(rows[:, n:2*n])
+    ids = rows[:, 2*n]
+    offsets = np.ascontiguousarray(rows[:, 2*n + 1])
+    if (np.any(ids != np.round(ids)) or np.any(ids < 0)
+            or np.any(ids >= materials.shape[0])):
+        raise ValueError('Invalid material ids')
+    mats = materials[ids.astype(np.intp)]
+    ABD, Atrans, lp = calc_ABD_LP_batch(thetadegs, plyts,
+                                        np.ascontiguousarray(mats[:, :6]),
+                                        offsets)
+    h = plyts.sum(axis=1)
+    rho = mats[:, 6]
+    zbot = -h/2 + offsets
+    ztop = h/2 + offsets
+    records = records_from_arrays(ABD, Atrans, lp, h=h, offset=offsets,
+            intrho=rho*h, intrhoz=rho*(ztop**2 - zbot**2)/2,
+            intrhoz2=rho*(ztop**3 - zbot**3)/3, float32=float32)
+    results = np.empty(rows.shape[0], dtype=result_dtype(float32))
+    for name in records.dtype.names:
+        results[name] = records[name]
+    equivalent = _equivalent_properties(ABD, h)
+    for i, name in enumerate(EQUIVALENT_NAMES):
+        results[name] = equivalent[:, i]
+    return results
+
+
+def _npy_header(dtype, num):
+    # NOTE fixed width of the number of rows, such that the header can be
+    #      rewritten in place once the number of rows is known
+    header = "{'descr': %r, 'fortran_order': False, 'shape': (%20d,), }" % (
+             np.lib.format.dtype_to_descr(dtype), num)
+    size = 64*((10 + len(header) + 1)//64 + 1)
+    header = header + ' '*(size - 10 - len(header) - 1) + '\n'
+    return (b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header))
+            + header.encode('latin1'))
+
+
+class NpyWriter(object):
+    r"""Append structured records to a ``.npy`` file
+
+    The file is valid after :meth:`.close`.
+
+    Parameters
+    ----------
+    path : str
+        Path of the output file.
+    dtype : np.dtype
+        Structured dtype of the records.
+
+    """
+    def __init__(self, path, dtype):
+        self.dtype = np.dtype(dtype)
+        self.num = 0
+        self._file = open(path, 'wb')
+        self._file.write(_npy_header(self.dtype, 0))
+
+    def write(self, records):
+        r"""Append records"""
+        records = np.ascontiguousarray(records, dtype=self.dtype)
+        self._file.write(records.tobytes())
+        self.num += records.shape[0]
+
+    def close(self):
+        r"""Write the number of records and close the file"""
+        self._file.seek(0)
+        self._file.write(_npy_header(self.dtype, self.num))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# NOTE unique names of the ABD terms, where the terms of the lower-left B
+#      block, equal to B12, B16 and B26, are named after their position
+_ABD_COLUMNS = ('A11', 'A12', 'A16', 'B11', 'B12', 'B16',
+                'A22', 'A26', 'B21', 'B22', 'B26',
+                'A66', 'B61', 'B62', 'B66',
+                'D11', 'D12', 'D16',
+                'D22', 'D26',
+                'D66')
+
+
+def _column_names(dtype):
+    names = []
+    for name in dtype.names:
+        if name == 'ABD':
+            names.extend(_ABD_COLUMNS)
+        elif name == 'Atrans':
+            names.extend(_ATRANS_NAMES)
+        elif name == 'lp':
+            names.extend(_LP_NAMES)
+        else:
+            names.append(name)
+    return names
+
+
+class CsvWriter(object):
+    r"""Append structured records to a CSV file, one column per term
+
+    Parameters
+    ----------
+    path : str
+        Path of the output file.
+    dtype : np.dtype
+        Structured dtype of the records.
+
+    """
+    def __init__(self, path, dtype):
+        self.dtype = np.dtype(dtype)
+        self.num = 0
+        self._fmt = '%.9g' if self.dtype[0].base == np.float32 else '%.17g'
+        self._file = open(path, 'w')
+        self._file.write(','.join(_column_names(self.dtype)) + '\n')
+
+    def write(self, records):
+        r"""Append records"""
+        records = np.asarray(records, dtype=self.dtype)
+        columns = [records[name].reshape(records.shape[0], -1)
+                   for name in self.dtype.names]
+        np.savetxt(self._file, np.hstack(columns), fmt=self._fmt,
+                   delimiter=',')
+        self.num += records.shape[0]
+
+    def close(self):
+        r"""Close the file"""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def open_writer(path, dtype):
+    r"""Writer of :class:`.NpyWriter` or :class:`.CsvWriter` according to
+    the extension of ``path``"""
+    if os.path.splitext(path)[1] == '.npy':
+        return NpyWriter(path, dtype)
+    return CsvWriter(path, dtype)
+
+
+def _imap(function, iterable, workers):
+    if workers <= 1:
+        for item in iterable:
+            yield function(item)
+        return
+    # NOTE at most 2*workers chunks are pending, keeping the memory bounded
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for item in iterable:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= 2*workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_batch(input_path, output_path, materials, chunk_size=10000,
+        workers=1, float32=False):
+    r"""Evaluate a stacks file and write the results
+
+    Parameters
+    ----------
+    input_path : str
+        Stacks file, see :func:`.iter_stack_chunks`.
+    output_path : str
+        Output ``.npy`` or ``.csv`` file.
+    materials : str or array-like
+        The materials, see :func:`.read_materials`.
+    chunk_size : int, optional
+        Number of rows evaluated at once.
+    workers : int, optional
+        Number of worker processes.
+    float32 : bool, optional
+        If the results are stored in single precision.
+
+    Returns
+    -------
+    num : int
+        Number of evaluated rows.
+
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+    evaluate = partial(evaluate_stacks, materials=read_materials(materials),
+                       float32=float32)
+    with open_writer(output_path, result_dtype(float32)) as writer:
+        for results in _imap(evaluate, iter_stack_chunks(input_path,
+                                                         chunk_size),
+                             workers):
+            writer.write(results)
+    return writer.num
@@ -0,0 +1,174 @@
+r"""
+==========================================
+Ritz buckling (:mod:`composites.buckling`)
+==========================================
+
+.. currentmodule::composites.buckling
+
+Linear buckling of simply supported rectangular plates under combined
+`N_{xx}`, `N_{yy}` and `N_{xy}` using a Ritz method with `M \times N` terms:
+
+.. math::
+
+    w = \sum_{m=1}^{M} \sum_{n=1}^{N} c_{mn} \sin{\frac{m \pi x}{a}}
+        \sin{\frac{n \pi y}{b}}
+
+Contrary to the two-term expansions of :mod:`composites.kassapoglou`, all
+the terms of the D matrix are considered, including D16 and D26, which
+couple the odd and even half-waves.
+
+The integrals of the sine series depend only on `M`, `N` and on the aspect
+ratio `a/b`, and they are computed once and cached, see
+:func:`.ritz_tables`. Many panels and load cases are then evaluated in
+batch with :func:`.calc_buckling_factors`::
+
+    from composites.buckling import calc_buckling_factors
+
+    D = [[lam.D11, lam.D12, lam.D16, lam.D22, lam.D26, lam.D66]
+         for lam in laminates]
+    loads = [[Nxx, 0, 0], [0, 0, Nxy], [Nxx, Nyy, Nxy]]
+    factors = calc_buckling_factors(a, b, D, loads, M=8, N=8)
+
+"""
+from functools import lru_cache
+
+import numpy as np
+from numpy import pi
+
+
+def _sin_cos_table(M):
+    r"""Integrals over `[0, 1]` of `\sin{m \pi \xi} \cos{p \pi \xi}`"""
+    m = np.arange(1, M+1)[:, None]
+    p = np.arange(1, M+1)[None, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table = m*(1 - (-1.)**(m + p))/(pi*(m**2 - p**2))
+    table[m == p] = 0.
+    return table
+
+
+@lru_cache(maxsize=64)
+def ritz_tables(M, N, AR):
+    r"""Nondimensional stiffness and geometric stiffness tables
+
+    The tables are cached per ``(M, N, AR)``.
+
+    Parameters
+    ----------
+    M, N : int
+        Number of half-waves along the plate length and width.
+    AR : float
+        Aspect ratio `a/b`.
+
+    Returns
+    -------
+    K, KG : tuple of arrays
+        ``K`` with ``shape=(6, M*N, M*N)`` contains the stiffness matrices
+        for unit values of ``(D11, D12, D16, D22, D26, D66)``, to be divided
+        by `b^2`. ``KG`` with ``shape=(3, M*N, M*N)`` contains the geometric
+        stiffness matrices for unit values of `N_{xx}`, `N_{yy}` and
+        `N_{xy}`, see :func:`.calc_buckling_factors` for the sign
+        convention. The terms are ordered with ``n`` varying fastest.
+
+    """
+    # NOTE integrals of the products of sine and cosine series over [0, 1],
+    #      the sin*sin and cos*cos integrals are diagonal and equal to 1/2
+    Ix = _sin_cos_table(M)
+    Iy = _sin_cos_table(N)
+    dx = np.eye(M)/2.
+    dy = np.eye(N)/2.
+    # wavenumbers nondimensionalized by b, i.e. kx = m*pi*b/a, ky = n*pi
+    kx = pi*np.arange(1, M+1)/AR
+    ky = pi*np.arange(1, N+1)
+    KX = kx[:, None]
+    PX = kx[None, :]
+    KY = ky[:, None]
+    QY = ky[None, :]
+    # NOTE the area element dx*dy = a*b*dxi*deta = AR*b**2*dxi*deta
+    K = np.zeros((6, M*N, M*N))
+    K[0] = AR*np.kron(KX**2*PX**2*dx, dy)
+    K[1] = AR*(np.kron(KX**2*dx, QY**2*dy) + np.kron(PX**2*dx, KY**2*dy))
+    K[3] = AR*np.kron(dx, KY**2*QY**2*dy)
+    K[5] = 4*AR*np.kron(KX*PX*dx, KY*QY*dy)
+    # w_xx*v_xy + w_xy*v_xx
+    K[2] = -2*AR*(np.kron(KX**2*PX*Ix, QY*Iy) + np.kron(KX*PX**2*Ix.T,
+                                                       KY*Iy.T))
+    # w_yy*v_xy + w_xy*v_yy
+    K[4] = -2*AR*(np.kron(PX*Ix, KY**2*QY*Iy) + np.kron(KX*Ix.T,
+                                                       KY*QY**2*Iy.T))
+    KG = np.zeros((3, M*N, M*N))
+    KG[0] = AR*np.kron(KX*PX*dx, dy)
+    KG[1] = AR*np.kron(dx, KY*QY*dy)
+    # w_x*v_y + w_y*v_x
+    KG[2] = -AR*(np.kron(KX*Ix.T, QY*Iy) + np.kron(PX*Ix, KY*Iy.T))
+    K.flags.writeable = False
+    KG.flags.writeable = False
+    return K, KG
+
+
+def calc_buckling_factors(a, b, D, loads, M=5, N=5):
+    r"""Critical buckling factors of simply supported plates
+
+    For each panel and load case, the critical buckling load is the load
+    case multiplied by the returned factor. The generalized eigenvalue
+    problems of all panels are reduced to standard symmetric eigenvalue
+    problems with one Cholesky factorization per panel, and then solved in
+    batch for each load case.
+
+    Parameters
+    ----------
+    a, b : float
+        Plate length and width.
+    D : array-like
+        The terms ``(D11, D12, D16, D22, D26, D66)`` of each panel, with
+        ``shape=(n_panels, 6)``.
+    loads : array-like
+        The load cases `(N_{xx}, N_{yy}, N_{xy})`, with
+        ``shape=(n_loads, 3)``. As in :mod:`composites.kassapoglou`,
+        `N_{xx}` and `N_{yy}` are positive in compression, whereas `N_{xy}`
+        follows the usual sign convention of the shear stress resultant.
+    M, N : int, optional
+        Number of half-waves along the plate length and width.
+
+    Returns
+    -------
+    factors : array
+        Smallest positive buckling factors with ``shape=(n_panels,
+        n_loads)``, equal to ``np.inf`` when the load case does not cause
+        buckling.
+
+    """
+    D = np.atleast_2d(np.asarray(D, dtype=np.float64))
+    loads = np.atleast_2d(np.asarray(loads, dtype=np.float64))
+    if D.shape[-1] != 6:
+        raise ValueError('D must have shape=(n_panels, 6)')
+    if loads.shape[-1] != 3:
+        raise ValueError('loads must have shape=(n_loads, 3)')
+    H = _reduced_geometric_stiffness(a, b, D, M, N)
+    factors = np.empty((D.shape[0], loads.shape[0]))
+    for i, load in enumerate(loads):
+        factors[:, i] = _smallest_factors(np.einsum('k,kpij->pij', load, H))
+    return factors
+
+
+def _reduced_geometric_stiffness(a, b, D, M, N):
+    r"""Geometric stiffness tables reduced with the stiffness of each panel
+
+    With `K = L L^T`, the problem `K c = \lambda K_G c` becomes the standard
+    eigenvalue problem `L^{-1} K_G L^{-T} y = \mu y` with `\mu =
+    1/\lambda`. The returned ``H`` with ``shape=(3, n_panels, M*N, M*N)``
+    contains `L^{-1} K_G L^{-T}` for unit values of `N_{xx}`, `N_{yy}` and
+    `N_{xy}`, such that any load case is a linear combination of ``H``.
+
+    """
+    Khat, KGhat = ritz_tables(int(M), int(N), float(a/b))
+    K = np.einsum('pk,kij->pij', D, Khat)/b**2
+    Linv = np.linalg.inv(np.linalg.cholesky(K))
+    return np.einsum('pij,kjl,pml->kpim', Linv, KGhat, Linv, optimize=True)
+
+
+def _smallest_factors(G):
+    r"""Smallest positive buckling factors from reduced geometric stiffness
+    matrices ``G`` with ``shape=(..., M*N, M*N)``"""
+    mu = np.linalg.eigvalsh(G)[..., -1]
+    with np.errstate(divide='ignore'):
+        return np.where(mu > 0, 1/mu, np.inf)
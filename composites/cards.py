@@ -0,0 +1,403 @@
+r"""
+=======================================================
+Finite element property cards (:mod:`composites.cards`)
+=======================================================
+
+.. currentmodule::composites.cards
+
+Export of the laminate properties of finite element models to the input
+files of Nastran and Abaqus:
+
+- :func:`.write_nastran_pshell`: ``PSHELL`` cards with one ``MAT2`` card
+  for each of the membrane, bending, transverse shear and
+  membrane-bending coupling stiffnesses, from ``ABD`` and ``Atrans``
+- :func:`.write_nastran_pcomp`: ``PCOMP`` and ``MAT8`` cards from the plies
+  of :class:`.Laminate` objects
+- :func:`.write_abaqus_general_sections`: ``*SHELL GENERAL SECTION`` with
+  the section stiffness given directly, from ``ABD`` and ``Atrans``
+- :func:`.write_abaqus_composite_sections`: ``*SHELL SECTION, COMPOSITE``
+  and ``*MATERIAL`` definitions from the plies of :class:`.Laminate` objects
+
+Identical laminates, and identical materials, are written only once. Each
+function returns the property id of each input laminate, which is used to
+assign the properties to the elements. The cards are formatted in chunks
+of ``chunk_size`` properties with a single formatting operation per chunk,
+and written with a large output buffer::
+
+    from composites.field import LaminateField
+    from composites.cards import write_nastran_pcomp
+
+    field = LaminateField()
+    field.assign(dict(stack=stack, plyt=plyt, laminaprop=laminaprop)
+                 for stack in element_stacks)
+    pids = write_nastran_pcomp('properties.bdf', field.laminates)
+    element_pid = pids[field.element_property]
+
+The Nastran cards use the large field format, with 16-character fields and
+9 significant digits.
+
+"""
+from contextlib import contextmanager
+
+import numpy as np
+
+
+_BUFFER_SIZE = 1 << 20
+
+# NOTE Nastran large field format
+_INT = '%16d'
+_REAL = '%16.8E'
+_BLANK = ' '*16
+
+# NOTE upper triangle of ABD by columns, as in *SHELL GENERAL SECTION
+_UPPER = [6*i + j for j in range(6) for i in range(j + 1)]
+
+
+@contextmanager
+def _open(f):
+    if isinstance(f, str):
+        with open(f, 'w', buffering=_BUFFER_SIZE) as fobj:
+            yield fobj
+    else:
+        yield f
+
+
+def _real(value):
+    return _REAL % value
+
+
+def _card(name, fields):
+    # NOTE 4 fields of 16 characters per line, the continuation lines
+    #      starting with '*'
+    lines = []
+    for i in range(0, len(fields), 4):
+        lines.append((('%-8s' % (name + '*') if i == 0 else '*       ')
+                      + ''.join(fields[i:i + 4])).rstrip())
+    return '\n'.join(lines) + '\n'
+
+
+def _write_cards(f, template, values, chunk_size):
+    values = np.asarray(values, dtype=np.float64)
+    for start in range(0, values.shape[0], chunk_size):
+        chunk = values[start:start + chunk_size]
+        f.write((template*chunk.shape[0]) % tuple(chunk.ravel().tolist()))
+
+
+def _unique_rows(values):
+    # NOTE adding 0. makes -0. and 0. equal
+    values = np.ascontiguousarray(np.asarray(values, dtype=np.float64) + 0.)
+    rows = values.view(np.dtype((np.void, values.dtype.itemsize
+                                 *values.shape[1]))).ravel()
+    _, index, inverse = np.unique(rows, return_index=True,
+                                  return_inverse=True)
+    # unique rows in the order of their first appearance
+    order = np.argsort(index)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.shape[0])
+    return index[order], rank[inverse.ravel()]
+
+
+def _shell_arrays(ABD, Atrans, scf):
+    ABD = np.asarray(ABD, dtype=np.float64).reshape(-1, 6, 6)
+    N = ABD.shape[0]
+    if Atrans is not None:
+        Atrans = np.asarray(Atrans, dtype=np.float64).reshape(N, 2, 2)
+        if scf is None:
+            scf = np.full((N, 2), 5/6.)
+        scf = np.broadcast_to(np.asarray(scf, dtype=np.float64), (N, 2))
+        # transverse shear stiffness (K13, K23, K12) with the shear
+        # correction factors (scf_k13, scf_k23)
+        shear = np.stack((scf[:, 0]*Atrans[:, 1, 1],
+                          scf[:, 1]*Atrans[:, 0, 0],
+                          np.sqrt(scf[:, 0]*scf[:, 1])*Atrans[:, 0, 1]),
+                         axis=1)
+    else:
+        shear = np.zeros((N, 0))
+    return ABD, shear
+
+
+def _laminate_plies(laminates):
+    materials = {}
+    keys = {}
+    inverse = np.empty(len(laminates), dtype=np.intp)
+    tables = []
+    for i, lam in enumerate(laminates):
+        rows = []
+        for ply in lam.plies:
+            m = ply.matlamina
+            material = (m.e1, m.e2, m.nu12, m.g12, m.g13, m.g23, m.rho, m.a1,
+                        m.a2, m.tref)
+            mid = materials.setdefault(material, len(materials))
+            rows.append((mid, ply.h, ply.thetadeg))
+        key = (lam.offset + 0., tuple(rows))
+        prop_id = keys.get(key)
+        if prop_id is None:
+            prop_id = keys[key] = len(tables)
+            h = sum(row[1] for row in rows)
+            tables.append((prop_id, -h/2. + lam.offset, np.array(rows)))
+        inverse[i] = prop_id
+    return list(materials), tables, inverse
+
+
+def _group_by_num_plies(tables):
+    groups = {}
+    for prop_id, z0, plies in tables:
+        groups.setdefault(plies.shape[0], []).append(
+            np.concatenate(([prop_id, z0], plies.ravel())))
+    return {n: np.array(rows) for n, rows in groups.items()}
+
+
+def write_nastran_pshell(f, ABD, h, Atrans=None, offset=0., intrho=None,
+        scf=None, pid_start=1, mid_start=1, chunk_size=10000):
+    r"""Write ``PSHELL`` and ``MAT2`` cards
+
+    Property ``p`` gets the ``PSHELL`` id ``pid_start + p`` and the ``MAT2``
+    ids ``mid_start + 4*p`` to ``mid_start + 4*p + 3`` for the membrane
+    (`A/h`), bending (`12 D/h^3`), transverse shear and coupling (`B/h^2`)
+    stiffnesses. The transverse shear ``MAT2`` includes the shear correction
+    factors, such that ``TS/T = 1``, and the coupling ``MAT2`` is only
+    written when `B` is not negligible.
+
+    Parameters
+    ----------
+    f : str or file
+        Output path or file object opened for writing text.
+    ABD : array-like
+        The ``ABD`` matrices with ``shape=(N, 6, 6)``.
+    h : array-like
+        Laminate thicknesses with ``shape=(N,)``.
+    Atrans : array-like or None, optional
+        The ``Atrans`` matrices with ``shape=(N, 2, 2)``. Without it, no
+        transverse shear ``MAT2`` is written.
+    offset : float or array-like, optional
+        Offsets of the laminates, which give the fiber distances ``Z1`` and
+        ``Z2``.
+    intrho : array-like or None, optional
+        Masses per unit area, written as the density of the membrane
+        ``MAT2``.
+    scf : array-like or None, optional
+        Shear correction factors ``(scf_k13, scf_k23)`` with ``shape=(N,
+        2)``, by default 5/6.
+    pid_start, mid_start : int, optional
+        First property and material ids.
+    chunk_size : int, optional
+        Number of properties formatted at once.
+
+    Returns
+    -------
+    pids : array
+        Property id of each laminate, with ``shape=(N,)``.
+
+    """
+    ABD, shear = _shell_arrays(ABD, Atrans, scf)
+    N = ABD.shape[0]
+    h = np.broadcast_to(np.asarray(h, dtype=np.float64), (N,))
+    offset = np.broadcast_to(np.asarray(offset, dtype=np.float64), (N,))
+    rho = (np.zeros(N) if intrho is None
+           else np.asarray(intrho, dtype=np.float64)/h)
+    index, inverse = _unique_rows(np.column_stack((ABD.reshape(N, 36), shear,
+                                                   h, offset, rho)))
+    ABD, shear, h, offset, rho = (ABD[index], shear[index], h[index],
+                                  offset[index], rho[index])
+    n = index.shape[0]
+    mid = mid_start + 4*np.arange(n)
+    t = h[:, None]
+    terms = [0, 1, 2, 4, 5, 8]
+    G1 = ABD[:, :3, :3].reshape(n, 9)[:, terms]/t
+    G2 = 12*ABD[:, 3:, 3:].reshape(n, 9)[:, terms]/t**3
+    G4 = ABD[:, :3, 3:].reshape(n, 9)[:, terms]/t**2
+    has_shear = shear.shape[1] > 0
+    # NOTE B of symmetric laminates is only round-off
+    coupled = (np.abs(G4).max(axis=1)
+               > 1e-10*np.abs(np.column_stack((G1, G2))).max(axis=1))
+
+    zero = _real(0.)
+    with _open(f) as fobj:
+        for with_coupling in (False, True):
+            sel = np.nonzero(coupled == with_coupling)[0]
+            if sel.shape[0] == 0:
+                continue
+            template = _card('PSHELL', [_INT, _INT, _REAL, _INT, _real(1.),
+                             _INT if has_shear else _BLANK, _real(1.),
+                             _BLANK, _REAL, _REAL,
+                             _INT if with_coupling else _BLANK])
+            columns = [pid_start + sel, mid[sel], h[sel], mid[sel] + 1]
+            if has_shear:
+                columns.append(mid[sel] + 2)
+            columns += [-h[sel]/2. + offset[sel], h[sel]/2. + offset[sel]]
+            if with_coupling:
+                columns.append(mid[sel] + 3)
+            # membrane, with the density, and bending
+            template += _card('MAT2', [_INT] + [_REAL]*7)
+            columns += [mid[sel]] + list(G1[sel].T) + [rho[sel]]
+            template += _card('MAT2', [_INT] + [_REAL]*6)
+            columns += [mid[sel] + 1] + list(G2[sel].T)
+            if has_shear:
+                # NOTE G11, G12 and G22 of the transverse shear
+                template += _card('MAT2', [_INT, _REAL, _REAL, zero, _REAL,
+                                           zero, zero])
+                columns += [mid[sel] + 2] + list((shear[sel][:, [0, 2, 1]]
+                                                  /t[sel]).T)
+            if with_coupling:
+                template += _card('MAT2', [_INT] + [_REAL]*6)
+                columns += [mid[sel] + 3] + list(G4[sel].T)
+            _write_cards(fobj, template, np.column_stack(columns), chunk_size)
+    return pid_start + inverse
+
+
+def write_nastran_pcomp(f, laminates, pid_start=1, mid_start=1,
+        chunk_size=10000):
+    r"""Write ``PCOMP`` and ``MAT8`` cards
+
+    Each distinct material of the plies gets one ``MAT8`` card, with ids
+    starting at ``mid_start``. The ``PCOMP`` cards list the plies from the
+    bottom to the top, with ``Z0`` given by the ``offset`` of the
+    laminates.
+
+    Parameters
+    ----------
+    f : str or file
+        Output path or file object opened for writing text.
+    laminates : list
+        The :class:`.Laminate` objects, for instance the ``laminates`` of a
+        :class:`composites.field.LaminateField`.
+    pid_start, mid_start : int, optional
+        First property and material ids.
+    chunk_size : int, optional
+        Number of properties formatted at once.
+
+    Returns
+    -------
+    pids : array
+        Property id of each laminate, with ``shape=(N,)``.
+
+    """
+    materials, tables, inverse = _laminate_plies(laminates)
+    with _open(f) as fobj:
+        if materials:
+            # MID, E1, E2, NU12, G12, G1Z, G2Z, RHO, A1, A2, TREF
+            template = _card('MAT8', [_INT] + [_REAL]*10)
+            values = np.column_stack((mid_start + np.arange(len(materials)),
+                                      np.array(materials)))
+            _write_cards(fobj, template, values, chunk_size)
+        zero = _real(0.)
+        for n, values in _group_by_num_plies(tables).items():
+            # NOTE explicit TREF and GE, such that no line is blank
+            template = _card('PCOMP', [_INT, _REAL, _BLANK, _BLANK, _BLANK,
+                                       zero, zero, _BLANK]
+                             + [_INT, _REAL, _REAL, _BLANK]*n)
+            values[:, 0] += pid_start
+            values[:, 2::3] += mid_start
+            _write_cards(fobj, template, values, chunk_size)
+    return pid_start + inverse
+
+
+def write_abaqus_general_sections(f, ABD, Atrans=None, scf=None,
+        prefix='LAMINATE', start=1, chunk_size=10000):
+    r"""Write ``*SHELL GENERAL SECTION`` definitions with the stiffness
+
+    Property ``p`` is written for the element set ``prefix`` followed by
+    ``start + p``, with the upper triangle of ``ABD`` and, when ``Atrans``
+    is given, a ``*TRANSVERSE SHEAR STIFFNESS`` including the shear
+    correction factors.
+
+    Parameters
+    ----------
+    f : str or file
+        Output path or file object opened for writing text.
+    ABD : array-like
+        The ``ABD`` matrices with ``shape=(N, 6, 6)``.
+    Atrans : array-like or None, optional
+        The ``Atrans`` matrices with ``shape=(N, 2, 2)``.
+    scf : array-like or None, optional
+        Shear correction factors ``(scf_k13, scf_k23)`` with ``shape=(N,
+        2)``, by default 5/6.
+    prefix : str, optional
+        Prefix of the element set names.
+    start : int, optional
+        Number of the first element set.
+    chunk_size : int, optional
+        Number of properties formatted at once.
+
+    Returns
+    -------
+    ids : array
+        Number of the element set of each laminate, with ``shape=(N,)``.
+
+    """
+    ABD, shear = _shell_arrays(ABD, Atrans, scf)
+    N = ABD.shape[0]
+    index, inverse = _unique_rows(np.column_stack((ABD.reshape(N, 36),
+                                                   shear)))
+    n = index.shape[0]
+    template = ('*SHELL GENERAL SECTION, ELSET=%s%%d\n' % prefix.replace('%',
+                '%%') + ', '.join(['%.9g']*8) + '\n'
+                + ', '.join(['%.9g']*8) + '\n' + ', '.join(['%.9g']*5) + '\n')
+    if shear.shape[1] > 0:
+        template += '*TRANSVERSE SHEAR STIFFNESS\n%.9g, %.9g, %.9g\n'
+    values = np.column_stack((start + np.arange(n),
+                              ABD[index].reshape(n, 36)[:, _UPPER],
+                              shear[index]))
+    with _open(f) as fobj:
+        _write_cards(fobj, template, values, chunk_size)
+    return start + inverse
+
+
+def write_abaqus_composite_sections(f, laminates, prefix='LAMINATE',
+        material_prefix='MATERIAL', start=1, num_points=3, chunk_size=10000):
+    r"""Write ``*SHELL SECTION, COMPOSITE`` and ``*MATERIAL`` definitions
+
+    Each distinct material of the plies is written as a ``*MATERIAL`` named
+    ``material_prefix`` followed by its number, starting at ``1``, with an
+    ``*ELASTIC, TYPE=LAMINA`` definition and, when not null, a
+    ``*DENSITY``. Property ``p`` is written for the element set ``prefix``
+    followed by ``start + p``, with the plies from the bottom to the top and
+    the ``OFFSET`` given by the ``offset`` of the laminates.
+
+    Parameters
+    ----------
+    f : str or file
+        Output path or file object opened for writing text.
+    laminates : list
+        The :class:`.Laminate` objects, for instance the ``laminates`` of a
+        :class:`composites.field.LaminateField`.
+    prefix, material_prefix : str, optional
+        Prefixes of the element set and material names.
+    start : int, optional
+        Number of the first element set.
+    num_points : int, optional
+        Number of integration points of each ply.
+    chunk_size : int, optional
+        Number of properties formatted at once.
+
+    Returns
+    -------
+    ids : array
+        Number of the element set of each laminate, with ``shape=(N,)``.
+
+    """
+    materials, tables, inverse = _laminate_plies(laminates)
+    prefix = prefix.replace('%', '%%')
+    material_prefix = material_prefix.replace('%', '%%')
+    with _open(f) as fobj:
+        template = ('*MATERIAL, NAME=' + material_prefix + '%d\n'
+                    '*ELASTIC, TYPE=LAMINA\n' + ', '.join(['%.9g']*6) + '\n')
+        for i, material in enumerate(materials):
+            fobj.write(template % ((i + 1,) + material[:6]))
+            if material[6] != 0:
+                fobj.write('*DENSITY\n%.9g\n' % material[6])
+        ply = ('%.9g, ' + str(num_points) + ', ' + material_prefix
+               + '%d, %.9g\n')
+        for n, values in _group_by_num_plies(tables).items():
+            template = ('*SHELL SECTION, ELSET=' + prefix + '%d, COMPOSITE, '
+                        'OFFSET=%.9g\n' + ply*n)
+            h = values[:, 3::3].sum(axis=1)
+            # NOTE the OFFSET of the reference surface is a fraction of the
+            #      thickness about the mid-surface
+            offset = 0. - (values[:, 1] + h/2.)/h
+            # reorder the ply columns as (thickness, material, angle)
+            plies = values[:, 2:].reshape(-1, n, 3)[:, :, [1, 0, 2]]
+            plies[:, :, 1] += 1
+            _write_cards(fobj, template, np.column_stack((start + values[:, 0],
+                         offset, plies.reshape(-1, 3*n))), chunk_size)
+    return start + inverse
@@ -46,9 +46,12 @@ cdef class Laminate:
     cdef public double D11, D12, D16, D22, D26, D66
     cdef public double E11, E12, E16, E22, E26, E66
     cdef public double F11, F12, F16, F22, F26, F66
+    cdef public double G11, G12, G16, G22, G26, G66
     cdef public double H11, H12, H16, H22, H26, H66
     cdef public double A44, A45, A55
+    cdef public double B44, B45, B55
     cdef public double D44, D45, D55
+    cdef public double E44, E45, E55
     cdef public double F44, F45, F55
     cdef public double e1, e2, g12, nu12, nu21
     cdef public double scf_k13, scf_k23, h, offset, intrho, intrhoz, intrhoz2
@@ -64,14 +67,20 @@ cdef class Laminate:
     cdef double [:, ::1] get_Dtrans(Laminate)
     cdef double [:, ::1] get_Ftrans(Laminate)
     cdef double [:, ::1] get_ABD(Laminate)
+    cpdef void get_ABD_into(Laminate, double[:, :], double[:, :] Atrans=*)
     cpdef void calc_scf(Laminate)
     cpdef void calc_equivalent_properties(Laminate)
     cpdef void calc_constitutive_matrix(Laminate)
+    cpdef void _require_constitutive(Laminate)
     cpdef void make_balanced(Laminate)
     cpdef void make_orthotropic(Laminate)
     cpdef void make_symmetric(Laminate)
     cpdef void make_smeared(Laminate)
     cpdef LaminationParameters calc_lamination_parameters(Laminate)
+    cpdef Laminate shifted(Laminate, double)
+    cpdef void insert_ply(Laminate, int, Lamina)
+    cpdef void drop_ply(Laminate, int)
+    cpdef tuple calc_ply_grad(Laminate)
 
 
 cdef class GradABD:
@@ -83,3 +92,19 @@ cdef class GradABD:
 
 
 cpdef Laminate n_double_laminate(double thickness, int n, double[::1] angles_deg, MatLamina matlamina)
+cpdef tuple calc_scf_batch(double[:, ::1] thetadegs, double[::1] plyts, MatLamina matlamina, double offset=*)
+cpdef tuple calc_ABD_batch(double[:, ::1] thetadegs, double[::1] plyts, MatLamina matlamina, double offset=*)
+cpdef void calc_ABD_batch_into(double[:, ::1] thetadegs, double[::1] plyts, MatLamina matlamina, double[:, :, :] ABD, double[:, :, :] Atrans=*, double offset=*)
+cpdef tuple calc_ABD_batch_laminaprops(double[:, ::1] thetadegs, double[:, ::1] plyts, double[:, ::1] laminaprops, double offset=*)
+cpdef tuple calc_ABD_LP_batch(double[:, ::1] thetadegs, double[:, ::1] plyts, double[:, ::1] laminaprops, double[::1] offsets)
+cpdef double[:, ::1] calc_LP_batch(double[:, ::1] thetadegs, double[::1] plyts, double offset=*)
+cpdef tuple calc_ABD_from_LP_batch(double[::1] thickness, double[:, ::1] lp, MatLamina matlamina)
+cpdef tuple calc_ply_grad_batch(double[:, ::1] thetadegs, double[::1] plyts, MatLamina matlamina, double offset=*)
+
+
+# nogil C-level API, see the documentation of each function in core.pyx
+cdef void calc_invariants(double e1, double e2, double nu12, double nu21, double g12, double g13, double g23, double *u) noexcept nogil
+cdef void calc_qbar(double *u, double thetadeg, double *q) noexcept nogil
+cdef void calc_ABD(int n, double *thetadeg, double *h, double *u, double offset, double *ABD, double *Atrans) noexcept nogil
+cdef void calc_LP(int n, double *thetadeg, double *h, double offset, double *lp) noexcept nogil
+cdef void calc_ABD_from_LP(double h, double *u, double *lp, double *ABD, double *Atrans) noexcept nogil
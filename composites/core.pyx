@@ -10,12 +10,78 @@ Composites Core Module (:mod:`composites.core`)
 
 .. currentmodule:: composites.core
 
+The functions ``calc_invariants``, ``calc_qbar``, ``calc_ABD``, ``calc_LP``
+and ``calc_ABD_from_LP`` are declared in ``core.pxd`` as ``nogil`` C
+functions working on raw pointers, and can be used in the inner loops of
+other Cython codes::
+
+    from composites.core cimport calc_invariants, calc_ABD
+
+with ``composites.get_include()`` added to the Cython include path.
+
 """
+import os
+from time import perf_counter
+
+from libc.stdlib cimport malloc, free
+from cython.parallel import prange, parallel
 import numpy as np
 
 DOUBLE = np.float64
 
 
+# NOTE profiling counters, accessed through :mod:`composites.profiling`
+cdef enum:
+    PROF_MATLAMINA_REBUILD
+    PROF_LAMINA_REBUILD
+    PROF_CALC_CONSTITUTIVE_MATRIX
+    PROF_CALC_SCF
+    PROF_CALC_EQUIVALENT_PROPERTIES
+    PROF_NUM
+
+PROF_NAMES = (
+    'MatLamina.rebuild',
+    'Lamina.rebuild',
+    'Laminate.calc_constitutive_matrix',
+    'Laminate.calc_scf',
+    'Laminate.calc_equivalent_properties',
+    )
+
+cdef bint _profiling = os.environ.get('COMPOSITES_PROFILING', '0') not in ('', '0')
+cdef long _prof_ncalls[PROF_NUM]
+cdef double _prof_time[PROF_NUM]
+
+
+cdef inline void _prof_toc(int i, double t0):
+    _prof_ncalls[i] += 1
+    _prof_time[i] += perf_counter() - t0
+
+
+def _set_profiling(bint enabled):
+    global _profiling
+    _profiling = enabled
+
+
+def _get_profiling():
+    return _profiling
+
+
+def _reset_profiling():
+    cdef int i
+    for i in range(PROF_NUM):
+        _prof_ncalls[i] = 0
+        _prof_time[i] = 0.
+
+
+def _report_profiling():
+    cdef int i
+    return {PROF_NAMES[i]: dict(ncalls=_prof_ncalls[i], time=_prof_time[i])
+            for i in range(PROF_NUM)}
+
+
+_reset_profiling()
+
+
 cdef class LaminationParameters:
     r"""Lamination parameters
 
@@ -133,6 +199,9 @@ cdef class MatLamina:
 
         """
         cdef double e1, e2, e3, nu12, nu21, nu13, nu31, nu23, nu32, delta, den
+        cdef double t0 = 0
+        if _profiling:
+            t0 = perf_counter()
         e1 = self.e1
         e2 = self.e2
         e3 = self.e3
@@ -192,6 +261,8 @@ cdef class MatLamina:
         self.u5 = (self.u1 - self.u4) / 2.
         self.u6 = (self.q44 + self.q55) / 2.
         self.u7 = (self.q44 - self.q55) / 2.
+        if _profiling:
+            _prof_toc(PROF_MATLAMINA_REBUILD, t0)
 
     cpdef void trace_normalize_plane_stress(MatLamina self):
         r"""Trace-normalize the lamina properties for plane stress
@@ -284,6 +355,9 @@ cdef class Lamina:
         cdef double thetarad, e1, e2, nu12, nu21, g12, g13, g23
         cdef double q11, q12, q22, q44, q55, q16, q26, q66
         cdef double cos2, cos3, cos4, sin2, sin3, sin4, sincos
+        cdef double t0 = 0
+        if _profiling:
+            t0 = perf_counter()
         thetarad = deg2rad(self.thetadeg)
         self.cost = cos(thetarad)
         self.cos2t = cos(2*thetarad)
@@ -337,6 +411,8 @@ cdef class Lamina:
         #TODO add the thermal coeficient terms when calculating the
         #     stresses... to take into account eventual thermal expansions or
         #     contractions
+        if _profiling:
+            _prof_toc(PROF_LAMINA_REBUILD, t0)
 
     cpdef double [:, ::1] get_transf_matrix_displ_to_laminate(Lamina self):
         r"""Return displacement transformation matrix from lamina to laminate"""
@@ -381,6 +457,345 @@ cdef class Lamina:
              [sincos, -sincos, 0, 0, 0, cos2-sin2]], dtype=DOUBLE)
 
 
+cdef void _calc_scf(int n, double *h, double *thetadeg, double *e1,
+        double *e2, double *nu12, double *nu21, int matstride, double htotal,
+        double offset, double *k13, double *k23) noexcept nogil:
+    r"""Shear correction factors kernel, see :meth:`.Laminate.calc_scf`
+
+    The material properties of ply ``i`` are read at position
+    ``i*matstride``, such that ``matstride=0`` can be used when all plies
+    have the same material.
+
+    """
+    cdef int i, j
+    cdef double D1, R1, den1, D2, R2, den2, zbot, z1, z2, thetarad
+    cdef double c, s, e1L, e2L, nu12L, nu21L, r1, r2, p1, p2, c2, c3, c4
+    D1 = 0
+    R1 = 0
+    den1 = 0
+
+    D2 = 0
+    R2 = 0
+    den2 = 0
+
+    zbot = -htotal/2. + offset
+    # NOTE the polynomial terms that only depend on offset and zbot are
+    #      shared by all plies
+    c2 = 30*offset*zbot*(zbot - 2*offset)
+    c3 = 10*(2*offset*offset + 2*offset*zbot - zbot*zbot)
+    c4 = 15*zbot*zbot*(4*offset*offset - 4*offset*zbot + zbot*zbot)
+
+    z1 = zbot
+    r1 = (z1 - offset)*(z1 - offset)*(z1 - offset)/3.
+    p1 = z1*(c4 + z1*(z1*(c3 + z1*(3*z1 - 15*offset)) + c2))
+    for i in range(n):
+        j = i*matstride
+        z2 = z1 + h[i]
+        thetarad = deg2rad(thetadeg[i])
+        c = cos(thetarad)
+        s = sin(thetarad)
+        e1L = e1[j]*c + e2[j]*s
+        e2L = e2[j]*c + e1[j]*s
+        nu12L = nu12[j]*c + nu21[j]*s
+        nu21L = nu21[j]*c + nu12[j]*s
+
+        # NOTE z-polynomials shared between the 13 and 23 directions, and
+        #      between the top of a ply and the bottom of the next ply
+        r2 = (z2 - offset)*(z2 - offset)*(z2 - offset)/3.
+        p2 = z2*(c4 + z2*(z2*(c3 + z2*(3*z2 - 15*offset)) + c2))
+
+        D1 += e1L / (1 - nu12L*nu21L)
+        R1 += D1*(r2 - r1)
+        den1 += htotal*D1*D1*(p2 - p1)/60.
+
+        D2 += e2L / (1 - nu12L*nu21L)
+        R2 += D2*(r2 - r1)
+        den2 += htotal*D2*D2*(p2 - p1)/60.
+
+        z1 = z2
+        r1 = r2
+        p1 = p2
+
+    k13[0] = R1*R1 / den1
+    k23[0] = R2*R2 / den2
+
+
+cdef void _plane_stress_invariants(MatLamina mat, double *u):
+    calc_invariants(mat.e1, mat.e2, mat.nu12, mat.nu21, mat.g12, mat.g13,
+                    mat.g23, u)
+
+
+cdef void _qbar(double *u, double cos2t, double sin2t, double cos4t,
+        double sin4t, double *q) noexcept nogil:
+    r"""Ply stiffnesses q11L, q12L, q16L, q22L, q26L, q66L, q44L, q45L, q55L
+    in terms of the invariants"""
+    q[0] = u[0] + u[1]*cos2t + u[2]*cos4t
+    q[1] = u[3] - u[2]*cos4t
+    q[2] = u[1]/2.*sin2t + u[2]*sin4t
+    q[3] = u[0] - u[1]*cos2t + u[2]*cos4t
+    q[4] = u[1]/2.*sin2t - u[2]*sin4t
+    q[5] = u[4] - u[2]*cos4t
+    q[6] = u[5] + u[6]*cos2t
+    q[7] = -u[6]*sin2t
+    q[8] = u[5] - u[6]*cos2t
+
+
+cdef void _dqbar(double *u, double cos2t, double sin2t, double cos4t,
+        double sin4t, double *dq) noexcept nogil:
+    r"""Derivatives of the terms of :func:`._qbar` with respect to the ply
+    angle in degrees"""
+    cdef double d = 4*atan(1.)/180.
+    dq[0] = d*(-2*u[1]*sin2t - 4*u[2]*sin4t)
+    dq[1] = d*4*u[2]*sin4t
+    dq[2] = d*(u[1]*cos2t + 4*u[2]*cos4t)
+    dq[3] = d*(2*u[1]*sin2t - 4*u[2]*sin4t)
+    dq[4] = d*(u[1]*cos2t - 4*u[2]*cos4t)
+    dq[5] = d*4*u[2]*sin4t
+    dq[6] = d*(-2*u[6]*sin2t)
+    dq[7] = d*(-2*u[6]*cos2t)
+    dq[8] = d*2*u[6]*sin2t
+
+
+cdef inline double _jump(int n, double *q, int j, int k) noexcept nogil:
+    # jump of q[:, k] across the interface j, zero outside the laminate
+    cdef double below = 0, above = 0
+    if j > 0:
+        below = q[9*(j-1) + k]
+    if j < n:
+        above = q[9*j + k]
+    return below - above
+
+
+cdef void _ply_grad(int n, double *h, double *q, double *dq, double offset,
+        double *dABDdt, double *dAtransdt, double *dABDdh,
+        double *dAtransdh) noexcept nogil:
+    r"""Ply angle and ply thickness gradients kernel, see
+    :meth:`.Laminate.calc_ply_grad`
+
+    The terms of :func:`._qbar` and :func:`._dqbar` of ply ``i`` are read
+    at ``q[9*i]`` and ``dq[9*i]``.
+
+    """
+    cdef int i, k
+    cdef double htotal, z, z1, z2, jump
+    cdef double T[12]
+    cdef double P[12]
+    cdef double m[18]
+    htotal = 0
+    for i in range(n):
+        htotal += h[i]
+    # NOTE changing the thickness of ply i moves the interfaces below it by
+    #      -1/2 and the interfaces above it by +1/2, such that the
+    #      derivatives of B and D come from sums over the interfaces of
+    #      z^p times the jump of the ply stiffnesses
+    for k in range(12):
+        T[k] = 0
+        P[k] = 0
+    z = -htotal/2. + offset
+    for i in range(n + 1):
+        for k in range(6):
+            jump = _jump(n, q, i, k)
+            T[k] += z*jump
+            T[6 + k] += z*z*jump
+        if i < n:
+            z += h[i]
+    z1 = -htotal/2. + offset
+    for i in range(n):
+        z2 = z1 + h[i]
+        for k in range(6):
+            m[k] = dq[9*i + k]*h[i]
+            m[6 + k] = dq[9*i + k]*(z2*z2 - z1*z1)/2.
+            m[12 + k] = dq[9*i + k]*(z2*z2*z2 - z1*z1*z1)/3.
+        _moments_to_ABD(m, &dABDdt[36*i])
+        dAtransdt[4*i] = dq[9*i + 6]*h[i]
+        dAtransdt[4*i + 1] = dq[9*i + 7]*h[i]
+        dAtransdt[4*i + 2] = dq[9*i + 7]*h[i]
+        dAtransdt[4*i + 3] = dq[9*i + 8]*h[i]
+
+        for k in range(6):
+            jump = _jump(n, q, i, k)
+            P[k] += z1*jump
+            P[6 + k] += z1*z1*jump
+            m[k] = q[9*i + k]
+            m[6 + k] = T[k]/2. - P[k]
+            m[12 + k] = T[6 + k]/2. - P[6 + k]
+        _moments_to_ABD(m, &dABDdh[36*i])
+        dAtransdh[4*i] = q[9*i + 6]
+        dAtransdh[4*i + 1] = q[9*i + 7]
+        dAtransdh[4*i + 2] = q[9*i + 7]
+        dAtransdh[4*i + 3] = q[9*i + 8]
+        z1 = z2
+
+
+cdef void _laminate_ABD(int n, double *h, double *thetadeg, double *u,
+        double offset, double *m, double *trans) noexcept nogil:
+    r"""ABD kernel for plies of the same material with invariants ``u``
+
+    The terms A, B and D 11, 12, 16, 22, 26, 66 are written in ``m`` and the
+    terms A44, A45, A55 in ``trans``.
+
+    """
+    cdef int i, k
+    cdef double htotal, z1, z2, dz, dz2, dz3
+    cdef double q[9]
+    htotal = 0
+    for i in range(n):
+        htotal += h[i]
+    for k in range(18):
+        m[k] = 0
+    for k in range(3):
+        trans[k] = 0
+    z1 = -htotal/2. + offset
+    for i in range(n):
+        z2 = z1 + h[i]
+        calc_qbar(u, thetadeg[i], q)
+        dz = z2 - z1
+        dz2 = (z2*z2 - z1*z1)/2.
+        dz3 = (z2*z2*z2 - z1*z1*z1)/3.
+        for k in range(6):
+            m[k] += q[k]*dz
+            m[6 + k] += q[k]*dz2
+            m[12 + k] += q[k]*dz3
+        for k in range(3):
+            trans[k] += q[6 + k]*dz
+        z1 = z2
+
+
+cdef void _write_ABD(double *m, double *trans, double[:, :] ABD,
+        double[:, :] Atrans) noexcept nogil:
+    # m and trans as in _laminate_ABD into strided outputs
+    cdef int k
+    cdef int row[6]
+    cdef int col[6]
+    row[:] = [0, 0, 0, 1, 1, 2]
+    col[:] = [0, 1, 2, 1, 2, 2]
+    for k in range(6):
+        ABD[row[k], col[k]] = m[k]
+        ABD[col[k], row[k]] = m[k]
+        ABD[row[k], 3+col[k]] = m[6 + k]
+        ABD[col[k], 3+row[k]] = m[6 + k]
+        ABD[3+row[k], col[k]] = m[6 + k]
+        ABD[3+col[k], row[k]] = m[6 + k]
+        ABD[3+row[k], 3+col[k]] = m[12 + k]
+        ABD[3+col[k], 3+row[k]] = m[12 + k]
+    if Atrans is not None:
+        Atrans[0, 0] = trans[0]
+        Atrans[0, 1] = trans[1]
+        Atrans[1, 0] = trans[1]
+        Atrans[1, 1] = trans[2]
+
+
+# NOTE public nogil functions, declared in core.pxd, such that they can be
+#      used by other Cython codes with ``cimport composites.core``
+
+cdef void calc_invariants(double e1, double e2, double nu12, double nu21,
+        double g12, double g13, double g23, double *u) noexcept nogil:
+    r"""Invariants ``u[0:7]``, corresponding to ``u1`` to ``u7``, of the
+    plane stress stiffnesses used in :meth:`.Lamina.rebuild`"""
+    cdef double q11, q12, q22, q44, q55, q66, den
+    den = 1 - nu12*nu21
+    q11 = e1/den
+    q12 = nu12*e2/den
+    q22 = e2/den
+    q44 = g23
+    q55 = g13
+    q66 = g12
+    u[0] = (3*q11 + 3*q22 + 2*q12 + 4*q66) / 8.
+    u[1] = (q11 - q22) / 2.
+    u[2] = (q11 + q22 - 2*q12 - 4*q66) / 8.
+    u[3] = (q11 + q22 + 6*q12 - 4*q66) / 8.
+    u[4] = (u[0] - u[3]) / 2.
+    u[5] = (q44 + q55) / 2.
+    u[6] = (q44 - q55) / 2.
+
+
+cdef void calc_qbar(double *u, double thetadeg, double *q) noexcept nogil:
+    r"""Ply stiffnesses ``q[0:9]``, corresponding to q11L, q12L, q16L, q22L,
+    q26L, q66L, q44L, q45L, q55L, from the invariants ``u[0:7]``"""
+    cdef double thetarad, cos2t, sin2t
+    thetarad = deg2rad(thetadeg)
+    cos2t = cos(2*thetarad)
+    sin2t = sin(2*thetarad)
+    _qbar(u, cos2t, sin2t, 2*cos2t*cos2t - 1, 2*sin2t*cos2t, q)
+
+
+cdef void calc_ABD(int n, double *thetadeg, double *h, double *u,
+        double offset, double *ABD, double *Atrans) noexcept nogil:
+    r"""``ABD[0:36]`` and ``Atrans[0:4]``, both C-contiguous, of ``n``
+    plies with the same material with invariants ``u[0:7]``"""
+    cdef double m[21]
+    _laminate_ABD(n, h, thetadeg, u, offset, m, &m[18])
+    _moments_to_ABD(m, ABD)
+    Atrans[0] = m[18]
+    Atrans[1] = m[19]
+    Atrans[2] = m[19]
+    Atrans[3] = m[20]
+
+
+cdef void calc_LP(int n, double *thetadeg, double *h, double offset,
+        double *lp) noexcept nogil:
+    r"""Lamination parameters ``lp[0:14]`` of ``n`` plies, ordered as in
+    :func:`.taper_lamination_parameters`"""
+    cdef int i, k
+    cdef double htotal, zbar1, zbar2, thetarad, Afac, Bfac, Dfac
+    cdef double trig[4]
+    htotal = 0
+    for i in range(n):
+        htotal += h[i]
+    for k in range(12):
+        lp[k] = 0
+    zbar1 = (-htotal/2. + offset)/htotal
+    for i in range(n):
+        zbar2 = zbar1 + h[i]/htotal
+        thetarad = deg2rad(thetadeg[i])
+        trig[0] = cos(2*thetarad)
+        trig[1] = sin(2*thetarad)
+        trig[2] = 2*trig[0]*trig[0] - 1
+        trig[3] = 2*trig[1]*trig[0]
+        Afac = zbar2 - zbar1
+        Bfac = 2*(zbar2*zbar2 - zbar1*zbar1)
+        Dfac = 4*(zbar2*zbar2*zbar2 - zbar1*zbar1*zbar1)
+        for k in range(4):
+            lp[k] += Afac*trig[k]
+            lp[4 + k] += Bfac*trig[k]
+            lp[8 + k] += Dfac*trig[k]
+        zbar1 = zbar2
+    lp[12] = lp[0]
+    lp[13] = lp[1]
+
+
+cdef void calc_ABD_from_LP(double h, double *u, double *lp, double *ABD,
+        double *Atrans) noexcept nogil:
+    r"""``ABD[0:36]`` and ``Atrans[0:4]``, both C-contiguous, from the
+    thickness, the invariants ``u[0:7]`` and the lamination parameters
+    ``lp[0:14]``, as in :func:`.laminate_from_LaminationParameters`"""
+    cdef int k
+    cdef double fac, c
+    cdef double *xi
+    cdef double m[18]
+    for k in range(3):
+        xi = &lp[4*k]
+        if k == 0:
+            fac = h
+        elif k == 1:
+            fac = h*h/4.
+        else:
+            fac = h*h*h/12.
+        # NOTE the B terms have no constant part
+        c = 0. if k == 1 else 1.
+        m[6*k] = fac*(c*u[0] + u[1]*xi[0] + u[2]*xi[2])
+        m[6*k + 1] = fac*(c*u[3] - u[2]*xi[2])
+        m[6*k + 2] = fac*(u[1]/2.*xi[1] + u[2]*xi[3])
+        m[6*k + 3] = fac*(c*u[0] - u[1]*xi[0] + u[2]*xi[2])
+        m[6*k + 4] = fac*(u[1]/2.*xi[1] - u[2]*xi[3])
+        m[6*k + 5] = fac*(c*u[4] - u[2]*xi[2])
+    _moments_to_ABD(m, ABD)
+    Atrans[0] = h*(u[5] + u[6]*lp[12])
+    Atrans[1] = -h*u[6]*lp[13]
+    Atrans[2] = Atrans[1]
+    Atrans[3] = h*(u[5] - u[6]*lp[12])
+
+
 cdef class Laminate:
     r"""
     Attributes
@@ -411,6 +826,15 @@ cdef class Laminate:
     intrhoz2 : float
         Integral `\int_{-h/2+offset}^{+h/2+offset} \rho(z)z^2 dz`, used in
         equivalent single layer finite element mass matrices
+    Gij : float
+        Integrals `\int_{-h/2+offset}^{+h/2+offset} \bar{Q}_{ij} z^5 dz`,
+        with `ij=11,12,16,22,26,66`, not used by the plate theories but
+        required to shift the reference surface, see :meth:`.shifted`
+    B44, B45, B55, E44, E45, E55 : float
+        Integrals `\int_{-h/2+offset}^{+h/2+offset} \bar{Q}_{ij} z dz` and
+        `\int_{-h/2+offset}^{+h/2+offset} \bar{Q}_{ij} z^3 dz` with
+        `ij=44,45,55`, required to shift the reference surface, see
+        :meth:`.shifted`
 
     """
     def __init__(Laminate self):
@@ -500,6 +924,34 @@ cdef class Laminate:
     def ABD(self):
         return np.asarray(self.get_ABD())
 
+    cpdef void get_ABD_into(Laminate self, double[:, :] ABD,
+            double[:, :] Atrans=None):
+        r"""Write ``ABD`` and ``Atrans`` into existing arrays
+
+        Same as :attr:`.ABD` and :attr:`.Atrans`, without allocating new
+        arrays, such that it can be used inside assembly loops. Strided
+        outputs are supported, for instance slices of a larger array.
+
+        Parameters
+        ----------
+        ABD : array
+            Output ``ABD`` matrix with ``shape=(6, 6)``.
+        Atrans : array or None, optional
+            Output ``Atrans`` matrix with ``shape=(2, 2)``.
+
+        """
+        cdef double m[18]
+        cdef double trans[3]
+        if ABD.shape[0] != 6 or ABD.shape[1] != 6:
+            raise ValueError('ABD must have shape=(6, 6)')
+        if Atrans is not None and (Atrans.shape[0] != 2 or Atrans.shape[1] != 2):
+            raise ValueError('Atrans must have shape=(2, 2)')
+        m[:] = [self.A11, self.A12, self.A16, self.A22, self.A26, self.A66,
+                self.B11, self.B12, self.B16, self.B22, self.B26, self.B66,
+                self.D11, self.D12, self.D16, self.D22, self.D26, self.D66]
+        trans[:] = [self.A44, self.A45, self.A55]
+        _write_ABD(m, trans, ABD, Atrans)
+
 
     cpdef void calc_scf(Laminate self):
         r"""Update shear correction factors of the :class:`.Laminate` object
@@ -527,44 +979,34 @@ cdef class Laminate:
             ``scf_k23``.
 
         """
-        cdef double D1, R1, den1, D2, R2, den2, offset, zbot, z1, z2, thetarad
-        cdef double e1, e2, nu12, nu21
-        D1 = 0
-        R1 = 0
-        den1 = 0
-
-        D2 = 0
-        R2 = 0
-        den2 = 0
-
-        offset = self.offset
-        zbot = -self.h/2. + offset
-        z1 = zbot
-
-        for ply in self.plies:
-            z2 = z1 + ply.h
-            thetarad = deg2rad(ply.thetadeg)
-            e1 = (ply.matlamina.e1 * np.cos(thetarad) +
-                  ply.matlamina.e2 * np.sin(thetarad))
-            e2 = (ply.matlamina.e2 * np.cos(thetarad) +
-                  ply.matlamina.e1 * np.sin(thetarad))
-            nu12 = (ply.matlamina.nu12 * np.cos(thetarad) +
-                  ply.matlamina.nu21 * np.sin(thetarad))
-            nu21 = (ply.matlamina.nu21 * np.cos(thetarad) +
-              ply.matlamina.nu12 * np.sin(thetarad))
-
-            D1 += e1 / (1 - nu12*nu21)
-            R1 += D1*((z2 - offset)**3/3. - (z1 - offset)**3/3.)
-            den1 += ply.matlamina.g13 * ply.h * (self.h / ply.h) * D1**2*(15*offset*z1**4 + 30*offset*z1**2*zbot*(2*offset - zbot) - 15*offset*z2**4 + 30*offset*z2**2*zbot*(-2*offset + zbot) - 3*z1**5 + 10*z1**3*(-2*offset**2 - 2*offset*zbot + zbot**2) - 15*z1*zbot**2*(4*offset**2 - 4*offset*zbot + zbot**2) + 3*z2**5 + 10*z2**3*(2*offset**2 + 2*offset*zbot - zbot**2) + 15*z2*zbot**2*(4*offset**2 - 4*offset*zbot + zbot**2))/(60*ply.matlamina.g13)
-
-            D2 += e2 / (1 - nu12*nu21)
-            R2 += D2*((z2 - self.offset)**3/3. - (z1 - self.offset)**3/3.)
-            den2 += ply.matlamina.g23 * ply.h * (self.h / ply.h) * D2**2*(15*offset*z1**4 + 30*offset*z1**2*zbot*(2*offset - zbot) - 15*offset*z2**4 + 30*offset*z2**2*zbot*(-2*offset + zbot) - 3*z1**5 + 10*z1**3*(-2*offset**2 - 2*offset*zbot + zbot**2) - 15*z1*zbot**2*(4*offset**2 - 4*offset*zbot + zbot**2) + 3*z2**5 + 10*z2**3*(2*offset**2 + 2*offset*zbot - zbot**2) + 15*z2*zbot**2*(4*offset**2 - 4*offset*zbot + zbot**2))/(60*ply.matlamina.g23)
-
-            z1 = z2
-
-        self.scf_k13 = R1**2 / den1
-        self.scf_k23 = R2**2 / den2
+        cdef int i, n
+        cdef double *buf
+        cdef double t0 = 0
+        cdef MatLamina m
+        cdef Lamina ply
+        if _profiling:
+            t0 = perf_counter()
+        n = len(self.plies)
+        buf = <double *>malloc(6*max(n, 1)*sizeof(double))
+        if buf == NULL:
+            raise MemoryError()
+        try:
+            for i in range(n):
+                ply = self.plies[i]
+                m = ply.matlamina
+                buf[i] = ply.h
+                buf[n + i] = ply.thetadeg
+                buf[2*n + i] = m.e1
+                buf[3*n + i] = m.e2
+                buf[4*n + i] = m.nu12
+                buf[5*n + i] = m.nu21
+            _calc_scf(n, buf, buf + n, buf + 2*n, buf + 3*n, buf + 4*n,
+                      buf + 5*n, 1, self.h, self.offset, &self.scf_k13,
+                      &self.scf_k23)
+        finally:
+            free(buf)
+        if _profiling:
+            _prof_toc(PROF_CALC_SCF, t0)
 
 
     cpdef void calc_equivalent_properties(Laminate self):
@@ -575,6 +1017,9 @@ cdef class Laminate:
             ``e1``, ``e2``, ``g12``, ```u12``, ``nu21``
 
         """
+        cdef double t0 = 0
+        if _profiling:
+            t0 = perf_counter()
         AI = np.linalg.inv(self.get_ABD())
         a11, a12, a22, a33 = AI[0,0], AI[0,1], AI[1,1], AI[2,2]
         self.e1 = 1./(self.h*a11)
@@ -582,6 +1027,8 @@ cdef class Laminate:
         self.g12 = 1./(self.h*a33)
         self.nu12 = - a12 / a11
         self.nu21 = - a12 / a22
+        if _profiling:
+            _prof_toc(PROF_CALC_EQUIVALENT_PROPERTIES, t0)
 
 
     cpdef void calc_constitutive_matrix(Laminate self):
@@ -594,6 +1041,9 @@ cdef class Laminate:
 
         """
         cdef double h0, hk_1, hk, tmp_hk, tmp_hk_1
+        cdef double t0 = 0
+        if _profiling:
+            t0 = perf_counter()
         self.h = 0.
         self.intrho = 0.
         self.intrhoz = 0.
@@ -610,6 +1060,9 @@ cdef class Laminate:
         self.A44 = 0; self.A45 = 0; self.A55 = 0
         self.D44 = 0; self.D45 = 0; self.D55 = 0
         self.F44 = 0; self.F45 = 0; self.F55 = 0
+        self.G11 = 0; self.G12 = 0; self.G16 = 0; self.G22 = 0; self.G26 = 0; self.G66 = 0
+        self.B44 = 0; self.B45 = 0; self.B55 = 0
+        self.E44 = 0; self.E45 = 0; self.E55 = 0
         for ply in self.plies:
             hk_1 = h0
             h0 += ply.h
@@ -639,6 +1092,10 @@ cdef class Laminate:
             self.B26 += 1/2.*ply.q26L*(tmp_hk - tmp_hk_1)
             self.B66 += 1/2.*ply.q66L*(tmp_hk - tmp_hk_1)
 
+            self.B44 += 1/2.*ply.q44L*(tmp_hk - tmp_hk_1)
+            self.B45 += 1/2.*ply.q45L*(tmp_hk - tmp_hk_1)
+            self.B55 += 1/2.*ply.q55L*(tmp_hk - tmp_hk_1)
+
             tmp_hk = hk*hk*hk
             tmp_hk_1 = hk_1*hk_1*hk_1
             self.D11 += 1/3.*ply.q11L*(tmp_hk - tmp_hk_1)
@@ -661,6 +1118,10 @@ cdef class Laminate:
             self.E26 += 1/4.*ply.q26L*(tmp_hk - tmp_hk_1)
             self.E66 += 1/4.*ply.q66L*(tmp_hk - tmp_hk_1)
 
+            self.E44 += 1/4.*ply.q44L*(tmp_hk - tmp_hk_1)
+            self.E45 += 1/4.*ply.q45L*(tmp_hk - tmp_hk_1)
+            self.E55 += 1/4.*ply.q55L*(tmp_hk - tmp_hk_1)
+
             tmp_hk = hk*hk*hk*hk*hk
             tmp_hk_1 = hk_1*hk_1*hk_1*hk_1*hk_1
             self.F11 += 1/5.*ply.q11L*(tmp_hk - tmp_hk_1)
@@ -674,6 +1135,15 @@ cdef class Laminate:
             self.F45 += 1/5.*ply.q45L*(tmp_hk - tmp_hk_1)
             self.F55 += 1/5.*ply.q55L*(tmp_hk - tmp_hk_1)
 
+            tmp_hk = hk*hk*hk*hk*hk*hk
+            tmp_hk_1 = hk_1*hk_1*hk_1*hk_1*hk_1*hk_1
+            self.G11 += 1/6.*ply.q11L*(tmp_hk - tmp_hk_1)
+            self.G12 += 1/6.*ply.q12L*(tmp_hk - tmp_hk_1)
+            self.G16 += 1/6.*ply.q16L*(tmp_hk - tmp_hk_1)
+            self.G22 += 1/6.*ply.q22L*(tmp_hk - tmp_hk_1)
+            self.G26 += 1/6.*ply.q26L*(tmp_hk - tmp_hk_1)
+            self.G66 += 1/6.*ply.q66L*(tmp_hk - tmp_hk_1)
+
             tmp_hk = hk*hk*hk*hk*hk*hk*hk
             tmp_hk_1 = hk_1*hk_1*hk_1*hk_1*hk_1*hk_1*hk_1
             self.H11 += 1/7.*ply.q11L*(tmp_hk - tmp_hk_1)
@@ -682,6 +1152,15 @@ cdef class Laminate:
             self.H22 += 1/7.*ply.q22L*(tmp_hk - tmp_hk_1)
             self.H26 += 1/7.*ply.q26L*(tmp_hk - tmp_hk_1)
             self.H66 += 1/7.*ply.q66L*(tmp_hk - tmp_hk_1)
+        if _profiling:
+            _prof_toc(PROF_CALC_CONSTITUTIVE_MATRIX, t0)
+
+
+    cpdef void _require_constitutive(Laminate self):
+        # NOTE called before the constitutive terms are read at the C level,
+        #      such that subclasses computing them on demand, e.g.
+        #      :class:`.LazyLaminate`, can compute them
+        pass
 
 
     cpdef void make_balanced(Laminate self):
@@ -748,6 +1227,19 @@ cdef class Laminate:
         self.D45 = 0
         self.F45 = 0
 
+        self.G11 = 0
+        self.G12 = 0
+        self.G16 = 0
+        self.G22 = 0
+        self.G26 = 0
+        self.G66 = 0
+        self.B44 = 0
+        self.B45 = 0
+        self.B55 = 0
+        self.E44 = 0
+        self.E45 = 0
+        self.E55 = 0
+
 
     cpdef void make_smeared(Laminate self):
         r"""Make a laminated with smeared properties
@@ -831,6 +1323,403 @@ cdef class Laminate:
         return lp
 
 
+    cpdef Laminate shifted(Laminate self, double offset):
+        r"""Return a copy of the laminate with a new offset
+
+        The stiffness and mass integrals are transformed using the
+        parallel-axis (binomial) relations:
+
+        .. math::
+            \int Q z'^n dz = \sum_{k=0}^{n} \binom{n}{k} \delta^{n-k}
+                              \int Q z^k dz
+
+        where `z' = z + \delta` and `\delta` is the difference between the
+        new and the current offset, such that no ply integral is
+        recomputed. Note that laminates created from lamination parameters
+        do not contain the high-order terms `E_{ij}`, `F_{ij}`, `G_{ij}` and
+        `H_{ij}`, and only the `A_{ij}`, `B_{ij}` and `D_{ij}` terms of the
+        shifted laminate are meaningful in such case.
+
+        Parameters
+        ----------
+        offset : float
+            Offset along the normal axis about the mid-surface.
+
+        Returns
+        -------
+        lam : :class:`.Laminate`
+            The new laminate, sharing the ``plies`` of the current laminate.
+            The equivalent properties are recomputed, while the shear
+            correction factors, which do not depend on the offset, are copied.
+
+        """
+        cdef double m[NUM_MOMENTS]
+        cdef double out[NUM_MOMENTS]
+        cdef Laminate lam = Laminate()
+        _pack_moments(self, m)
+        _shift_moments(m, offset - self.offset, out)
+        _unpack_moments(out, lam)
+        lam.h = self.h
+        lam.offset = offset
+        lam.scf_k13 = self.scf_k13
+        lam.scf_k23 = self.scf_k23
+        lam.plies = list(self.plies)
+        lam.stack = list(self.stack)
+        lam.calc_equivalent_properties()
+        return lam
+
+
+    def shifted_ABD(Laminate self, double[::1] offsets):
+        r"""Return the ``ABD`` matrix for many offsets
+
+        Batch version of :meth:`.shifted`, computing only the ``ABD`` matrix,
+        at a cost independent of the number of plies.
+
+        Parameters
+        ----------
+        offsets : array-like
+            Offsets along the normal axis about the mid-surface, with
+            ``shape=(N,)``.
+
+        Returns
+        -------
+        ABD : array
+            The ``ABD`` matrices with ``shape=(N, 6, 6)``.
+
+        """
+        cdef int i, j, k, N
+        cdef double delta
+        cdef double A[6]
+        cdef double B[6]
+        cdef double D[6]
+        cdef double Bi, Di
+        cdef int row[6]
+        cdef int col[6]
+        cdef double [:, :, ::1] ABD
+        row[:] = [0, 0, 0, 1, 1, 2]
+        col[:] = [0, 1, 2, 1, 2, 2]
+        A[:] = [self.A11, self.A12, self.A16, self.A22, self.A26, self.A66]
+        B[:] = [self.B11, self.B12, self.B16, self.B22, self.B26, self.B66]
+        D[:] = [self.D11, self.D12, self.D16, self.D22, self.D26, self.D66]
+        N = offsets.shape[0]
+        ABD = np.empty((N, 6, 6), dtype=DOUBLE)
+        with nogil:
+            for i in range(N):
+                delta = offsets[i] - self.offset
+                for k in range(6):
+                    Bi = B[k] + delta*A[k]
+                    Di = D[k] + 2*delta*B[k] + delta*delta*A[k]
+                    ABD[i, row[k], col[k]] = A[k]
+                    ABD[i, col[k], row[k]] = A[k]
+                    ABD[i, row[k], 3+col[k]] = Bi
+                    ABD[i, col[k], 3+row[k]] = Bi
+                    ABD[i, 3+row[k], col[k]] = Bi
+                    ABD[i, 3+col[k], row[k]] = Bi
+                    ABD[i, 3+row[k], 3+col[k]] = Di
+                    ABD[i, 3+col[k], 3+row[k]] = Di
+        return np.asarray(ABD)
+
+
+    cpdef void insert_ply(Laminate self, int index, Lamina ply):
+        r"""Insert a ply updating the laminate incrementally
+
+        The ply is inserted before position ``index`` of the ``plies``
+        list. The plies below and above the new ply are shifted by half of
+        the ply thickness using the parallel-axis relations of
+        :meth:`.shifted`, such that only the plies on the side closer to the
+        laminate surface are integrated. The mid-surface stays at the
+        current ``offset``.
+
+        The equivalent properties are updated, but not the shear correction
+        factors, see :meth:`.calc_scf`.
+
+        Parameters
+        ----------
+        index : int
+            Position of the new ply, from ``0`` (bottom) to ``len(plies)``
+            (top).
+        ply : :class:`.Lamina`
+            The new ply, with ``thetadeg``, ``h`` and ``matlamina`` defined.
+
+        """
+        cdef int i, n
+        cdef double t, zbot, ztop, z
+        cdef double m[NUM_MOMENTS]
+        cdef double side[NUM_MOMENTS]
+        cdef double other[NUM_MOMENTS]
+        cdef double out[NUM_MOMENTS]
+        cdef Lamina pi
+        n = len(self.plies)
+        if index < 0 or index > n:
+            raise IndexError('index must be between 0 and len(plies)')
+        ply.rebuild()
+        t = ply.h
+        zbot = -self.h/2. + self.offset
+        ztop = self.h/2. + self.offset
+        _pack_moments(self, m)
+        for i in range(NUM_MOMENTS):
+            side[i] = 0
+        if index <= n//2:
+            z = zbot
+            for i in range(index):
+                pi = self.plies[i]
+                _lamina_moments(pi, z, z + pi.h, 1., side)
+                z += pi.h
+            for i in range(NUM_MOMENTS):
+                other[i] = m[i] - side[i]
+            _combine_shifted(side, -t/2., other, t/2., out)
+        else:
+            z = ztop
+            for i in range(n-1, index-1, -1):
+                pi = self.plies[i]
+                _lamina_moments(pi, z - pi.h, z, 1., side)
+                z -= pi.h
+            for i in range(NUM_MOMENTS):
+                other[i] = m[i] - side[i]
+            _combine_shifted(other, -t/2., side, t/2., out)
+        _lamina_moments(ply, z - t/2., z + t/2., 1., out)
+        _unpack_moments(out, self)
+        self.h += t
+        if len(self.stack) == n:
+            self.stack.insert(index, ply.thetadeg)
+        self.plies.insert(index, ply)
+        self.calc_equivalent_properties()
+
+
+    cpdef void drop_ply(Laminate self, int index):
+        r"""Drop a ply updating the laminate incrementally
+
+        The plies below and above the dropped ply are shifted by half of the
+        ply thickness using the parallel-axis relations of :meth:`.shifted`,
+        such that only the plies on the side closer to the laminate surface
+        are integrated. The mid-surface stays at the current ``offset``.
+
+        The equivalent properties are updated, but not the shear correction
+        factors, see :meth:`.calc_scf`.
+
+        Parameters
+        ----------
+        index : int
+            Position of the dropped ply in the ``plies`` list.
+
+        """
+        cdef int i, n
+        cdef double t, zbot, ztop, z
+        cdef double m[NUM_MOMENTS]
+        cdef double side[NUM_MOMENTS]
+        cdef double other[NUM_MOMENTS]
+        cdef double out[NUM_MOMENTS]
+        cdef Lamina pi, ply
+        n = len(self.plies)
+        if index < 0 or index >= n:
+            raise IndexError('index must be between 0 and len(plies) - 1')
+        if n == 1:
+            raise ValueError('Cannot drop the only ply of a laminate')
+        ply = self.plies[index]
+        t = ply.h
+        zbot = -self.h/2. + self.offset
+        ztop = self.h/2. + self.offset
+        _pack_moments(self, m)
+        for i in range(NUM_MOMENTS):
+            side[i] = 0
+        if index < n//2:
+            z = zbot
+            for i in range(index):
+                pi = self.plies[i]
+                _lamina_moments(pi, z, z + pi.h, 1., side)
+                z += pi.h
+            _lamina_moments(ply, z, z + t, -1., m)
+            for i in range(NUM_MOMENTS):
+                other[i] = m[i] - side[i]
+            _combine_shifted(side, t/2., other, -t/2., out)
+        else:
+            z = ztop
+            for i in range(n-1, index, -1):
+                pi = self.plies[i]
+                _lamina_moments(pi, z - pi.h, z, 1., side)
+                z -= pi.h
+            _lamina_moments(ply, z - t, z, -1., m)
+            for i in range(NUM_MOMENTS):
+                other[i] = m[i] - side[i]
+            _combine_shifted(other, t/2., side, -t/2., out)
+        _unpack_moments(out, self)
+        self.h -= t
+        if len(self.stack) == n:
+            self.stack.pop(index)
+        self.plies.pop(index)
+        self.calc_equivalent_properties()
+
+
+    cpdef tuple calc_ply_grad(Laminate self):
+        r"""Gradients of the laminate stiffnesses with respect to the angle
+        and the thickness of each ply
+
+        The angle gradients use the trigonometric terms already computed in
+        :meth:`.Lamina.rebuild`. The thickness gradients keep the
+        mid-surface at the current ``offset``. All plies are evaluated in
+        a single pass.
+
+        Returns
+        -------
+        dABD_dtheta, dAtrans_dtheta, dABD_dh, dAtrans_dh : tuple of arrays
+            Derivatives of ``ABD`` and ``Atrans`` with respect to the ply
+            angles in degrees and with respect to the ply thicknesses, with
+            shapes ``(n_plies, 6, 6)`` and ``(n_plies, 2, 2)``.
+
+        """
+        cdef int i, n
+        cdef double u[7]
+        cdef double [::1] h
+        cdef double [:, ::1] q, dq
+        cdef double [:, :, ::1] dABDdt, dAtransdt, dABDdh, dAtransdh
+        cdef Lamina ply
+        n = len(self.plies)
+        dABDdt = np.zeros((n, 6, 6), dtype=DOUBLE)
+        dAtransdt = np.zeros((n, 2, 2), dtype=DOUBLE)
+        dABDdh = np.zeros((n, 6, 6), dtype=DOUBLE)
+        dAtransdh = np.zeros((n, 2, 2), dtype=DOUBLE)
+        if n == 0:
+            return (np.asarray(dABDdt), np.asarray(dAtransdt),
+                    np.asarray(dABDdh), np.asarray(dAtransdh))
+        h = np.empty(n, dtype=DOUBLE)
+        q = np.empty((n, 9), dtype=DOUBLE)
+        dq = np.empty((n, 9), dtype=DOUBLE)
+        for i in range(n):
+            ply = self.plies[i]
+            h[i] = ply.h
+            q[i, 0] = ply.q11L
+            q[i, 1] = ply.q12L
+            q[i, 2] = ply.q16L
+            q[i, 3] = ply.q22L
+            q[i, 4] = ply.q26L
+            q[i, 5] = ply.q66L
+            q[i, 6] = ply.q44L
+            q[i, 7] = ply.q45L
+            q[i, 8] = ply.q55L
+            _plane_stress_invariants(ply.matlamina, u)
+            _dqbar(u, ply.cos2t, ply.sin2t, ply.cos4t, ply.sin4t, &dq[i, 0])
+        _ply_grad(n, &h[0], &q[0, 0], &dq[0, 0], self.offset,
+                  &dABDdt[0, 0, 0], &dAtransdt[0, 0, 0], &dABDdh[0, 0, 0],
+                  &dAtransdh[0, 0, 0])
+        return (np.asarray(dABDdt), np.asarray(dAtransdt),
+                np.asarray(dABDdh), np.asarray(dAtransdh))
+
+
+cdef enum:
+    # in-plane terms ij=11,12,16,22,26,66 with moments z^0 to z^6,
+    # transverse shear terms ij=44,45,55 with moments z^0 to z^4,
+    # and the mass moments z^0 to z^2
+    NUM_MOMENTS = 7*6 + 5*3 + 3
+
+
+cdef void _pack_moments(Laminate lam, double *m):
+    lam._require_constitutive()
+    m[0:6] = [lam.A11, lam.A12, lam.A16, lam.A22, lam.A26, lam.A66]
+    m[6:12] = [lam.B11, lam.B12, lam.B16, lam.B22, lam.B26, lam.B66]
+    m[12:18] = [lam.D11, lam.D12, lam.D16, lam.D22, lam.D26, lam.D66]
+    m[18:24] = [lam.E11, lam.E12, lam.E16, lam.E22, lam.E26, lam.E66]
+    m[24:30] = [lam.F11, lam.F12, lam.F16, lam.F22, lam.F26, lam.F66]
+    m[30:36] = [lam.G11, lam.G12, lam.G16, lam.G22, lam.G26, lam.G66]
+    m[36:42] = [lam.H11, lam.H12, lam.H16, lam.H22, lam.H26, lam.H66]
+    m[42:45] = [lam.A44, lam.A45, lam.A55]
+    m[45:48] = [lam.B44, lam.B45, lam.B55]
+    m[48:51] = [lam.D44, lam.D45, lam.D55]
+    m[51:54] = [lam.E44, lam.E45, lam.E55]
+    m[54:57] = [lam.F44, lam.F45, lam.F55]
+    m[57:60] = [lam.intrho, lam.intrhoz, lam.intrhoz2]
+
+
+cdef void _unpack_moments(double *m, Laminate lam):
+    lam.A11, lam.A12, lam.A16, lam.A22, lam.A26, lam.A66 = m[0], m[1], m[2], m[3], m[4], m[5]
+    lam.B11, lam.B12, lam.B16, lam.B22, lam.B26, lam.B66 = m[6], m[7], m[8], m[9], m[10], m[11]
+    lam.D11, lam.D12, lam.D16, lam.D22, lam.D26, lam.D66 = m[12], m[13], m[14], m[15], m[16], m[17]
+    lam.E11, lam.E12, lam.E16, lam.E22, lam.E26, lam.E66 = m[18], m[19], m[20], m[21], m[22], m[23]
+    lam.F11, lam.F12, lam.F16, lam.F22, lam.F26, lam.F66 = m[24], m[25], m[26], m[27], m[28], m[29]
+    lam.G11, lam.G12, lam.G16, lam.G22, lam.G26, lam.G66 = m[30], m[31], m[32], m[33], m[34], m[35]
+    lam.H11, lam.H12, lam.H16, lam.H22, lam.H26, lam.H66 = m[36], m[37], m[38], m[39], m[40], m[41]
+    lam.A44, lam.A45, lam.A55 = m[42], m[43], m[44]
+    lam.B44, lam.B45, lam.B55 = m[45], m[46], m[47]
+    lam.D44, lam.D45, lam.D55 = m[48], m[49], m[50]
+    lam.E44, lam.E45, lam.E55 = m[51], m[52], m[53]
+    lam.F44, lam.F45, lam.F55 = m[54], m[55], m[56]
+    lam.intrho, lam.intrhoz, lam.intrhoz2 = m[57], m[58], m[59]
+
+
+cdef void _shift_moments(double *m, double delta, double *out) noexcept nogil:
+    r"""Parallel-axis transformation of the moments packed by
+    ``_pack_moments()`` for a shift `z' = z + \delta`
+
+    """
+    cdef int n, k, j
+    cdef double binom[7][7]
+    cdef double dpow[7]
+    dpow[0] = 1.
+    for n in range(1, 7):
+        dpow[n] = dpow[n-1]*delta
+    for n in range(7):
+        binom[n][0] = 1.
+        binom[n][n] = 1.
+        for k in range(1, n):
+            binom[n][k] = binom[n-1][k-1] + binom[n-1][k]
+    for n in range(7):
+        for j in range(6):
+            out[6*n + j] = 0
+            for k in range(n+1):
+                out[6*n + j] += binom[n][k]*dpow[n-k]*m[6*k + j]
+    for n in range(5):
+        for j in range(3):
+            out[42 + 3*n + j] = 0
+            for k in range(n+1):
+                out[42 + 3*n + j] += binom[n][k]*dpow[n-k]*m[42 + 3*k + j]
+    for n in range(3):
+        out[57 + n] = 0
+        for k in range(n+1):
+            out[57 + n] += binom[n][k]*dpow[n-k]*m[57 + k]
+
+
+cdef void _ply_moments(double *q, double rho, double z1, double z2,
+        double fac, double *m) noexcept nogil:
+    r"""Add ``fac`` times the moments of a ply with the terms ``q`` =
+    (q11L, q12L, q16L, q22L, q26L, q66L, q44L, q45L, q55L), in `z_1 \le z
+    \le z_2`, to the moments packed as in ``_pack_moments()``
+
+    """
+    cdef int n, j
+    cdef double p1, p2, dz
+    p1 = z1
+    p2 = z2
+    for n in range(7):
+        dz = fac*(p2 - p1)/(n + 1)
+        for j in range(6):
+            m[6*n + j] += q[j]*dz
+        if n < 5:
+            for j in range(3):
+                m[42 + 3*n + j] += q[6 + j]*dz
+        if n < 3:
+            m[57 + n] += rho*dz
+        p1 *= z1
+        p2 *= z2
+
+
+cdef void _lamina_moments(Lamina ply, double z1, double z2, double fac,
+        double *m):
+    cdef double q[9]
+    q[:] = [ply.q11L, ply.q12L, ply.q16L, ply.q22L, ply.q26L, ply.q66L,
+            ply.q44L, ply.q45L, ply.q55L]
+    _ply_moments(q, ply.matlamina.rho, z1, z2, fac, m)
+
+
+cdef void _combine_shifted(double *below, double dbelow, double *above,
+        double dabove, double *out) noexcept nogil:
+    r"""``out = shift(below, dbelow) + shift(above, dabove)``"""
+    cdef int i
+    cdef double tmp[NUM_MOMENTS]
+    _shift_moments(below, dbelow, out)
+    _shift_moments(above, dabove, tmp)
+    for i in range(NUM_MOMENTS):
+        out[i] += tmp[i]
+
+
 cpdef LaminationParameters make_balanced_LP(LaminationParameters lp):
     r"""Make balanced lamination parameters
 
@@ -1193,3 +2082,620 @@ cpdef Laminate n_double_laminate(double thickness, int n, double[::1] angles_deg
     lam.calc_equivalent_properties()
 
     return lam
+
+
+cpdef tuple calc_scf_batch(double[:, ::1] thetadegs, double[::1] plyts,
+        MatLamina matlamina, double offset=0.):
+    r"""Shear correction factors for many stacking sequences
+
+    Batch version of :meth:`.Laminate.calc_scf`, for laminates with the same
+    number of plies, ply thicknesses and material.
+
+    Parameters
+    ----------
+    thetadegs : array-like
+        Ply angles in degrees, with ``shape=(N, n_plies)``.
+    plyts : array-like
+        Thickness of each ply, with ``shape=(n_plies,)``.
+    matlamina : :class:`.MatLamina`
+        Material of all plies.
+    offset : float, optional
+        Offset along the normal axis about the mid-surface.
+
+    Returns
+    -------
+    k13, k23 : tuple of arrays
+        Shear correction factors, each with ``shape=(N,)``.
+
+    """
+    cdef int i, N, n
+    cdef double htotal
+    cdef double e1, e2, nu12, nu21
+    cdef double [::1] k13, k23
+    N = thetadegs.shape[0]
+    n = thetadegs.shape[1]
+    if plyts.shape[0] != n:
+        raise ValueError('plyts must have one entry per ply')
+    k13 = np.zeros(N, dtype=DOUBLE)
+    k23 = np.zeros(N, dtype=DOUBLE)
+    e1 = matlamina.e1
+    e2 = matlamina.e2
+    nu12 = matlamina.nu12
+    nu21 = matlamina.nu21
+    htotal = 0.
+    for i in range(n):
+        htotal += plyts[i]
+    if n > 0:
+        for i in prange(N, nogil=True, schedule='static'):
+            _calc_scf(n, &plyts[0], &thetadegs[i, 0], &e1, &e2, &nu12,
+                      &nu21, 0, htotal, offset, &k13[i], &k23[i])
+    return np.asarray(k13), np.asarray(k23)
+
+
+cpdef tuple calc_ABD_batch(double[:, ::1] thetadegs, double[::1] plyts,
+        MatLamina matlamina, double offset=0.):
+    r"""``ABD`` and ``Atrans`` for many stacking sequences
+
+    Batch version of :meth:`.Laminate.calc_constitutive_matrix`, for
+    laminates with the same number of plies, ply thicknesses and material,
+    see :func:`.calc_ABD_batch_into`.
+
+    Parameters
+    ----------
+    thetadegs : array-like
+        Ply angles in degrees, with ``shape=(N, n_plies)``.
+    plyts : array-like
+        Thickness of each ply, with ``shape=(n_plies,)``.
+    matlamina : :class:`.MatLamina`
+        Material of all plies.
+    offset : float, optional
+        Offset along the normal axis about the mid-surface.
+
+    Returns
+    -------
+    ABD, Atrans : tuple of arrays
+        The ``ABD`` matrices with ``shape=(N, 6, 6)`` and the ``Atrans``
+        matrices with ``shape=(N, 2, 2)``.
+
+    """
+    cdef int i, N, n
+    cdef double u[7]
+    cdef double [:, :, ::1] ABD, Atrans
+    N = thetadegs.shape[0]
+    n = thetadegs.shape[1]
+    if plyts.shape[0] != n:
+        raise ValueError('plyts must have one entry per ply')
+    if n == 0:
+        raise ValueError('At least one ply is required')
+    ABD = np.empty((N, 6, 6), dtype=DOUBLE)
+    Atrans = np.empty((N, 2, 2), dtype=DOUBLE)
+    _plane_stress_invariants(matlamina, u)
+    for i in prange(N, nogil=True, schedule='static'):
+        calc_ABD(n, &thetadegs[i, 0], &plyts[0], u, offset, &ABD[i, 0, 0],
+                 &Atrans[i, 0, 0])
+    return np.asarray(ABD), np.asarray(Atrans)
+
+
+cpdef void calc_ABD_batch_into(double[:, ::1] thetadegs, double[::1] plyts,
+        MatLamina matlamina, double[:, :, :] ABD, double[:, :, :] Atrans=None,
+        double offset=0.):
+    r"""Write ``ABD`` and ``Atrans`` of many stacking sequences into existing
+    arrays
+
+    The outputs are written directly, without intermediate arrays, and the
+    stacking sequences are evaluated in parallel without the GIL. Strided
+    outputs are supported, for instance slices of a larger array of
+    integration points.
+
+    Parameters
+    ----------
+    thetadegs : array-like
+        Ply angles in degrees, with ``shape=(N, n_plies)``.
+    plyts : array-like
+        Thickness of each ply, with ``shape=(n_plies,)``.
+    matlamina : :class:`.MatLamina`
+        Material of all plies.
+    ABD : array
+        Output ``ABD`` matrices with ``shape=(N, 6, 6)``.
+    Atrans : array or None, optional
+        Output ``Atrans`` matrices with ``shape=(N, 2, 2)``.
+    offset : float, optional
+        Offset along the normal axis about the mid-surface.
+
+    """
+    cdef int i, N, n
+    cdef double u[7]
+    cdef double *m
+    N = thetadegs.shape[0]
+    n = thetadegs.shape[1]
+    if plyts.shape[0] != n:
+        raise ValueError('plyts must have one entry per ply')
+    if ABD.shape[0] != N or ABD.shape[1] != 6 or ABD.shape[2] != 6:
+        raise ValueError('ABD must have shape=(N, 6, 6)')
+    if Atrans is not None and (Atrans.shape[0] != N or Atrans.shape[1] != 2
+                               or Atrans.shape[2] != 2):
+        raise ValueError('Atrans must have shape=(N, 2, 2)')
+    if n == 0:
+        raise ValueError('At least one ply is required')
+    _plane_stress_invariants(matlamina, u)
+    with nogil, parallel():
+        # NOTE one work buffer per thread
+        m = <double *>malloc(21*sizeof(double))
+        if m == NULL:
+            with gil:
+                raise MemoryError()
+        for i in prange(N, schedule='static'):
+            _laminate_ABD(n, &plyts[0], &thetadegs[i, 0], u, offset, m,
+                          &m[18])
+            if Atrans is None:
+                _write_ABD(m, &m[18], ABD[i], None)
+            else:
+                _write_ABD(m, &m[18], ABD[i], Atrans[i])
+        free(m)
+
+
+cpdef tuple calc_ABD_batch_laminaprops(double[:, ::1] thetadegs,
+        double[:, ::1] plyts, double[:, ::1] laminaprops, double offset=0.):
+    r"""``ABD`` and ``Atrans`` for many laminates with different ply
+    thicknesses and materials
+
+    Each laminate has its own ply thicknesses and material, as required by
+    the samples of :mod:`composites.montecarlo`, whereas all plies of a
+    laminate have the same material.
+
+    Parameters
+    ----------
+    thetadegs : array-like
+        Ply angles in degrees, with ``shape=(N, n_plies)``.
+    plyts : array-like
+        Ply thicknesses, with ``shape=(N, n_plies)``.
+    laminaprops : array-like
+        Material of each laminate ``(e1, e2, nu12, g12, g13, g23)``, with
+        ``shape=(N, 6)``.
+    offset : float, optional
+        Offset along the normal axis about the mid-surface.
+
+    Returns
+    -------
+    ABD, Atrans : tuple of arrays
+        The ``ABD`` matrices with ``shape=(N, 6, 6)`` and the ``Atrans``
+        matrices with ``shape=(N, 2, 2)``.
+
+    """
+    cdef int i, N, n
+    cdef double *u
+    cdef double [:, :, ::1] ABD, Atrans
+    N = thetadegs.shape[0]
+    n = thetadegs.shape[1]
+    if plyts.shape[0] != N or plyts.shape[1] != n:
+        raise ValueError('plyts must have shape=(N, n_plies)')
+    if laminaprops.shape[0] != N or laminaprops.shape[1] != 6:
+        raise ValueError('laminaprops must have shape=(N, 6)')
+    if n == 0:
+        raise ValueError('At least one ply is required')
+    ABD = np.empty((N, 6, 6), dtype=DOUBLE)
+    Atrans = np.empty((N, 2, 2), dtype=DOUBLE)
+    with nogil, parallel():
+        # NOTE one work buffer per thread
+        u = <double *>malloc(7*sizeof(double))
+        if u == NULL:
+            with gil:
+                raise MemoryError()
+        for i in prange(N, schedule='static'):
+            calc_invariants(laminaprops[i, 0], laminaprops[i, 1],
+                            laminaprops[i, 2],
+                            laminaprops[i, 2]*laminaprops[i, 1]/laminaprops[i, 0],
+                            laminaprops[i, 3], laminaprops[i, 4],
+                            laminaprops[i, 5], u)
+            calc_ABD(n, &thetadegs[i, 0], &plyts[i, 0], u, offset,
+                     &ABD[i, 0, 0], &Atrans[i, 0, 0])
+        free(u)
+    return np.asarray(ABD), np.asarray(Atrans)
+
+
+cpdef tuple calc_ABD_LP_batch(double[:, ::1] thetadegs, double[:, ::1] plyts,
+        double[:, ::1] laminaprops, double[::1] offsets):
+    r"""``ABD``, ``Atrans`` and lamination parameters for many laminates
+    with different ply thicknesses, materials and offsets
+
+    As :func:`.calc_ABD_batch_laminaprops`, with one offset per laminate
+    and also returning the lamination parameters.
+
+    Parameters
+    ----------
+    thetadegs : array-like
+        Ply angles in degrees, with ``shape=(N, n_plies)``.
+    plyts : array-like
+        Ply thicknesses, with ``shape=(N, n_plies)``.
+    laminaprops : array-like
+        Material of each laminate ``(e1, e2, nu12, g12, g13, g23)``, with
+        ``shape=(N, 6)``.
+    offsets : array-like
+        Offset of each laminate, with ``shape=(N,)``.
+
+    Returns
+    -------
+    ABD, Atrans, lp : tuple of arrays
+        The ``ABD`` matrices with ``shape=(N, 6, 6)``, the ``Atrans``
+        matrices with ``shape=(N, 2, 2)`` and the lamination parameters
+        with ``shape=(N, 14)``, ordered as in
+        :func:`.taper_lamination_parameters`.
+
+    """
+    cdef int i, N, n
+    cdef double *u
+    cdef double [:, :, ::1] ABD, Atrans
+    cdef double [:, ::1] lp
+    N = thetadegs.shape[0]
+    n = thetadegs.shape[1]
+    if plyts.shape[0] != N or plyts.shape[1] != n:
+        raise ValueError('plyts must have shape=(N, n_plies)')
+    if laminaprops.shape[0] != N or laminaprops.shape[1] != 6:
+        raise ValueError('laminaprops must have shape=(N, 6)')
+    if offsets.shape[0] != N:
+        raise ValueError('offsets must have shape=(N,)')
+    if n == 0:
+        raise ValueError('At least one ply is required')
+    ABD = np.empty((N, 6, 6), dtype=DOUBLE)
+    Atrans = np.empty((N, 2, 2), dtype=DOUBLE)
+    lp = np.empty((N, 14), dtype=DOUBLE)
+    with nogil, parallel():
+        # NOTE one work buffer per thread
+        u = <double *>malloc(7*sizeof(double))
+        if u == NULL:
+            with gil:
+                raise MemoryError()
+        for i in prange(N, schedule='static'):
+            calc_invariants(laminaprops[i, 0], laminaprops[i, 1],
+                            laminaprops[i, 2],
+                            laminaprops[i, 2]*laminaprops[i, 1]/laminaprops[i, 0],
+                            laminaprops[i, 3], laminaprops[i, 4],
+                            laminaprops[i, 5], u)
+            calc_ABD(n, &thetadegs[i, 0], &plyts[i, 0], u, offsets[i],
+                     &ABD[i, 0, 0], &Atrans[i, 0, 0])
+            calc_LP(n, &thetadegs[i, 0], &plyts[i, 0], offsets[i], &lp[i, 0])
+        free(u)
+    return np.asarray(ABD), np.asarray(Atrans), np.asarray(lp)
+
+
+cpdef double[:, ::1] calc_LP_batch(double[:, ::1] thetadegs,
+        double[::1] plyts, double offset=0.):
+    r"""Lamination parameters for many stacking sequences
+
+    Batch version of :meth:`.Laminate.calc_lamination_parameters`, for
+    laminates with the same number of plies and ply thicknesses.
+
+    Parameters
+    ----------
+    thetadegs : array-like
+        Ply angles in degrees, with ``shape=(N, n_plies)``.
+    plyts : array-like
+        Thickness of each ply, with ``shape=(n_plies,)``.
+    offset : float, optional
+        Offset along the normal axis about the mid-surface.
+
+    Returns
+    -------
+    lp : array
+        The lamination parameters with ``shape=(N, 14)``, ordered as in
+        :func:`.taper_lamination_parameters`.
+
+    """
+    cdef int i, N, n
+    cdef double [:, ::1] lp
+    N = thetadegs.shape[0]
+    n = thetadegs.shape[1]
+    if plyts.shape[0] != n:
+        raise ValueError('plyts must have one entry per ply')
+    if n == 0:
+        raise ValueError('At least one ply is required')
+    lp = np.empty((N, 14), dtype=DOUBLE)
+    for i in prange(N, nogil=True, schedule='static'):
+        calc_LP(n, &thetadegs[i, 0], &plyts[0], offset, &lp[i, 0])
+    return np.asarray(lp)
+
+
+cpdef tuple calc_ABD_from_LP_batch(double[::1] thickness, double[:, ::1] lp,
+        MatLamina matlamina):
+    r"""``ABD`` and ``Atrans`` for many sets of lamination parameters
+
+    Batch version of :func:`.laminate_from_LaminationParameters`.
+
+    Parameters
+    ----------
+    thickness : array-like
+        Total thickness of each laminate, with ``shape=(N,)``.
+    lp : array-like
+        The lamination parameters with ``shape=(N, 14)``, ordered as in
+        :func:`.taper_lamination_parameters`.
+    matlamina : :class:`.MatLamina`
+        Material of all laminates.
+
+    Returns
+    -------
+    ABD, Atrans : tuple of arrays
+        The ``ABD`` matrices with ``shape=(N, 6, 6)`` and the ``Atrans``
+        matrices with ``shape=(N, 2, 2)``.
+
+    """
+    cdef int i, N
+    cdef double u[7]
+    cdef double [:, :, ::1] ABD, Atrans
+    N = thickness.shape[0]
+    if lp.shape[0] != N or lp.shape[1] != 14:
+        raise ValueError('lp must have shape=(N, 14)')
+    u[:] = [matlamina.u1, matlamina.u2, matlamina.u3, matlamina.u4,
+            matlamina.u5, matlamina.u6, matlamina.u7]
+    ABD = np.empty((N, 6, 6), dtype=DOUBLE)
+    Atrans = np.empty((N, 2, 2), dtype=DOUBLE)
+    for i in prange(N, nogil=True, schedule='static'):
+        calc_ABD_from_LP(thickness[i], u, &lp[i, 0], &ABD[i, 0, 0],
+                         &Atrans[i, 0, 0])
+    return np.asarray(ABD), np.asarray(Atrans)
+
+
+cpdef tuple calc_ply_grad_batch(double[:, ::1] thetadegs, double[::1] plyts,
+        MatLamina matlamina, double offset=0.):
+    r"""Ply angle and ply thickness gradients for many stacking sequences
+
+    Batch version of :meth:`.Laminate.calc_ply_grad`, for laminates with the
+    same number of plies, ply thicknesses and material.
+
+    Parameters
+    ----------
+    thetadegs : array-like
+        Ply angles in degrees, with ``shape=(N, n_plies)``.
+    plyts : array-like
+        Thickness of each ply, with ``shape=(n_plies,)``.
+    matlamina : :class:`.MatLamina`
+        Material of all plies.
+    offset : float, optional
+        Offset along the normal axis about the mid-surface.
+
+    Returns
+    -------
+    dABD_dtheta, dAtrans_dtheta, dABD_dh, dAtrans_dh : tuple of arrays
+        Derivatives of ``ABD`` and ``Atrans`` with respect to the ply angles
+        in degrees and with respect to the ply thicknesses, with shapes
+        ``(N, n_plies, 6, 6)`` and ``(N, n_plies, 2, 2)``.
+
+    """
+    cdef int i, j, N, n
+    cdef double thetarad, cos2t, sin2t, cos4t, sin4t
+    cdef double u[7]
+    cdef double *q
+    cdef double [:, :, :, ::1] dABDdt, dAtransdt, dABDdh, dAtransdh
+    N = thetadegs.shape[0]
+    n = thetadegs.shape[1]
+    if plyts.shape[0] != n:
+        raise ValueError('plyts must have one entry per ply')
+    dABDdt = np.zeros((N, n, 6, 6), dtype=DOUBLE)
+    dAtransdt = np.zeros((N, n, 2, 2), dtype=DOUBLE)
+    dABDdh = np.zeros((N, n, 6, 6), dtype=DOUBLE)
+    dAtransdh = np.zeros((N, n, 2, 2), dtype=DOUBLE)
+    _plane_stress_invariants(matlamina, u)
+    if n > 0:
+        with nogil, parallel():
+            # NOTE one work buffer per thread
+            q = <double *>malloc(18*n*sizeof(double))
+            if q == NULL:
+                with gil:
+                    raise MemoryError()
+            for i in prange(N, schedule='static'):
+                for j in range(n):
+                    thetarad = deg2rad(thetadegs[i, j])
+                    cos2t = cos(2*thetarad)
+                    sin2t = sin(2*thetarad)
+                    cos4t = cos(4*thetarad)
+                    sin4t = sin(4*thetarad)
+                    _qbar(u, cos2t, sin2t, cos4t, sin4t, &q[9*j])
+                    _dqbar(u, cos2t, sin2t, cos4t, sin4t, &q[9*(n + j)])
+                _ply_grad(n, &plyts[0], q, &q[9*n], offset,
+                          &dABDdt[i, 0, 0, 0], &dAtransdt[i, 0, 0, 0],
+                          &dABDdh[i, 0, 0, 0], &dAtransdh[i, 0, 0, 0])
+            free(q)
+    return (np.asarray(dABDdt), np.asarray(dAtransdt), np.asarray(dABDdh),
+            np.asarray(dAtransdh))
+
+
+cdef _taper_moments(Laminate lam, drop_sequence, bint trig):
+    r"""Packed moments at every station of a tapered laminate
+
+    With ``trig=True`` the terms (cos2t, sin2t, cos4t, sin4t) of each ply
+    are integrated in place of (q11L, q12L, q16L, q22L), as required to
+    compute lamination parameters.
+
+    """
+    cdef int i, j, k, s, n, S, nbelow, nabove
+    cdef double t, h, offset, z, thetarad
+    cdef double m[NUM_MOMENTS]
+    cdef double side[NUM_MOMENTS]
+    cdef double other[NUM_MOMENTS]
+    cdef double [:, ::1] q, out
+    cdef double [::1] rho, plyh, hs
+    cdef unsigned char [::1] active
+    cdef Py_ssize_t [::1] drops
+    cdef Lamina ply
+    n = len(lam.plies)
+    drops = np.asarray(drop_sequence, dtype=np.intp).ravel()
+    S = drops.shape[0]
+    if S >= n:
+        raise ValueError('At least one ply must remain in the laminate')
+    active = np.ones(n, dtype=np.uint8)
+    for s in range(S):
+        k = drops[s]
+        if k < 0 or k >= n or not active[k]:
+            raise ValueError('Invalid or repeated ply index %d in '
+                             'drop_sequence' % k)
+        active[k] = 0
+    active[:] = 1
+    q = np.zeros((n, 9), dtype=DOUBLE)
+    rho = np.empty(n, dtype=DOUBLE)
+    plyh = np.empty(n, dtype=DOUBLE)
+    h = 0.
+    for i in range(n):
+        ply = lam.plies[i]
+        if trig:
+            # NOTE from thetadeg, without rebuilding the plies
+            thetarad = deg2rad(ply.thetadeg)
+            q[i, 0] = cos(2*thetarad)
+            q[i, 1] = sin(2*thetarad)
+            q[i, 2] = cos(4*thetarad)
+            q[i, 3] = sin(4*thetarad)
+        else:
+            q[i, 0] = ply.q11L
+            q[i, 1] = ply.q12L
+            q[i, 2] = ply.q16L
+            q[i, 3] = ply.q22L
+            q[i, 4] = ply.q26L
+            q[i, 5] = ply.q66L
+            q[i, 6] = ply.q44L
+            q[i, 7] = ply.q45L
+            q[i, 8] = ply.q55L
+        rho[i] = ply.matlamina.rho
+        plyh[i] = ply.h
+        h += ply.h
+    out = np.empty((S + 1, NUM_MOMENTS), dtype=DOUBLE)
+    hs = np.empty(S + 1, dtype=DOUBLE)
+    offset = lam.offset
+    for j in range(NUM_MOMENTS):
+        m[j] = 0
+    if trig:
+        z = -h/2. + offset
+        for i in range(n):
+            _ply_moments(&q[i, 0], rho[i], z, z + plyh[i], 1., m)
+            z += plyh[i]
+    else:
+        _pack_moments(lam, m)
+    with nogil:
+        for j in range(NUM_MOMENTS):
+            out[0, j] = m[j]
+        hs[0] = h
+        for s in range(S):
+            k = drops[s]
+            t = plyh[k]
+            nbelow = 0
+            for i in range(k):
+                nbelow += active[i]
+            nabove = n - s - 1 - nbelow
+            for j in range(NUM_MOMENTS):
+                side[j] = 0
+            if nbelow <= nabove:
+                z = -h/2. + offset
+                for i in range(k):
+                    if active[i]:
+                        _ply_moments(&q[i, 0], rho[i], z, z + plyh[i], 1., side)
+                        z += plyh[i]
+                _ply_moments(&q[k, 0], rho[k], z, z + t, -1., m)
+                for j in range(NUM_MOMENTS):
+                    other[j] = m[j] - side[j]
+                _combine_shifted(side, t/2., other, -t/2., m)
+            else:
+                z = h/2. + offset
+                for i in range(n-1, k, -1):
+                    if active[i]:
+                        _ply_moments(&q[i, 0], rho[i], z - plyh[i], z, 1., side)
+                        z -= plyh[i]
+                _ply_moments(&q[k, 0], rho[k], z - t, z, -1., m)
+                for j in range(NUM_MOMENTS):
+                    other[j] = m[j] - side[j]
+                _combine_shifted(other, t/2., side, -t/2., m)
+            active[k] = 0
+            h -= t
+            for j in range(NUM_MOMENTS):
+                out[s + 1, j] = m[j]
+            hs[s + 1] = h
+    return out, hs
+
+
+def taper_ABD(Laminate lam, drop_sequence):
+    r"""``ABD`` matrix at every station of a tapered laminate
+
+    Starting from the base laminate, the plies are dropped one at a time
+    following ``drop_sequence``, with the same incremental update used in
+    :meth:`.Laminate.drop_ply`, in a single pass and without creating
+    intermediate :class:`.Laminate` objects. Each drop integrates the
+    remaining plies between the dropped ply and the closer surface, such
+    that the cost is `O(n_{plies} n_{drops})` in the worst case.
+
+    Parameters
+    ----------
+    lam : :class:`.Laminate`
+        The base laminate, with all plies.
+    drop_sequence : array-like
+        Indices of the plies of the base laminate, in the order they are
+        dropped.
+
+    Returns
+    -------
+    ABD : array
+        The ``ABD`` matrices with ``shape=(len(drop_sequence) + 1, 6, 6)``,
+        where the first station corresponds to the base laminate.
+
+    """
+    cdef int s
+    cdef double [:, ::1] m
+    cdef double [:, :, ::1] ABD
+    m, _ = _taper_moments(lam, drop_sequence, False)
+    ABD = np.empty((m.shape[0], 6, 6), dtype=DOUBLE)
+    for s in range(m.shape[0]):
+        _moments_to_ABD(&m[s, 0], &ABD[s, 0, 0])
+    return np.asarray(ABD)
+
+
+def taper_lamination_parameters(Laminate lam, drop_sequence):
+    r"""Lamination parameters at every station of a tapered laminate
+
+    See :func:`.taper_ABD` for details.
+
+    Parameters
+    ----------
+    lam : :class:`.Laminate`
+        The base laminate, with all plies.
+    drop_sequence : array-like
+        Indices of the plies of the base laminate, in the order they are
+        dropped.
+
+    Returns
+    -------
+    lp : array
+        The lamination parameters with ``shape=(len(drop_sequence) + 1,
+        14)``, ordered as in :class:`.LaminationParameters`: `\xi_{A1}
+        \cdots \xi_{A4}`, `\xi_{B1} \cdots \xi_{B4}`, `\xi_{D1} \cdots
+        \xi_{D4}`, `\xi_{{A_{trans}}1}`, `\xi_{{A_{trans}}2}`.
+
+    """
+    cdef int s, k
+    cdef double h
+    cdef double [:, ::1] m, lp
+    cdef double [::1] hs
+    m, hs = _taper_moments(lam, drop_sequence, True)
+    lp = np.empty((m.shape[0], 14), dtype=DOUBLE)
+    for s in range(m.shape[0]):
+        h = hs[s]
+        for k in range(4):
+            lp[s, k] = m[s, k]/h
+            lp[s, 4 + k] = 4*m[s, 6 + k]/(h*h)
+            lp[s, 8 + k] = 12*m[s, 12 + k]/(h*h*h)
+        lp[s, 12] = lp[s, 0]
+        lp[s, 13] = lp[s, 1]
+    return np.asarray(lp)
+
+
+cdef void _moments_to_ABD(double *m, double *ABD) noexcept nogil:
+    # m with the A, B and D terms 11, 12, 16, 22, 26, 66 into a C-contiguous
+    # (6, 6) ABD matrix
+    cdef int k
+    cdef int row[6]
+    cdef int col[6]
+    row[:] = [0, 0, 0, 1, 1, 2]
+    col[:] = [0, 1, 2, 1, 2, 2]
+    for k in range(6):
+        ABD[6*row[k] + col[k]] = m[k]
+        ABD[6*col[k] + row[k]] = m[k]
+        ABD[6*row[k] + 3 + col[k]] = m[6 + k]
+        ABD[6*col[k] + 3 + row[k]] = m[6 + k]
+        ABD[6*(3 + row[k]) + col[k]] = m[6 + k]
+        ABD[6*(3 + col[k]) + row[k]] = m[6 + k]
+        ABD[6*(3 + row[k]) + 3 + col[k]] = m[12 + k]
+        ABD[6*(3 + col[k]) + 3 + row[k]] = m[12 + k]
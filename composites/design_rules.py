@@ -0,0 +1,149 @@
+r"""
+======================================================
+Stacking design rules (:mod:`composites.design_rules`)
+======================================================
+
+.. currentmodule::composites.design_rules
+
+Vectorized checks of the design rules commonly applied to stacking
+sequences, for populations of candidates given as arrays of ply angles with
+``shape=(N, n_plies)``. The rules of :data:`.DESIGN_RULES` are:
+
+- ``'symmetry'``: the stacking sequence is symmetric about the mid-plane
+- ``'balance'``: each `+\theta` ply, other than `0^\circ` and
+  `90^\circ`, has a `-\theta` counterpart
+- ``'contiguity'``: at most ``max_contiguous`` contiguous plies with the
+  same angle
+- ``'ten_percent'``: at least a fraction ``min_fraction`` of the plies in
+  each of the main ``directions``
+- ``'disorientation'``: at most ``max_disorientation`` degrees between the
+  fibers of adjacent plies
+- ``'outer_45'``: the outer plies are `\pm 45^\circ` plies
+
+The angles are compared modulo `180^\circ` after rounding them to
+``1e-6`` degrees. The violations are counted for each rule, such that the
+infeasible candidates of an optimizer can be rejected, or penalized, before
+any evaluation of their stiffness::
+
+    from composites.design_rules import is_feasible_stack
+
+    stacks = stacks[is_feasible_stack(stacks)]
+
+"""
+import numpy as np
+
+
+#: Names of the rules counted by :func:`.calc_rule_violations`
+DESIGN_RULES = ('symmetry', 'balance', 'contiguity', 'ten_percent',
+                'disorientation', 'outer_45')
+
+
+# NOTE the angles are compared as integers in micro-degrees
+_SCALE = 1000000
+
+
+def _normalize(angles):
+    # NOTE angles in [-90, 90), such that 90 and -90 are the same direction
+    angles = np.rint(np.asarray(angles, dtype=np.float64)*_SCALE)
+    return (angles.astype(np.int64) + 90*_SCALE) % (180*_SCALE) - 90*_SCALE
+
+
+def calc_rule_violations(stacks, max_contiguous=4, min_fraction=0.1,
+        directions=(0., 45., -45., 90.), max_disorientation=45.):
+    r"""Number of violations of each design rule
+
+    Parameters
+    ----------
+    stacks : array-like
+        The ply angles in degrees with ``shape=(N, n_plies)``.
+    max_contiguous : int, optional
+        Maximum number of contiguous plies with the same angle.
+    min_fraction : float, optional
+        Minimum fraction of the plies in each of the ``directions``.
+    directions : tuple, optional
+        Main directions of the ``'ten_percent'`` rule, in degrees.
+    max_disorientation : float, optional
+        Maximum angle between the fibers of adjacent plies, in degrees.
+
+    Returns
+    -------
+    violations : array
+        Integer array with ``shape=(N, len(DESIGN_RULES))`` with, for each
+        rule of :data:`.DESIGN_RULES`, the number of mismatched ply pairs
+        about the mid-plane, the number of unbalanced plies, the number of
+        plies exceeding ``max_contiguous`` in runs of the same angle, the
+        number of ``directions`` below ``min_fraction``, the number of
+        adjacent plies exceeding ``max_disorientation`` and the number of
+        outer plies other than `\pm 45^\circ`.
+
+    """
+    stacks = np.asarray(stacks, dtype=np.float64)
+    if stacks.ndim != 2 or stacks.shape[1] == 0:
+        raise ValueError('stacks must have shape=(N, n_plies)')
+    N, n = stacks.shape
+    a = _normalize(stacks)
+    violations = np.zeros((N, len(DESIGN_RULES)), dtype=np.int64)
+
+    # symmetry
+    violations[:, 0] = (a[:, :n//2] != a[:, ::-1][:, :n//2]).sum(axis=1)
+
+    # balance, |n(+theta) - n(-theta)| summed over the magnitudes
+    # NOTE one key per ply sorts the magnitudes with their signs
+    key = np.abs(a)*4 + np.sign(a) + 1
+    key[a == -90*_SCALE] = 90*_SCALE*4 + 1
+    key.sort(axis=1)
+    mag = key >> 2
+    start = np.ones((N, n), dtype=bool)
+    start[:, 1:] = mag[:, 1:] != mag[:, :-1]
+    sums = np.bincount(np.cumsum(start.ravel()) - 1,
+                       weights=((key & 3) - 1).ravel())
+    violations[:, 1] = np.round(np.bincount(np.nonzero(start)[0],
+                                weights=np.abs(sums), minlength=N))
+
+    # contiguity, plies closing a run longer than max_contiguous
+    same = a[:, 1:] == a[:, :-1]
+    if n > max_contiguous:
+        run = same[:, :n - max_contiguous].copy()
+        for k in range(1, max_contiguous):
+            run &= same[:, k:n - max_contiguous + k]
+        violations[:, 2] = run.sum(axis=1)
+
+    # ten percent
+    for d in _normalize(directions):
+        violations[:, 3] += (a == d).sum(axis=1) < min_fraction*n
+
+    # disorientation
+    delta = np.abs(a[:, 1:] - a[:, :-1])
+    delta = np.minimum(delta, 180*_SCALE - delta)
+    violations[:, 4] = (delta > round(max_disorientation*_SCALE)).sum(axis=1)
+
+    # outer plies
+    outer = a[:, [0, -1]] if n > 1 else a
+    violations[:, 5] = (np.abs(outer) != 45*_SCALE).sum(axis=1)
+    return violations
+
+
+def is_feasible_stack(stacks, rules=DESIGN_RULES, **kwargs):
+    r"""Check the design rules of stacking sequences
+
+    Parameters
+    ----------
+    stacks : array-like
+        The ply angles in degrees with ``shape=(N, n_plies)``.
+    rules : tuple, optional
+        The rules of :data:`.DESIGN_RULES` that are checked.
+    kwargs : dict, optional
+        Parameters of :func:`.calc_rule_violations`.
+
+    Returns
+    -------
+    feasible : array
+        Boolean array with ``shape=(N,)``.
+
+    """
+    for rule in rules:
+        if rule not in DESIGN_RULES:
+            raise ValueError('Unknown design rule %s' % rule)
+    columns = [DESIGN_RULES.index(rule) for rule in rules]
+    violations = calc_rule_violations(stacks, **kwargs)
+    return ~np.any(violations[:, columns], axis=1)
@@ -0,0 +1,157 @@
+r"""
+===========================================
+Load envelopes (:mod:`composites.envelope`)
+===========================================
+
+.. currentmodule::composites.envelope
+
+Minimum reserve factors of many panels over large load envelopes.
+
+The load cases are streamed in chunks through the vectorized buckling
+solver of :mod:`composites.buckling` and through laminate strain checks,
+keeping only the running minimum reserve factor, the critical load case and
+the critical failure mode of each panel. The memory does not depend on the
+number of load cases, which can be given as a memory-mapped array or as an
+iterable of chunks, but it is proportional to ``(chunk_size + 3)*n_panels
+*(M*N)**2``, due to the geometric stiffness matrices of the buckling
+solver, such that ``chunk_size`` should be reduced for large numbers of
+panels or half-waves::
+
+    from composites.envelope import calc_min_reserve_factors, FAILURE_MODES
+
+    ABD = np.array([lam.ABD for lam in laminates])
+    loads = np.load('loads.npy', mmap_mode='r')
+    rf, load_case, mode = calc_min_reserve_factors(a, b, ABD, loads,
+            allowables=(4500e-6, 3500e-6, 7000e-6))
+    print(FAILURE_MODES[mode[0]])
+
+"""
+import numpy as np
+
+from .buckling import _reduced_geometric_stiffness, _smallest_factors
+
+
+#: Names of the failure modes returned by :func:`.calc_min_reserve_factors`
+FAILURE_MODES = ('buckling', 'strain_xx', 'strain_yy', 'strain_xy')
+
+
+def _iter_chunks(loads, chunk_size):
+    if isinstance(loads, (list, tuple)):
+        loads = np.asarray(loads, dtype=np.float64)
+    if hasattr(loads, 'shape'):
+        for start in range(0, loads.shape[0], chunk_size):
+            yield np.asarray(loads[start:start + chunk_size],
+                             dtype=np.float64)
+    else:
+        for chunk in loads:
+            yield np.asarray(chunk, dtype=np.float64)
+
+
+def _strain_reserve_factors(strains, allowables):
+    eps_t, eps_c, gamma = allowables
+    # NOTE null strains are never critical
+    normal = strains[..., :2]
+    with np.errstate(divide='ignore'):
+        rf = np.empty_like(strains)
+        rf[..., :2] = np.where(normal > 0, eps_t/normal,
+                               np.where(normal < 0, -eps_c/normal, np.inf))
+        rf[..., 2] = gamma/np.abs(strains[..., 2])
+    return rf
+
+
+def calc_min_reserve_factors(a, b, ABD, loads, allowables=None, M=5, N=5,
+        chunk_size=100):
+    r"""Minimum reserve factor of each panel over a load envelope
+
+    Parameters
+    ----------
+    a, b : float or array-like
+        Plate length and width, either common to all panels or with
+        ``shape=(n_panels,)``. The buckling tables are shared by the panels
+        with the same aspect ratio.
+    ABD : array-like
+        The ``ABD`` matrix of each panel, with ``shape=(n_panels, 6, 6)``.
+    loads : array-like or iterable
+        The load cases `(N_{xx}, N_{yy}, N_{xy})` with the usual sign
+        convention, tension positive, either with ``shape=(n_loads, 3)``
+        when all panels have the same loads, or with ``shape=(n_loads,
+        n_panels, 3)``. Arrays, including memory-mapped arrays, are read in
+        chunks of ``chunk_size`` load cases, as well as lists and tuples.
+        Any other iterable should yield the chunks directly, and the load
+        case ids continue from one chunk to the next.
+    allowables : tuple or None, optional
+        Laminate strain allowables ``(eps_t, eps_c, gamma)``, all positive,
+        for tension and compression of the normal strains and for the shear
+        strain at the mid-surface. When ``None`` only buckling is checked.
+    M, N : int, optional
+        Number of half-waves of the buckling solver, see
+        :func:`composites.buckling.calc_buckling_factors`.
+    chunk_size : int, optional
+        Number of load cases evaluated at once, with a buffer of
+        ``chunk_size*n_panels*(M*N)**2`` doubles.
+
+    Returns
+    -------
+    rf, load_case, mode : tuple of arrays
+        Minimum reserve factor, id of the critical load case and index of
+        the critical failure mode in :data:`.FAILURE_MODES`, each with
+        ``shape=(n_panels,)``. When no load case is critical, ``rf`` is
+        ``np.inf`` and ``load_case`` and ``mode`` are ``-1``.
+
+    """
+    ABD = np.asarray(ABD, dtype=np.float64)
+    if ABD.ndim != 3 or ABD.shape[1:] != (6, 6):
+        raise ValueError('ABD must have shape=(n_panels, 6, 6)')
+    num_panels = ABD.shape[0]
+    D = ABD[:, 3:, 3:].reshape(num_panels, 9)[:, [0, 1, 2, 4, 5, 8]]
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=np.float64),
+                               np.asarray(b, dtype=np.float64))
+    a = np.broadcast_to(a, (num_panels,))
+    b = np.broadcast_to(b, (num_panels,))
+
+    # reduced geometric stiffness per group of panels with the same geometry
+    groups = []
+    ab, inverse = np.unique(np.stack((a, b), axis=1), axis=0,
+                            return_inverse=True)
+    for i, (ai, bi) in enumerate(ab):
+        panels = np.flatnonzero(inverse.ravel() == i)
+        groups.append((panels, _reduced_geometric_stiffness(ai, bi,
+                                                            D[panels], M, N)))
+    if allowables is not None:
+        abd = np.linalg.inv(ABD)[:, :3, :3]
+
+    rf = np.full(num_panels, np.inf)
+    load_case = np.full(num_panels, -1, dtype=np.intp)
+    mode = np.full(num_panels, -1, dtype=np.intp)
+    first = 0
+    for chunk in _iter_chunks(loads, chunk_size):
+        num_loads = chunk.shape[0]
+        if num_loads == 0:
+            continue
+        if chunk.ndim == 2:
+            chunk = np.broadcast_to(chunk[:, None, :],
+                                    (num_loads, num_panels, 3))
+        if chunk.shape[1:] != (num_panels, 3):
+            raise ValueError('loads must have shape=(n_loads, 3) or '
+                             '(n_loads, n_panels, 3)')
+        chunk_rf = np.empty((num_loads, num_panels, len(FAILURE_MODES)))
+        chunk_rf[...] = np.inf
+        # NOTE the buckling solver takes Nxx and Nyy positive in compression
+        sign = np.array([-1., -1., 1.])
+        for panels, H in groups:
+            G = np.einsum('cpk,kpij->cpij', sign*chunk[:, panels], H)
+            chunk_rf[:, panels, 0] = _smallest_factors(G)
+        if allowables is not None:
+            strains = np.einsum('pij,cpj->cpi', abd, chunk)
+            chunk_rf[..., 1:] = _strain_reserve_factors(strains, allowables)
+
+        # running minimum over load cases and failure modes
+        chunk_rf = chunk_rf.transpose(1, 0, 2).reshape(num_panels, -1)
+        imin = chunk_rf.argmin(axis=1)
+        rfmin = chunk_rf[np.arange(num_panels), imin]
+        update = rfmin < rf
+        rf[update] = rfmin[update]
+        load_case[update] = first + imin[update] // len(FAILURE_MODES)
+        mode[update] = imin[update] % len(FAILURE_MODES)
+        first += num_loads
+    return rf, load_case, mode
@@ -0,0 +1,263 @@
+r"""
+=============================================
+Async evaluator (:mod:`composites.evaluator`)
+=============================================
+
+.. currentmodule::composites.evaluator
+
+Coalescing of many concurrent single-laminate requests into batched calls,
+for applications based on ``asyncio``.
+
+Each call to :meth:`.LaminateEvaluator.evaluate` queues one request and
+waits for its result. The queued requests are flushed as one batch when
+``max_batch_size`` requests are waiting or ``max_delay`` seconds after the
+first request of the batch, and the batch is evaluated in a worker thread
+with :func:`composites.batch.evaluate_stacks`, whose kernels release the
+GIL, and with the batched buckling solver of :mod:`composites.buckling`.
+The event loop therefore remains responsive while the batch runs::
+
+    from composites.evaluator import LaminateEvaluator
+
+    async def handle(request, evaluator):
+        result = await evaluator.evaluate(request['stack'], plyt=plyt,
+                laminaprop=laminaprop, a=0.5, b=0.3, load=(1000., 0, 0))
+        return result['buckling']
+
+    async with LaminateEvaluator(max_delay=0.002) as evaluator:
+        ...
+
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .batch import evaluate_stacks, result_dtype
+from .buckling import _reduced_geometric_stiffness, _smallest_factors
+from .records import ABD_from_records
+from .utils import read_laminaprop
+
+
+def evaluator_dtype():
+    r"""Structured dtype of the results of :class:`.LaminateEvaluator`
+
+    Returns
+    -------
+    dtype : np.dtype
+        The fields of :func:`composites.batch.result_dtype` followed by
+        ``buckling``.
+
+    """
+    return np.dtype(result_dtype().descr + [('buckling', np.float64)])
+
+
+def _evaluate_requests(requests, M, N):
+    results = np.zeros(len(requests), dtype=evaluator_dtype())
+    results['buckling'] = np.nan
+    materials = {}
+    material_ids = []
+    groups = {}
+    for i, request in enumerate(requests):
+        material_ids.append(materials.setdefault(request['material'],
+                                                 len(materials)))
+        groups.setdefault(len(request['stack']), []).append(i)
+    materials = list(materials)
+
+    # one batch per number of plies
+    for ids in groups.values():
+        rows = np.array([np.concatenate((requests[i]['stack'],
+                                         requests[i]['plyts'],
+                                         [material_ids[i],
+                                          requests[i]['offset']]))
+                         for i in ids])
+        group_results = evaluate_stacks(rows, materials)
+        for name in group_results.dtype.names:
+            results[name][ids] = group_results[name]
+
+    # one batch per plate geometry
+    panels = {}
+    for i, request in enumerate(requests):
+        if request['load'] is not None:
+            panels.setdefault((request['a'], request['b']), []).append(i)
+    for (a, b), ids in panels.items():
+        D = ABD_from_records(results[ids])[:, 3:, 3:].reshape(-1, 9)
+        H = _reduced_geometric_stiffness(a, b, D[:, [0, 1, 2, 4, 5, 8]], M,
+                                         N)
+        loads = np.array([requests[i]['load'] for i in ids])
+        results['buckling'][ids] = _smallest_factors(
+                np.einsum('pk,kpij->pij', loads, H))
+    return results
+
+
+def _evaluate_each(requests, M, N):
+    # NOTE one request at a time, returning the exception of the failing
+    #      requests in place of their results
+    outcomes = []
+    for request in requests:
+        try:
+            outcomes.append(_evaluate_requests([request], M, N)[0])
+        except Exception as e:
+            outcomes.append(e)
+    return outcomes
+
+
+class LaminateEvaluator(object):
+    r"""Evaluator coalescing concurrent requests into batches
+
+    When a batch fails, its requests are evaluated again one by one, such
+    that only the failing requests raise the exception.
+
+    Parameters
+    ----------
+    max_batch_size : int, optional
+        Number of waiting requests that triggers a batch.
+    max_delay : float, optional
+        Maximum time in seconds that a request waits for other requests.
+    M, N : int, optional
+        Number of half-waves of the buckling solver, see
+        :func:`composites.buckling.calc_buckling_factors`.
+    executor : concurrent.futures.Executor or None, optional
+        Executor running the batches. By default, a single worker thread
+        owned by the evaluator.
+
+    Attributes
+    ----------
+    num_batches : int
+        Number of batches evaluated successfully, where each request
+        evaluated alone after a failing batch counts as one batch.
+    num_requests : int
+        Number of requests evaluated successfully.
+
+    """
+    def __init__(self, max_batch_size=1000, max_delay=0.005, M=5, N=5,
+            executor=None):
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.M = M
+        self.N = N
+        self._owns_executor = executor is None
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1)
+        self._executor = executor
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+        self.num_batches = 0
+        self.num_requests = 0
+
+    async def evaluate(self, stack, plyt=None, laminaprop=None, plyts=None,
+            rho=0., offset=0., a=None, b=None, load=None):
+        r"""Evaluate one laminate
+
+        The inputs are the same as in
+        :func:`composites.utils.laminated_plate`, with a single material
+        for all plies, optionally followed by a plate geometry and a load
+        case for the buckling factor.
+
+        Parameters
+        ----------
+        a, b : float or None, optional
+            Plate length and width, required with ``load``.
+        load : tuple or None, optional
+            Load case `(N_{xx}, N_{yy}, N_{xy})`, see
+            :func:`composites.buckling.calc_buckling_factors` for the sign
+            convention.
+
+        Returns
+        -------
+        result : np.void
+            Record with dtype :func:`.evaluator_dtype`, where ``buckling``
+            is ``np.nan`` without ``load``.
+
+        """
+        stack = np.asarray(stack, dtype=np.float64).ravel()
+        if stack.shape[0] == 0:
+            raise ValueError('At least one ply is required')
+        if plyts is None:
+            if plyt is None:
+                raise ValueError('plyt or plyts must be supplied')
+            plyts = [plyt]*stack.shape[0]
+        plyts = np.asarray(plyts, dtype=np.float64).ravel()
+        if plyts.shape != stack.shape:
+            raise ValueError('plyts must have one entry per ply')
+        if not np.all(plyts > 0):
+            raise ValueError('The ply thicknesses must be positive')
+        if laminaprop is None:
+            raise ValueError('laminaprop must be supplied')
+        mat = read_laminaprop(laminaprop)
+        if load is not None:
+            if a is None or b is None:
+                raise ValueError('a and b are required with load')
+            load = np.asarray(load, dtype=np.float64)
+            if load.shape != (3,):
+                raise ValueError('load must be (Nxx, Nyy, Nxy)')
+            a = float(a)
+            b = float(b)
+        request = dict(stack=stack, plyts=plyts, offset=float(offset),
+                material=(mat.e1, mat.e2, mat.nu12, mat.g12, mat.g13,
+                          mat.g23, float(rho)),
+                a=a, b=b, load=load)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((request, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch = self._pending
+        self._pending = []
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        requests = [request for request, _ in batch]
+        loop = asyncio.get_running_loop()
+        alone = False
+        try:
+            outcomes = await loop.run_in_executor(self._executor,
+                    _evaluate_requests, requests, self.M, self.N)
+            self.num_batches += 1
+        except Exception as e:
+            # NOTE the requests are evaluated again one by one, such that
+            #      only the failing requests fail
+            outcomes = [e]*len(batch)
+            if len(batch) > 1:
+                try:
+                    outcomes = await loop.run_in_executor(self._executor,
+                            _evaluate_each, requests, self.M, self.N)
+                    alone = True
+                except Exception:
+                    pass
+        for (_, future), outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                if not future.done():
+                    future.set_exception(outcome)
+                continue
+            if alone:
+                self.num_batches += 1
+            self.num_requests += 1
+            if not future.done():
+                future.set_result(outcome)
+
+    async def close(self):
+        r"""Evaluate the waiting requests and release the executor"""
+        self._flush()
+        while self._tasks:
+            await asyncio.gather(*self._tasks)
+        if self._owns_executor:
+            self._executor.shutdown()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
@@ -0,0 +1,151 @@
+r"""
+================================================================
+Lamination parameter feasibility (:mod:`composites.feasibility`)
+================================================================
+
+.. currentmodule::composites.feasibility
+
+Vectorized checks of the analytical bounds of the lamination parameters and
+sampling of lamination parameters satisfying these bounds.
+
+The lamination parameters are given as arrays with ``shape=(N, 14)``,
+ordered as in :func:`composites.core.calc_LP_batch`. With `\xi_{1}` to
+`\xi_{4}` denoting the four parameters of either `A` or `D`, the bounds
+are:
+
+- ``'box'``: `-1 \le \xi \le 1` for all parameters
+- ``'A'`` and ``'D'``: `\xi_1^2 + \xi_2^2 \le 1`, `2 \xi_1^2 - 1 \le
+  \xi_3 \le 1 - 2 \xi_2^2` and `2 \xi_1^2 (1 - \xi_3) + 2 \xi_2^2 (1 +
+  \xi_3) + \xi_3^2 + \xi_4^2 - 4 \xi_1 \xi_2 \xi_4 \le 1`
+- ``'AB'``: `|\xi_{Bi}| \le 1 - \xi_{Ai}^2`
+- ``'AD'``: `(1 + \xi_{Ai})^3/4 - 1 \le \xi_{Di} \le 1 - (1 -
+  \xi_{Ai})^3/4`
+- ``'Atrans'``: `\xi_{Atrans1}^2 + \xi_{Atrans2}^2 \le 1`
+
+These are necessary conditions, such that lamination parameters violating
+any of them cannot be obtained with a stacking sequence. They are cheap
+enough to filter the candidates of an optimizer before any evaluation::
+
+    from composites.feasibility import is_feasible_lp, sample_feasible_lp
+
+    lp = lp[is_feasible_lp(lp)]
+    training_lp = sample_feasible_lp(10000, symmetric=True, rng=0)
+
+"""
+import numpy as np
+
+
+#: Names of the bounds returned by :func:`.calc_lp_violations`
+LP_CONSTRAINTS = ('box', 'A', 'AB', 'D', 'AD', 'Atrans')
+
+
+def _in_plane_violation(xi):
+    xi1, xi2, xi3, xi4 = np.moveaxis(xi, -1, 0)
+    return np.max((xi1**2 + xi2**2 - 1,
+                   2*xi1**2 - 1 - xi3,
+                   xi3 - 1 + 2*xi2**2,
+                   2*xi1**2*(1 - xi3) + 2*xi2**2*(1 + xi3) + xi3**2 + xi4**2
+                   - 4*xi1*xi2*xi4 - 1), axis=0)
+
+
+def calc_lp_violations(lp):
+    r"""Violation of each bound of the lamination parameters
+
+    Parameters
+    ----------
+    lp : array-like
+        The lamination parameters with ``shape=(N, 14)``.
+
+    Returns
+    -------
+    violations : array
+        The largest violation of each bound of :data:`.LP_CONSTRAINTS`,
+        with ``shape=(N, len(LP_CONSTRAINTS))``, which is positive only when
+        the bound is violated.
+
+    """
+    lp = np.asarray(lp, dtype=np.float64)
+    if lp.ndim != 2 or lp.shape[1] != 14:
+        raise ValueError('lp must have shape=(N, 14)')
+    xiA = lp[:, 0:4]
+    xiB = lp[:, 4:8]
+    xiD = lp[:, 8:12]
+    violations = np.empty((lp.shape[0], len(LP_CONSTRAINTS)))
+    violations[:, 0] = np.abs(lp).max(axis=1) - 1
+    violations[:, 1] = _in_plane_violation(xiA)
+    violations[:, 2] = (np.abs(xiB) - 1 + xiA**2).max(axis=1)
+    violations[:, 3] = _in_plane_violation(xiD)
+    violations[:, 4] = np.maximum((1 + xiA)**3/4. - 1 - xiD,
+                                  xiD - 1 + (1 - xiA)**3/4.).max(axis=1)
+    violations[:, 5] = lp[:, 12]**2 + lp[:, 13]**2 - 1
+    return violations
+
+
+def is_feasible_lp(lp, tol=1e-12):
+    r"""Check the bounds of the lamination parameters
+
+    Parameters
+    ----------
+    lp : array-like
+        The lamination parameters with ``shape=(N, 14)``.
+    tol : float, optional
+        Tolerance of the violations of :func:`.calc_lp_violations`.
+
+    Returns
+    -------
+    feasible : array
+        Boolean array with ``shape=(N,)``.
+
+    """
+    return calc_lp_violations(lp).max(axis=1) <= tol
+
+
+def sample_feasible_lp(num, symmetric=False, balanced=False, rng=None,
+        chunk_size=100000):
+    r"""Uniformly distributed lamination parameters within the bounds
+
+    The samples are drawn uniformly in the box `[-1, 1]` and rejected if
+    any bound of :data:`.LP_CONSTRAINTS` is violated, such that they are
+    uniformly distributed in the region defined by the bounds. The
+    transverse shear parameters are those of a laminate, i.e.
+    `\xi_{Atrans1} = \xi_{A1}` and `\xi_{Atrans2} = \xi_{A2}`.
+
+    Parameters
+    ----------
+    num : int
+        Number of samples.
+    symmetric : bool, optional
+        If the `\xi_{Bi}` are null, see
+        :func:`composites.core.make_symmetric_LP`.
+    balanced : bool, optional
+        If `\xi_{A2}` and `\xi_{A4}` are null, see
+        :func:`composites.core.make_balanced_LP`.
+    rng : int, np.random.Generator or None, optional
+        Seed or random generator passed to ``np.random.default_rng``.
+    chunk_size : int, optional
+        Number of candidates evaluated at once.
+
+    Returns
+    -------
+    lp : array
+        The lamination parameters with ``shape=(num, 14)``.
+
+    """
+    rng = np.random.default_rng(rng)
+    free = np.ones(14, dtype=bool)
+    free[12:] = False
+    if symmetric:
+        free[4:8] = False
+    if balanced:
+        free[[1, 3]] = False
+    lp = np.empty((num, 14))
+    count = 0
+    while count < num:
+        candidates = np.zeros((chunk_size, 14))
+        candidates[:, free] = rng.uniform(-1, 1, (chunk_size, free.sum()))
+        candidates[:, 12:] = candidates[:, :2]
+        feasible = candidates[is_feasible_lp(candidates, tol=0.)]
+        feasible = feasible[:num - count]
+        lp[count:count + feasible.shape[0]] = feasible
+        count += feasible.shape[0]
+    return lp
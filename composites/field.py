@@ -0,0 +1,176 @@
+r"""
+=========================================
+Laminate fields (:mod:`composites.field`)
+=========================================
+
+.. currentmodule::composites.field
+
+Deduplication of the laminate properties of finite element models.
+
+Finite element models assign one laminate definition per element, but
+typically contain only a few distinct definitions. The
+:class:`.LaminateField` interns the definitions using the stable hash of
+:func:`.laminate_key`, such that each distinct :class:`.Laminate` is
+computed only once::
+
+    from composites.field import LaminateField
+
+    field = LaminateField()
+    prop_ids = field.assign(dict(stack=stack, plyt=plyt, laminaprop=laminaprop)
+                            for stack in element_stacks)
+    ABD = field.ABD[field.element_property]
+
+"""
+import hashlib
+
+import numpy as np
+
+from .utils import laminated_plate
+
+
+def _per_ply(value, values, num_plies, name):
+    if values is None:
+        if value is None:
+            raise ValueError('%s or %ss must be supplied' % (name, name))
+        values = [value]*num_plies
+    if len(values) != num_plies:
+        raise ValueError('%ss must have one entry per ply' % name)
+    return values
+
+
+def _to_bytes(values):
+    # NOTE adding 0. makes -0. and 0. equal
+    return (np.asarray(values, dtype=np.float64).ravel() + 0.).astype('<f8'
+            ).tobytes()
+
+
+def laminate_key(stack, plyt=None, laminaprop=None, rho=0., plyts=None,
+        laminaprops=None, rhos=None, offset=0.):
+    r"""Stable hash of a laminate definition
+
+    The inputs are the same as in :func:`composites.utils.laminated_plate`,
+    and equivalent definitions give the same key, for instance when the
+    same thickness is given using ``plyt`` or ``plyts``. The key does not
+    depend on the Python process, platform or byte order, such that it can
+    be stored and compared between runs.
+
+    Returns
+    -------
+    key : str
+        Hexadecimal digest identifying the laminate definition.
+
+    """
+    num_plies = len(stack)
+    plyts = _per_ply(plyt, plyts, num_plies, 'plyt')
+    laminaprops = _per_ply(laminaprop, laminaprops, num_plies, 'laminaprop')
+    rhos = _per_ply(rho, rhos, num_plies, 'rho')
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.int64(num_plies).astype('<i8').tobytes())
+    h.update(_to_bytes(stack))
+    h.update(_to_bytes(plyts))
+    for prop in laminaprops:
+        h.update(np.int64(len(prop)).astype('<i8').tobytes())
+        h.update(_to_bytes(prop))
+    h.update(_to_bytes(rhos))
+    h.update(_to_bytes(offset))
+    return h.hexdigest()
+
+
+class LaminateField(object):
+    r"""Interned laminate properties of many elements
+
+    Parameters
+    ----------
+    calc_scf : bool, optional
+        Passed to :func:`composites.utils.laminated_plate`.
+
+    Attributes
+    ----------
+    keys : list
+        Key of each distinct laminate, see :func:`.laminate_key`.
+    laminates : list
+        The distinct :class:`.Laminate` objects, with the same order as
+        ``keys``.
+    element_property : array
+        Index of the laminate of each element assigned with
+        :meth:`.assign`.
+
+    """
+    def __init__(self, calc_scf=True):
+        self.calc_scf = calc_scf
+        self.keys = []
+        self.laminates = []
+        self.element_property = np.zeros(0, dtype=np.intp)
+        self._ids = {}
+        self._ABD = None
+        self._Atrans = None
+
+    def __len__(self):
+        return len(self.laminates)
+
+    def intern(self, stack, plyt=None, laminaprop=None, rho=0., plyts=None,
+            laminaprops=None, rhos=None, offset=0.):
+        r"""Return the index of a laminate, computing it only if new
+
+        The inputs are the same as in
+        :func:`composites.utils.laminated_plate`.
+
+        Returns
+        -------
+        prop_id : int
+            Index of the laminate in ``laminates``.
+
+        """
+        key = laminate_key(stack, plyt=plyt, laminaprop=laminaprop, rho=rho,
+                plyts=plyts, laminaprops=laminaprops, rhos=rhos, offset=offset)
+        prop_id = self._ids.get(key)
+        if prop_id is None:
+            lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop,
+                    rho=rho, plyts=plyts, laminaprops=laminaprops, rhos=rhos,
+                    offset=offset, calc_scf=self.calc_scf)
+            prop_id = len(self.laminates)
+            self._ids[key] = prop_id
+            self.keys.append(key)
+            self.laminates.append(lam)
+            self._ABD = None
+            self._Atrans = None
+        return prop_id
+
+    def assign(self, definitions):
+        r"""Assign laminates to new elements
+
+        Parameters
+        ----------
+        definitions : iterable of dict
+            Keyword arguments of :meth:`.intern` for each element.
+
+        Returns
+        -------
+        prop_ids : array
+            Index of the laminate of each new element, also appended to
+            ``element_property``.
+
+        """
+        prop_ids = np.fromiter((self.intern(**d) for d in definitions),
+                               dtype=np.intp)
+        self.element_property = np.concatenate((self.element_property,
+                                                prop_ids))
+        return prop_ids
+
+    @property
+    def ABD(self):
+        r"""Stacked ``ABD`` matrices of the distinct laminates, with
+        ``shape=(len(laminates), 6, 6)``"""
+        if self._ABD is None:
+            self._ABD = np.array([lam.ABD for lam in self.laminates]
+                                 ).reshape(-1, 6, 6)
+        return self._ABD
+
+    @property
+    def Atrans(self):
+        r"""Stacked ``Atrans`` matrices of the distinct laminates, with
+        ``shape=(len(laminates), 2, 2)``"""
+        if self._Atrans is None:
+            self._Atrans = np.array([lam.Atrans for lam in self.laminates]
+                                    ).reshape(-1, 2, 2)
+        return self._Atrans
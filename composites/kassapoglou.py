@@ -8,6 +8,15 @@ Kassapoglou's methods (:mod:`composites.kassapoglou`)
 
 Methods based on Kassapoglou's book.
 
+The buckling functions optionally return the gradient with respect to the
+terms of the D matrix, ordered as ``(D11, D12, D16, D22, D26, D66)``, which
+is the row order of :attr:`.GradABD.gradDij`. The gradient with respect to
+the thickness and the lamination parameters is then::
+
+    Nxx_crit, grad = calc_Nxx_crit(a, b, m, n, D11, D12, D22, D66,
+                                   return_grad=True)
+    grad_xiD = grad @ gradABD.gradDij
+
 
 Reference:
 
@@ -19,7 +28,7 @@ import numpy as np
 from numpy import pi, tan, sqrt
 
 
-def calc_Nxx_crit(a, b, m, n, D11, D12, D22, D66):
+def calc_Nxx_crit(a, b, m, n, D11, D12, D22, D66, return_grad=False):
     r"""Calculate uniaxial compression buckling for a composite plate
 
     The output of this function is the result of Eq. 6.6, section 6.2 page 129.
@@ -38,11 +47,17 @@ def calc_Nxx_crit(a, b, m, n, D11, D12, D22, D66):
         Number of half-waves along the plate length and width, respectively.
     D11, D12, D22, D66 : float
         Terms of the D matrix.
+    return_grad : bool, optional
+        If the gradient with respect to the D terms should also be returned,
+        evaluated for the critical number of half-waves.
 
     Result
     ------
     Nxx_crit : float
         Critical uniaxial compression buckling load.
+    grad : array
+        Only if ``return_grad=True``, the gradient of ``Nxx_crit`` with
+        respect to ``(D11, D12, D16, D22, D26, D66)``.
 
     """
     if m is None and n is None:
@@ -57,10 +72,19 @@ def calc_Nxx_crit(a, b, m, n, D11, D12, D22, D66):
     Nxx_crit = pi**2*(D11*m**4
                       + 2*(D12 + 2*D66)*m**2*n**2*AR**2
                       + D22*n**4*AR**4)/(a**2*m**2)
-    return Nxx_crit.min()
-
-
-def calc_Nxy_crit(a, D11, D12, D16, D22, D66, rtol=1e-5, atol=1e-6, max_iter=50):
+    if not return_grad:
+        return Nxx_crit.min()
+    i = Nxx_crit.argmin()
+    m = np.broadcast_to(m, Nxx_crit.shape)[i]
+    n = np.broadcast_to(n, Nxx_crit.shape)[i]
+    dD12 = 2*pi**2*n**2*AR**2/a**2
+    grad = np.array([pi**2*m**2/a**2, dD12, 0., pi**2*n**4*AR**4/(a**2*m**2),
+                     0., 2*dD12])
+    return Nxx_crit[i], grad
+
+
+def calc_Nxy_crit(a, D11, D12, D16, D22, D66, rtol=1e-5, atol=1e-6, max_iter=50,
+        return_grad=False):
     r"""Calculate shear buckling for a composite plate
 
     The output of this function is the result of Eq. 6.28, section 6.4 page
@@ -81,11 +105,19 @@ def calc_Nxy_crit(a, D11, D12, D16, D22, D66, rtol=1e-5, atol=1e-6, max_iter=50)
         Relative and absolute tolerances used to solve Eq. 6.30.
     max_iter : int
         Maximum number of iterations used in the Newton-Raphson scheme.
+    return_grad : bool, optional
+        If the gradient with respect to the D terms should also be returned.
+        The dependency of `AR` and `\alpha` on the D terms is obtained by
+        implicit differentiation of Eq. 6.30 at the converged solution,
+        without additional Newton-Raphson iterations.
 
     Result
     ------
     Nxy_crit : float
         Critical shear buckling load.
+    grad : array
+        Only if ``return_grad=True``, the gradient of ``Nxy_crit`` with
+        respect to ``(D11, D12, D16, D22, D26, D66)``.
 
     """
     alpha = np.pi/6
@@ -103,7 +135,51 @@ def calc_Nxy_crit(a, D11, D12, D16, D22, D66, rtol=1e-5, atol=1e-6, max_iter=50)
         D11*(1 + 6*tan(alpha)**2*AR**2 + tan(alpha)**4*AR**4)
         + 2*(D12 + 2*D66)*(AR**2 + AR**4*tan(alpha)**2)
         + D22*AR**4)
-    return Nxy_crit
+    if not return_grad:
+        return Nxy_crit
+    return Nxy_crit, _calc_Nxy_crit_grad(a, D11, D12 + 2*D66, D22, tan(alpha))
+
+
+def _calc_Nxy_crit_grad(a, D11, c, D22, t):
+    r"""Gradient of :func:`.calc_Nxy_crit` by implicit differentiation
+
+    With `t = \tan{\alpha}`, `c = D_{12} + 2 D_{66}`, `r_4 = AR^4` from Eq.
+    6.29 and `r_2 = AR^2`, the residual `g` of Eq. 6.30 and the buckling
+    load `N` of Eq. 6.28 are functions of `p = (D_{11}, c, D_{22})` and `t`.
+    Since `g(t, p) = 0` at the solution, `dt/dp = -g_p/g_t`, where the
+    subscripts denote total derivatives at constant `t` or `p`, and `dN/dp =
+    N_p + N_t dt/dp`.
+
+    """
+    Q = D11*t**4 + 2*c*t**2 + D22
+    r4 = D11/Q
+    r2 = sqrt(r4)
+    # d(r4)/d(D11, c, D22, t)
+    dr4 = np.array([2*c*t**2 + D22, -2*D11*t**2, -D11,
+                    -D11*(4*D11*t**3 + 4*c*t)])/Q**2
+    dr2 = dr4/(2*r2)
+
+    # residual of Eq. 6.30
+    g_r4 = 3*D11*t**4 + 2*c*t**2 - D22
+    g_r2 = 6*D11*t**2 - 2*c
+    g_explicit = np.array([3*r4*t**4 + 6*r2*t**2 - 1, 2*r4*t**2 - 2*r2, -r4,
+                           12*D11*r4*t**3 + 12*D11*r2*t + 4*c*r4*t])
+    dg = g_explicit + g_r4*dr4 + g_r2*dr2
+
+    # Eq. 6.28 as N = K*F/(r2*t)
+    K = pi**2/(2*a**2)
+    F = D11*(1 + 6*t**2*r2 + t**4*r4) + 2*c*(r2 + r4*t**2) + D22*r4
+    F_r4 = D11*t**4 + 2*c*t**2 + D22
+    F_r2 = 6*D11*t**2 + 2*c
+    F_explicit = np.array([1 + 6*t**2*r2 + t**4*r4, 2*(r2 + r4*t**2), r4,
+                           D11*(12*t*r2 + 4*t**3*r4) + 4*c*r4*t])
+    dF = F_explicit + F_r4*dr4 + F_r2*dr2
+    dN = K*dF/(r2*t) - K*F/(r2*t)**2*(dr2*t)
+    dN[3] -= K*F/(r2*t**2)
+
+    dN_dp = dN[:3] - dN[3]*dg[:3]/dg[3]
+    dN_dD11, dN_dc, dN_dD22 = dN_dp
+    return np.array([dN_dD11, dN_dc, 0., dN_dD22, 0., 2*dN_dc])
 
 
 def calc_beff(b, Px, Pcr, A11, A12, A22):
@@ -177,7 +253,8 @@ def calc_Nxx_crit_combined_shear(k, a, b, D11, D12, D22, D66):
     return min(abs(Nxx_crit1), abs(Nxx_crit2))
 
 
-def calc_Nxx_crit_combined_shear_full(Nxy, a, b, D11, D12, D16, D22, D26, D66):
+def calc_Nxx_crit_combined_shear_full(Nxy, a, b, D11, D12, D16, D22, D26, D66,
+        return_grad=False):
     r"""Calculate combined uniaxial-shear buckling load for a composite plate
 
     This solution does not ignore the D16 and D26 terms. Furthermore, this
@@ -199,12 +276,17 @@ def calc_Nxx_crit_combined_shear_full(Nxy, a, b, D11, D12, D16, D22, D26, D66):
         Plate length and width.
     D11, D12, D16, D22, D26, D66 : float
         All terms of the D matrix.
+    return_grad : bool, optional
+        If the gradient with respect to the D terms should also be returned.
 
     Result
     ------
     Nxx_crit : float
         Critical `N_{xx}` buckling load under the current level of shear load
         given by `N_{xy}`.
+    grad : array
+        Only if ``return_grad=True``, the gradient of ``Nxx_crit`` with
+        respect to ``(D11, D12, D16, D22, D26, D66)``.
 
     """
     a11 = pi**4*D11*b/(4*a**3) + pi**4*D12/(2*a*b) + pi**4*D22*a/(4*b**3) + pi**4*D66/(a*b)
@@ -214,5 +296,18 @@ def calc_Nxx_crit_combined_shear_full(Nxy, a, b, D11, D12, D16, D22, D26, D66):
     term = 16384*Nxy**2 + 4608*Nxy*a12 + 4608*Nxy*a21 + 1296*a11**2 - 648*a11*a22 + 1296*a12*a21 + 81*a22**2
     Nxx_crit1 = a*(36*a11 + 9*a22 - sqrt(term))/(18*pi**2*b)
     Nxx_crit2 = a*(36*a11 + 9*a22 + sqrt(term))/(18*pi**2*b)
-    return min(abs(Nxx_crit1), abs(Nxx_crit2))
+    if not return_grad:
+        return min(abs(Nxx_crit1), abs(Nxx_crit2))
+    # d(a11, a12, a22)/d(D11, D12, D16, D22, D26, D66), with a21 = a12
+    da11 = pi**4*np.array([b/(4*a**3), 1/(2*a*b), 0, a/(4*b**3), 0, 1/(a*b)])
+    da12 = -160*pi**2/9*np.array([0, 0, 1/a**2, 0, 1/b**2, 0])
+    da22 = pi**4*np.array([4*b/a**3, 8/(a*b), 0, 4*a/b**3, 0, 16/(a*b)])
+    dterm = (9216*Nxy*da12 + 2592*a11*da11 - 648*(da11*a22 + a11*da22)
+             + 2592*a12*da12 + 162*a22*da22)
+    if abs(Nxx_crit1) <= abs(Nxx_crit2):
+        Nxx_crit, sign = Nxx_crit1, -1
+    else:
+        Nxx_crit, sign = Nxx_crit2, 1
+    grad = a*(36*da11 + 9*da22 + sign*dterm/(2*sqrt(term)))/(18*pi**2*b)
+    return abs(Nxx_crit), np.sign(Nxx_crit)*grad
 
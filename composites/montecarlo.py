@@ -0,0 +1,250 @@
+r"""
+======================================================
+Monte Carlo uncertainty (:mod:`composites.montecarlo`)
+======================================================
+
+.. currentmodule::composites.montecarlo
+
+Propagation of the material scatter and of the ply misalignment to the
+stiffness, equivalent properties and buckling loads of a laminate.
+
+The samples are drawn in blocks and evaluated with the batch kernels
+:func:`composites.core.calc_ABD_batch_laminaprops` and
+:func:`composites.buckling.calc_buckling_factors`. Each block updates a
+:class:`.StreamingStatistics` object with the mean, covariance, extreme
+values and a random subset of the samples used for the quantiles, such that
+the memory does not depend on the number of samples::
+
+    from composites.montecarlo import monte_carlo
+
+    stats = monte_carlo([0, 45, -45, 90]*4, plyt, laminaprop, 100000,
+                        cv_e1=0.05, cv_e2=0.05, cv_g12=0.05, cv_plyt=0.03,
+                        std_theta=1., a=a, b=b, loads=[[1, 0, 0]], rng=0)
+    print(stats['equivalent'].mean)
+    print(stats['buckling'].quantiles([0.01, 0.5]))
+
+"""
+import numpy as np
+
+from .core import calc_ABD_batch_laminaprops
+from .utils import read_laminaprop
+from .buckling import calc_buckling_factors
+
+
+#: Names of the columns of the ``'equivalent'`` statistics of
+#: :func:`.monte_carlo`
+EQUIVALENT_NAMES = ('e1', 'e2', 'g12', 'nu12', 'nu21')
+
+
+def _equivalent_properties(ABD, h):
+    r"""Properties of :data:`.EQUIVALENT_NAMES` with ``shape=(N, 5)``, as in
+    :meth:`.Laminate.calc_equivalent_properties`"""
+    AI = np.linalg.inv(ABD)
+    a11 = AI[:, 0, 0]
+    a12 = AI[:, 0, 1]
+    a22 = AI[:, 1, 1]
+    return np.stack((1/(h*a11), 1/(h*a22), 1/(h*AI[:, 2, 2]), -a12/a11,
+                     -a12/a22), axis=1)
+
+
+class StreamingStatistics(object):
+    r"""Summary statistics updated with blocks of samples
+
+    The mean and covariance are combined exactly from one block to the next.
+    The quantiles are computed from a uniform random subset of the samples
+    kept with reservoir sampling, and they are exact while the number of
+    samples does not exceed ``reservoir_size``.
+
+    Parameters
+    ----------
+    shape : tuple, optional
+        Shape of each sample.
+    reservoir_size : int, optional
+        Maximum number of samples kept for the quantiles.
+    rng : int, np.random.Generator or None, optional
+        Seed or random generator passed to ``np.random.default_rng``.
+
+    Attributes
+    ----------
+    num : int
+        Number of samples.
+    min, max : array
+        Extreme values of each component, with ``shape=shape``.
+
+    """
+    def __init__(self, shape=(), reservoir_size=10000, rng=None):
+        self.shape = tuple(shape)
+        self.reservoir_size = reservoir_size
+        size = int(np.prod(self.shape))
+        self.num = 0
+        self._mean = np.zeros(size)
+        self._M2 = np.zeros((size, size))
+        self._reservoir = np.empty((reservoir_size, size))
+        self._rng = np.random.default_rng(rng)
+        self.min = np.full(self.shape, np.inf)
+        self.max = np.full(self.shape, -np.inf)
+
+    def update(self, samples):
+        r"""Add a block of samples
+
+        Parameters
+        ----------
+        samples : array-like
+            The samples with ``shape=(n,) + shape``.
+
+        """
+        samples = np.asarray(samples, dtype=np.float64)
+        n = samples.shape[0]
+        if n == 0:
+            return
+        samples = samples.reshape(n, -1)
+        if samples.shape[1] != self._mean.shape[0]:
+            raise ValueError('samples must have shape=(n,) + %s'
+                             % str(self.shape))
+        # NOTE parallel combination of the mean and of the sum of squared
+        #      deviations
+        mean = samples.mean(axis=0)
+        dev = samples - mean
+        delta = mean - self._mean
+        total = self.num + n
+        self._M2 += dev.T @ dev + np.outer(delta, delta)*self.num*n/total
+        self._mean += delta*n/total
+        self.min = np.minimum(self.min,
+                              samples.min(axis=0).reshape(self.shape))
+        self.max = np.maximum(self.max,
+                              samples.max(axis=0).reshape(self.shape))
+
+        # reservoir sampling, sample t replaces a random sample with
+        # probability reservoir_size/(t + 1)
+        t = self.num + np.arange(n)
+        fill = t < self.reservoir_size
+        self._reservoir[t[fill]] = samples[fill]
+        j = self._rng.integers(0, t[~fill] + 1)
+        keep = j < self.reservoir_size
+        j = j[keep][::-1]
+        replace = samples[~fill][keep][::-1]
+        # NOTE the last sample wins when the same position is drawn twice
+        j, first = np.unique(j, return_index=True)
+        self._reservoir[j] = replace[first]
+        self.num = total
+
+    @property
+    def mean(self):
+        r"""Mean with ``shape=shape``"""
+        return self._mean.reshape(self.shape)
+
+    @property
+    def cov(self):
+        r"""Sample covariance of the flattened samples, with ``shape=(size,
+        size)``"""
+        if self.num < 2:
+            return np.full_like(self._M2, np.nan)
+        return self._M2/(self.num - 1)
+
+    @property
+    def std(self):
+        r"""Sample standard deviation with ``shape=shape``"""
+        return np.sqrt(np.diag(self.cov)).reshape(self.shape)
+
+    def quantiles(self, q):
+        r"""Quantiles of each component
+
+        Parameters
+        ----------
+        q : float or array-like
+            Probabilities between 0 and 1.
+
+        Returns
+        -------
+        quantiles : array
+            The quantiles with ``shape=np.shape(q) + shape``.
+
+        """
+        samples = self._reservoir[:min(self.num, self.reservoir_size)]
+        quantiles = np.quantile(samples, q, axis=0)
+        return quantiles.reshape(np.shape(q) + self.shape)
+
+
+def monte_carlo(stack, plyt, laminaprop, num_samples, cv_e1=0., cv_e2=0.,
+        cv_g12=0., cv_nu12=0., cv_plyt=0., std_theta=0., offset=0., a=None,
+        b=None, loads=None, M=5, N=5, block_size=1000, reservoir_size=10000,
+        rng=None):
+    r"""Monte Carlo propagation of material scatter and ply misalignment
+
+    The material properties are sampled once per laminate from normal
+    distributions with the given coefficients of variation, whereas the ply
+    thicknesses and the ply misalignments are sampled independently for
+    each ply.
+
+    Parameters
+    ----------
+    stack : list
+        Nominal ply angles in degrees.
+    plyt : float
+        Nominal ply thickness.
+    laminaprop : tuple
+        Nominal material, see :func:`composites.utils.read_laminaprop`.
+    num_samples : int
+        Number of samples.
+    cv_e1, cv_e2, cv_g12, cv_nu12, cv_plyt : float, optional
+        Coefficients of variation of ``e1``, ``e2``, ``g12``, ``nu12`` and
+        of the ply thickness.
+    std_theta : float, optional
+        Standard deviation of the ply angles in degrees.
+    offset : float, optional
+        Offset along the normal axis about the mid-surface.
+    a, b : float or None, optional
+        Plate length and width, required with ``loads``.
+    loads : array-like or None, optional
+        Load cases with ``shape=(n_loads, 3)`` for the buckling factors,
+        see :func:`composites.buckling.calc_buckling_factors` for the sign
+        convention.
+    M, N : int, optional
+        Number of half-waves of the buckling solver.
+    block_size : int, optional
+        Number of samples evaluated at once.
+    reservoir_size : int, optional
+        See :class:`.StreamingStatistics`.
+    rng : int, np.random.Generator or None, optional
+        Seed or random generator passed to ``np.random.default_rng``.
+
+    Returns
+    -------
+    stats : dict
+        :class:`.StreamingStatistics` of ``'ABD'`` with ``shape=(6, 6)``,
+        of ``'equivalent'`` with the properties of :data:`.EQUIVALENT_NAMES`
+        and, when ``loads`` is given, of ``'buckling'`` with the buckling
+        factors of each load case.
+
+    """
+    rng = np.random.default_rng(rng)
+    stack = np.asarray(stack, dtype=np.float64)
+    num_plies = stack.shape[0]
+    mat = read_laminaprop(laminaprop)
+    nominal = np.array([mat.e1, mat.e2, mat.nu12, mat.g12, mat.g13, mat.g23])
+    cv = np.array([cv_e1, cv_e2, cv_nu12, cv_g12, 0., 0.])
+    stats = dict(
+        ABD=StreamingStatistics((6, 6), reservoir_size, rng),
+        equivalent=StreamingStatistics((len(EQUIVALENT_NAMES),),
+                                       reservoir_size, rng))
+    if loads is not None:
+        if a is None or b is None:
+            raise ValueError('a and b are required with loads')
+        loads = np.atleast_2d(np.asarray(loads, dtype=np.float64))
+        stats['buckling'] = StreamingStatistics((loads.shape[0],),
+                                                reservoir_size, rng)
+    for start in range(0, num_samples, block_size):
+        n = min(block_size, num_samples - start)
+        thetadegs = stack + std_theta*rng.standard_normal((n, num_plies))
+        plyts = plyt*(1 + cv_plyt*rng.standard_normal((n, num_plies)))
+        laminaprops = nominal*(1 + cv*rng.standard_normal((n, 6)))
+        ABD = calc_ABD_batch_laminaprops(thetadegs, plyts, laminaprops,
+                                         offset)[0]
+        stats['ABD'].update(ABD)
+        stats['equivalent'].update(_equivalent_properties(ABD,
+                                                          plyts.sum(axis=1)))
+        if loads is not None:
+            D = ABD[:, 3:, 3:].reshape(n, 9)[:, [0, 1, 2, 4, 5, 8]]
+            stats['buckling'].update(calc_buckling_factors(a, b, D, loads,
+                                                           M=M, N=N))
+    return stats
@@ -0,0 +1,150 @@
+r"""
+==============================================
+Omni strain envelopes (:mod:`composites.omni`)
+==============================================
+
+.. currentmodule::composites.omni
+
+Stack-independent first-ply failure of laminates, following the omni strain
+failure envelope of:
+
+    Tsai, S. W., and Melo, J. D. D., 2014, "An Invariant-Based Theory of
+    Composites," Compos. Sci. Technol., 100, pp. 237-243.
+
+For a laminate strain state, each ply sees the principal strains
+`(\epsilon_I, \epsilon_{II})` rotated by the angle between the ply and the
+principal directions. The omni envelope is the inner envelope of the
+Tsai-Wu failure envelopes of all ply angles, such that it bounds the first
+ply failure of any stacking sequence of the material. The envelope is in
+the strain space and it is therefore unchanged by
+:meth:`.MatLamina.trace_normalize_plane_stress`, which divides the
+stiffnesses and the stress allowables by the same trace.
+
+Since the strength ratio of the Tsai-Wu criterion scales with the inverse
+of the strain magnitude, the envelope is tabulated once per material along
+the directions of the principal strain plane, and the strain states of many
+laminates and load cases are then checked with a table interpolation::
+
+    from composites.omni import calc_omni_reserve_factors
+
+    strains = np.einsum('nij,nlj->nli', np.linalg.inv(ABD)[:, :3, :3], loads)
+    rf = calc_omni_reserve_factors(matlamina, strains)
+
+"""
+from functools import lru_cache
+
+import numpy as np
+
+
+def _material_key(matlamina):
+    key = (matlamina.e1, matlamina.e2, matlamina.nu12, matlamina.nu21,
+           matlamina.g12, matlamina.st1, matlamina.st2, matlamina.sc1,
+           matlamina.sc2, matlamina.ss12)
+    if min(key[5:]) <= 0:
+        raise ValueError('The allowables st1, st2, sc1, sc2 and ss12 must '
+                         'be positive')
+    return key
+
+
+def _tsai_wu_strength_ratios(key, e1, e2, g12, F12star):
+    E1, E2, nu12, nu21, G12, Xt, Yt, Xc, Yc, S = key
+    den = 1 - nu12*nu21
+    s1 = E1/den*e1 + nu12*E2/den*e2
+    s2 = nu12*E2/den*e1 + E2/den*e2
+    s6 = G12*g12
+    F11 = 1/(Xt*Xc)
+    F22 = 1/(Yt*Yc)
+    F12 = F12star*np.sqrt(F11*F22)
+    a = F11*s1**2 + 2*F12*s1*s2 + F22*s2**2 + s6**2/S**2
+    b = (1/Xt - 1/Xc)*s1 + (1/Yt - 1/Yc)*s2
+    # NOTE positive root of a*R**2 + b*R - 1 = 0
+    with np.errstate(divide='ignore'):
+        return 2/(b + np.sqrt(b**2 + 4*a))
+
+
+@lru_cache(maxsize=64)
+def _omni_table(key, num_directions, num_angles, F12star):
+    phi = np.linspace(-np.pi, np.pi, num_directions, endpoint=False)
+    # NOTE the Tsai-Wu criterion is even in the shear stress, such that the
+    #      ply angles between 0 and 90 degrees cover all laminates
+    theta = np.linspace(0, np.pi/2, num_angles)[:, None]
+    eI = np.cos(phi)
+    eII = np.sin(phi)
+    mean = (eI + eII)/2
+    rad = (eI - eII)/2
+    e1 = mean + rad*np.cos(2*theta)
+    e2 = mean - rad*np.cos(2*theta)
+    g12 = -2*rad*np.sin(2*theta)
+    rf = _tsai_wu_strength_ratios(key, e1, e2, g12, F12star).min(axis=0)
+    phi.flags.writeable = False
+    rf.flags.writeable = False
+    return phi, rf
+
+
+def omni_strain_envelope(matlamina, num_directions=720, num_angles=181,
+        F12star=-0.5):
+    r"""Omni strain failure envelope of a material
+
+    The envelope is cached per material properties and inputs.
+
+    Parameters
+    ----------
+    matlamina : :class:`.MatLamina`
+        The material, with the allowables ``st1``, ``st2``, ``sc1``, ``sc2``
+        and ``ss12``, all positive.
+    num_directions : int, optional
+        Number of directions of the principal strain plane.
+    num_angles : int, optional
+        Number of ply angles between 0 and 90 degrees.
+    F12star : float, optional
+        Normalized interaction term of the Tsai-Wu criterion.
+
+    Returns
+    -------
+    eI, eII : tuple of arrays
+        The principal strains at failure, with ``shape=(num_directions,)``.
+
+    """
+    phi, rf = _omni_table(_material_key(matlamina), int(num_directions),
+                          int(num_angles), float(F12star))
+    return rf*np.cos(phi), rf*np.sin(phi)
+
+
+def calc_omni_reserve_factors(matlamina, strains, num_directions=720,
+        num_angles=181, F12star=-0.5):
+    r"""Reserve factors of laminate strain states with the omni envelope
+
+    Parameters
+    ----------
+    matlamina : :class:`.MatLamina`
+        The material, see :func:`.omni_strain_envelope`.
+    strains : array-like
+        The laminate strains `(\epsilon_{xx}, \epsilon_{yy},
+        \gamma_{xy})`, with ``shape=(..., 3)``, for instance
+        ``shape=(N, L, 3)`` for ``N`` laminates and ``L`` load cases.
+    num_directions, num_angles, F12star : optional
+        See :func:`.omni_strain_envelope`.
+
+    Returns
+    -------
+    rf : array
+        The reserve factors with ``shape=strains.shape[:-1]``, lower than
+        or equal to the first ply failure reserve factors of any stacking
+        sequence up to the interpolation error of the table, which
+        decreases with ``num_directions`` and ``num_angles``. Equal to
+        ``np.inf`` for null strains.
+
+    """
+    strains = np.asarray(strains, dtype=np.float64)
+    if strains.shape[-1] != 3:
+        raise ValueError('strains must have shape=(..., 3)')
+    phi, rf = _omni_table(_material_key(matlamina), int(num_directions),
+                          int(num_angles), float(F12star))
+    exx, eyy, gxy = np.moveaxis(strains, -1, 0)
+    mean = (exx + eyy)/2
+    rad = np.hypot((exx - eyy)/2, gxy/2)
+    eI = mean + rad
+    eII = mean - rad
+    with np.errstate(divide='ignore'):
+        return (np.interp(np.arctan2(eII, eI), phi, rf, period=2*np.pi)
+                / np.hypot(eI, eII))
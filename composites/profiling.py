@@ -0,0 +1,69 @@
+r"""
+=======================================
+Profiling (:mod:`composites.profiling`)
+=======================================
+
+.. currentmodule::composites.profiling
+
+Opt-in counters and timers for the hot paths of :mod:`composites.core`.
+
+When profiling is disabled, which is the default, the instrumented functions
+only read a C-level module flag at runtime on every call, a single branch
+that is negligible compared to the work of these functions. The
+profiling can be enabled before importing ``composites`` by setting the
+environment variable ``COMPOSITES_PROFILING=1``, or at runtime with::
+
+    from composites import profiling
+
+    profiling.enable()
+    lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop)
+    print(profiling.report())
+
+The instrumented functions are:
+
+- :meth:`.MatLamina.rebuild`
+- :meth:`.Lamina.rebuild`
+- :meth:`.Laminate.calc_constitutive_matrix`
+- :meth:`.Laminate.calc_scf`
+- :meth:`.Laminate.calc_equivalent_properties`
+
+"""
+from . import core
+
+
+def enable():
+    r"""Enable the profiling counters and timers"""
+    core._set_profiling(True)
+
+
+def disable():
+    r"""Disable the profiling counters and timers
+
+    The figures accumulated so far are kept, see :func:`.reset`.
+
+    """
+    core._set_profiling(False)
+
+
+def is_enabled():
+    r"""Return ``True`` if the profiling is enabled"""
+    return core._get_profiling()
+
+
+def reset():
+    r"""Set all counters and accumulated times to zero"""
+    core._reset_profiling()
+
+
+def report():
+    r"""Return the profiling figures
+
+    Returns
+    -------
+    report : dict
+        A dictionary with the name of each instrumented function as key, and
+        a dictionary ``{'ncalls': int, 'time': float}`` as value, with the
+        number of calls and the accumulated wall time in seconds.
+
+    """
+    return core._report_profiling()
@@ -0,0 +1,246 @@
+r"""
+===================================
+Records (:mod:`composites.records`)
+===================================
+
+.. currentmodule::composites.records
+
+Compact storage of laminate properties as NumPy structured arrays.
+
+A :class:`.Laminate` object carries many attributes that are not needed
+when storing large catalogues of laminates. The records defined by
+:func:`.laminate_dtype` keep only the 21 unique terms of the symmetric
+``ABD`` matrix, the 3 unique terms of ``Atrans``, the lamination
+parameters, the thickness, the offset and the mass integrals, optionally
+in single precision::
+
+    from composites.records import records_from_laminates, ABD_from_records
+
+    records = records_from_laminates(laminates, float32=True)
+    np.save('catalogue.npy', records)
+    ABD = ABD_from_records(records)
+
+"""
+from operator import attrgetter
+
+import numpy as np
+
+from .core import Laminate
+
+
+_LP_NAMES = ('xiA1', 'xiA2', 'xiA3', 'xiA4', 'xiB1', 'xiB2', 'xiB3', 'xiB4',
+             'xiD1', 'xiD2', 'xiD3', 'xiD4', 'xiAtrans1', 'xiAtrans2')
+_ABD_NAMES = ('A11', 'A12', 'A16', 'B11', 'B12', 'B16',
+              'A22', 'A26', 'B12', 'B22', 'B26',
+              'A66', 'B16', 'B26', 'B66',
+              'D11', 'D12', 'D16',
+              'D22', 'D26',
+              'D66')
+_ATRANS_NAMES = ('A44', 'A45', 'A55')
+_SCALAR_NAMES = ('h', 'offset', 'intrho', 'intrhoz', 'intrhoz2')
+_get_terms = attrgetter(*(_ABD_NAMES + _ATRANS_NAMES + _SCALAR_NAMES))
+
+
+def laminate_dtype(float32=False):
+    r"""Structured dtype of the laminate records
+
+    The fields are ``ABD`` with the 21 terms of the upper triangle of the
+    ``ABD`` matrix, row by row, ``Atrans`` with ``(A44, A45, A55)``, ``lp``
+    with the 14 lamination parameters ordered as in
+    :class:`.LaminationParameters`, and the scalars ``h``, ``offset``,
+    ``intrho``, ``intrhoz`` and ``intrhoz2``.
+
+    Parameters
+    ----------
+    float32 : bool, optional
+        If the fields are stored in single precision.
+
+    Returns
+    -------
+    dtype : np.dtype
+        The structured dtype.
+
+    """
+    t = np.float32 if float32 else np.float64
+    return np.dtype([('ABD', t, (21,)), ('Atrans', t, (3,)), ('lp', t, (14,))]
+                    + [(name, t) for name in _SCALAR_NAMES])
+
+
+def pack_symmetric(matrices):
+    r"""Upper triangle of symmetric matrices, row by row
+
+    Parameters
+    ----------
+    matrices : array-like
+        Symmetric matrices with ``shape=(..., n, n)``.
+
+    Returns
+    -------
+    packed : array
+        Packed terms with ``shape=(..., n*(n+1)//2)``.
+
+    """
+    matrices = np.asarray(matrices)
+    rows, cols = np.triu_indices(matrices.shape[-1])
+    return matrices[..., rows, cols]
+
+
+def unpack_symmetric(packed):
+    r"""Symmetric matrices from the terms of :func:`.pack_symmetric`
+
+    Parameters
+    ----------
+    packed : array-like
+        Packed terms with ``shape=(..., n*(n+1)//2)``.
+
+    Returns
+    -------
+    matrices : array
+        Symmetric matrices with ``shape=(..., n, n)``.
+
+    """
+    packed = np.asarray(packed)
+    n = int(round((np.sqrt(8*packed.shape[-1] + 1) - 1)/2))
+    if n*(n + 1)//2 != packed.shape[-1]:
+        raise ValueError('Invalid number of packed terms')
+    rows, cols = np.triu_indices(n)
+    matrices = np.empty(packed.shape[:-1] + (n, n), dtype=packed.dtype)
+    matrices[..., rows, cols] = packed
+    matrices[..., cols, rows] = packed
+    return matrices
+
+
+def records_from_arrays(ABD, Atrans=None, lp=None, h=None, offset=None,
+        intrho=None, intrhoz=None, intrhoz2=None, float32=False):
+    r"""Laminate records from batch results
+
+    Parameters
+    ----------
+    ABD : array-like
+        The ``ABD`` matrices with ``shape=(N, 6, 6)``.
+    Atrans, lp : array-like or None, optional
+        The ``Atrans`` matrices with ``shape=(N, 2, 2)`` and the
+        lamination parameters with ``shape=(N, 14)``. Zero when ``None``.
+    h, offset, intrho, intrhoz, intrhoz2 : array-like or None, optional
+        Scalar properties of each laminate, with ``shape=(N,)``. Zero when
+        ``None``.
+    float32 : bool, optional
+        If the records are stored in single precision.
+
+    Returns
+    -------
+    records : array
+        Structured array with ``shape=(N,)`` and dtype
+        :func:`.laminate_dtype`.
+
+    """
+    ABD = np.asarray(ABD)
+    records = np.zeros(ABD.shape[0], dtype=laminate_dtype(float32))
+    records['ABD'] = pack_symmetric(ABD)
+    if Atrans is not None:
+        records['Atrans'] = pack_symmetric(Atrans)
+    if lp is not None:
+        records['lp'] = lp
+    for name, value in zip(_SCALAR_NAMES,
+                           (h, offset, intrho, intrhoz, intrhoz2)):
+        if value is not None:
+            records[name] = value
+    return records
+
+
+def records_from_laminates(laminates, float32=False):
+    r"""Laminate records from :class:`.Laminate` objects
+
+    The lamination parameters are calculated for the laminates with plies,
+    and are zero otherwise.
+
+    Parameters
+    ----------
+    laminates : iterable of :class:`.Laminate`
+        The laminates.
+    float32 : bool, optional
+        If the records are stored in single precision.
+
+    Returns
+    -------
+    records : array
+        Structured array with ``shape=(N,)`` and dtype
+        :func:`.laminate_dtype`.
+
+    """
+    laminates = list(laminates)
+    terms = np.array([_get_terms(lam) for lam in laminates],
+                     dtype=np.float64).reshape(len(laminates), -1)
+    records = np.zeros(len(laminates), dtype=laminate_dtype(float32))
+    records['ABD'] = terms[:, :21]
+    records['Atrans'] = terms[:, 21:24]
+    for i, name in enumerate(_SCALAR_NAMES):
+        records[name] = terms[:, 24 + i]
+    lpget = attrgetter(*_LP_NAMES)
+    for i, lam in enumerate(laminates):
+        if len(lam.plies) > 0:
+            records['lp'][i] = lpget(lam.calc_lamination_parameters())
+    return records
+
+
+def laminate_from_record(record):
+    r"""Create a :class:`.Laminate` from a laminate record
+
+    The returned laminate has no plies, but its stiffnesses, thickness,
+    offset, mass integrals and equivalent properties are defined.
+
+    Parameters
+    ----------
+    record : np.void
+        One item of a structured array with dtype :func:`.laminate_dtype`.
+
+    Returns
+    -------
+    lam : :class:`.Laminate`
+        The laminate.
+
+    """
+    lam = Laminate()
+    for name, value in zip(_ABD_NAMES, record['ABD'].tolist()):
+        setattr(lam, name, value)
+    for name, value in zip(_ATRANS_NAMES, record['Atrans'].tolist()):
+        setattr(lam, name, value)
+    for name in _SCALAR_NAMES:
+        setattr(lam, name, float(record[name]))
+    if lam.h > 0:
+        lam.calc_equivalent_properties()
+    return lam
+
+
+def ABD_from_records(records):
+    r"""Full ``ABD`` matrices in double precision
+
+    Parameters
+    ----------
+    records : array
+        Structured array with dtype :func:`.laminate_dtype`.
+
+    Returns
+    -------
+    ABD : array
+        The ``ABD`` matrices with ``shape=records.shape + (6, 6)``.
+
+    """
+    return unpack_symmetric(records['ABD'].astype(np.float64))
+
+
+def Atrans_from_records(records):
+    r"""Full ``Atrans`` matrices in double precision
+
+    Parameters
+    ----------
+    records : array
+        Structured array with dtype :func:`.laminate_dtype`.
+
+    Returns
+    -------
+    Atrans : array
+        The ``Atrans`` matrices with ``shape=records.shape + (2, 2)``.
+
+    """
+    return unpack_symmetric(records['Atrans'].astype(np.float64))
@@ -0,0 +1,430 @@
+r"""
+=========================================================
+Stacking sequence notation (:mod:`composites.stacking`)
+=========================================================
+
+.. currentmodule::composites.stacking
+
+Functions to parse the compact stacking sequence notation commonly used to
+describe laminates, such as ``[(±45/0/90)_4]_s``, and to compute the
+laminate properties directly from the repeat and symmetry structure of the
+notation. Blended panels defined by a guide laminate and a stacking sequence
+table are also supported, see :func:`.blended_laminates`.
+
+The laminate stiffnesses are computed from the moments `\int \bar{Q}_{ij}
+z^n dz` of each sub-laminate about its own mid-plane. A repeated
+sub-laminate is obtained with closed-form sums of the parallel-axis
+(binomial) relations, and a symmetric sub-laminate by mirroring, such that
+the cost of the stiffnesses depends on the number of distinct plies in the
+notation rather than on the total number of plies.
+
+"""
+import re
+from fractions import Fraction
+from math import comb
+
+import numpy as np
+
+from .core import (Lamina, Laminate, taper_ABD,
+        taper_lamination_parameters)
+from .utils import read_laminaprop
+
+
+# NOTE moments of order 0 to 6 of the terms:
+#      q11L, q12L, q16L, q22L, q26L, q66L, q44L, q45L, q55L, rho
+NUM_ORDERS = 7
+
+_INPLANE = ('11', '12', '16', '22', '26', '66')
+_TRANS = ('44', '45', '55')
+_INPLANE_PREFIX = 'ABDEFGH'
+_TRANS_PREFIX = 'ABDEF'
+
+
+class SubLaminate(object):
+    r"""Sub-laminate of a stacking sequence
+
+    Parameters
+    ----------
+    items : list
+        Ply angles in degrees (float) or other :class:`.SubLaminate` objects,
+        from the bottom to the top.
+    repeat : int, optional
+        Number of times the items are repeated.
+    symmetric : bool, optional
+        If True, the repeated items are followed by their mirror image.
+
+    """
+    def __init__(self, items, repeat=1, symmetric=False):
+        self.items = list(items)
+        self.repeat = int(repeat)
+        self.symmetric = bool(symmetric)
+        if self.repeat < 1:
+            raise ValueError('repeat must be a positive integer')
+
+    def __repr__(self):
+        return 'SubLaminate(%r, repeat=%d, symmetric=%r)' % (self.items,
+                self.repeat, self.symmetric)
+
+    def __eq__(self, other):
+        return (isinstance(other, SubLaminate) and self.items == other.items
+                and self.repeat == other.repeat
+                and self.symmetric == other.symmetric)
+
+    @property
+    def num_plies(self):
+        r"""Total number of plies"""
+        n = 0
+        for item in self.items:
+            if isinstance(item, SubLaminate):
+                n += item.num_plies
+            else:
+                n += 1
+        n *= self.repeat
+        if self.symmetric:
+            n *= 2
+        return n
+
+    def angles(self):
+        r"""Return the set of distinct ply angles"""
+        out = set()
+        for item in self.items:
+            if isinstance(item, SubLaminate):
+                out.update(item.angles())
+            else:
+                out.add(item)
+        return out
+
+    def expand(self):
+        r"""Return the full list of ply angles, from the bottom to the top"""
+        out = []
+        for item in self.items:
+            if isinstance(item, SubLaminate):
+                out.extend(item.expand())
+            else:
+                out.append(item)
+        out = out*self.repeat
+        if self.symmetric:
+            out = out + out[::-1]
+        return out
+
+
+_TOKENS = re.compile(r"""
+    \s*(?:
+    (?P<open>[\(\[])
+    |(?P<close>[\)\]])
+    |(?P<sep>/)
+    |(?P<angle>(?:±|∓|\+-|-\+|\+|-)?\d+(?:\.\d*)?)
+    |(?P<suffix>_?\{\s*\d*\s*[sS]?\s*\}|_\d*[sS]?|[sS])
+    )""", re.VERBOSE)
+
+
+def _tokenize(notation):
+    tokens = []
+    pos = 0
+    notation = notation.strip()
+    while pos < len(notation):
+        match = _TOKENS.match(notation, pos)
+        if match is None or match.end() == pos:
+            raise ValueError('Invalid stacking sequence notation %r at '
+                             'position %d' % (notation, pos))
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+def _parse_suffix(text):
+    text = text.lstrip('_').strip('{}').strip()
+    symmetric = text[-1:] in ('s', 'S')
+    if symmetric:
+        text = text[:-1]
+    repeat = int(text) if text else 1
+    if not symmetric and not text:
+        raise ValueError('Empty subscript in stacking sequence notation')
+    if repeat < 1:
+        raise ValueError('Invalid repetition %d in stacking sequence '
+                         'notation' % repeat)
+    return repeat, symmetric
+
+
+def _parse_sequence(tokens, pos):
+    items = []
+    while True:
+        if pos >= len(tokens):
+            raise ValueError('Unexpected end of stacking sequence notation')
+        kind, text = tokens[pos]
+        if kind == 'open':
+            item, pos = _parse_sequence(tokens, pos + 1)
+            if pos >= len(tokens) or tokens[pos][0] != 'close':
+                raise ValueError('Unbalanced brackets in stacking sequence '
+                                 'notation')
+            pos += 1
+        elif kind == 'angle':
+            value = float(text.lstrip('±∓+-'))
+            if text.startswith(('±', '+-')):
+                item = SubLaminate([value, -value])
+            elif text.startswith(('∓', '-+')):
+                item = SubLaminate([-value, value])
+            else:
+                item = float(text)
+            pos += 1
+        else:
+            raise ValueError('Unexpected %r in stacking sequence notation'
+                             % text)
+        while pos < len(tokens) and tokens[pos][0] == 'suffix':
+            repeat, symmetric = _parse_suffix(tokens[pos][1])
+            if not isinstance(item, SubLaminate):
+                item = SubLaminate([item])
+            if item.repeat == 1 and not item.symmetric:
+                item.repeat = repeat
+                item.symmetric = symmetric
+            else:
+                item = SubLaminate([item], repeat=repeat, symmetric=symmetric)
+            pos += 1
+        items.append(item)
+        if pos < len(tokens) and tokens[pos][0] == 'sep':
+            pos += 1
+            continue
+        return SubLaminate(items), pos
+
+
+def parse_stack_notation(notation):
+    r"""Parse a stacking sequence written in the compact notation
+
+    Supported are ply angles separated by ``/``, the signs ``±`` and ``∓``
+    (or ``+-`` and ``-+``), groups with ``()`` or ``[]``, and subscripts
+    with the number of repetitions and/or ``s`` for symmetry, as in::
+
+        [(±45/0/90)_4]_s
+        [0/90]_2s
+        [45/-45/0_2/90]s
+
+    Parameters
+    ----------
+    notation : str
+        The stacking sequence notation, from the bottom to the top.
+
+    Returns
+    -------
+    sublam : :class:`.SubLaminate`
+        The stacking sequence, keeping the repeat and symmetry structure.
+
+    """
+    tokens = _tokenize(notation)
+    if len(tokens) == 0:
+        raise ValueError('Empty stacking sequence notation')
+    sublam, pos = _parse_sequence(tokens, 0)
+    if pos != len(tokens):
+        raise ValueError('Invalid stacking sequence notation %r' % notation)
+    # NOTE removing redundant outer groups, e.g. "[0/90]_s"
+    while (len(sublam.items) == 1 and isinstance(sublam.items[0], SubLaminate)
+           and sublam.repeat == 1 and not sublam.symmetric):
+        sublam = sublam.items[0]
+    return sublam
+
+
+def _shift_matrix(delta):
+    r"""Matrix `S` such that ``S @ M`` shifts the moments ``M`` by
+    `z' = z + \delta`"""
+    S = np.zeros((NUM_ORDERS, NUM_ORDERS))
+    for n in range(NUM_ORDERS):
+        for k in range(n + 1):
+            S[n, k] = comb(n, k)*delta**(n - k)
+    return S
+
+
+def _repeat_matrix(thickness, repeat):
+    r"""Sum of the shift matrices of ``repeat`` copies of a block centred
+    about their common mid-plane"""
+    r = repeat
+    # exact integer sums: sum_j (2*j - (r - 1))**p for j in range(r)
+    sums = [sum(comb(p, k)*2**k*_power_sum(k, r)*(1 - r)**(p - k)
+                for k in range(p + 1)) for p in range(NUM_ORDERS)]
+    S = np.zeros((NUM_ORDERS, NUM_ORDERS))
+    for n in range(NUM_ORDERS):
+        for k in range(n + 1):
+            p = n - k
+            S[n, k] = comb(n, k)*sums[p]*(thickness/2.)**p
+    return S
+
+
+def _power_sum(p, r):
+    r"""Exact `\sum_{j=0}^{r-1} j^p` using Faulhaber's formula"""
+    # NOTE Bernoulli numbers with B_1 = -1/2, such that the sum stops at
+    #      r - 1
+    B = [Fraction(1)]
+    for m in range(1, p + 1):
+        B.append(-sum(comb(m + 1, k)*B[k] for k in range(m))/(m + 1))
+    total = sum(comb(p + 1, k)*B[k]*r**(p + 1 - k) for k in range(p + 1))
+    return int(total/(p + 1))
+
+
+_MIRROR = np.array([(-1.)**n for n in range(NUM_ORDERS)])[:, None]
+
+
+def _ply_moments(ply, rho):
+    r"""Moments of a ply about its own mid-plane"""
+    t = ply.h
+    q = np.array([ply.q11L, ply.q12L, ply.q16L, ply.q22L, ply.q26L,
+                  ply.q66L, ply.q44L, ply.q45L, ply.q55L, rho])
+    M = np.zeros((NUM_ORDERS, q.shape[0]))
+    for n in range(0, NUM_ORDERS, 2):
+        M[n] = q*2*(t/2.)**(n + 1)/(n + 1)
+    return M
+
+
+def _sublaminate_moments(sublam, ply_moments, plyt):
+    r"""Moments of a sub-laminate about its own mid-plane and its thickness
+    """
+    thickness = 0.
+    moments = []
+    for item in sublam.items:
+        if isinstance(item, SubLaminate):
+            M, t = _sublaminate_moments(item, ply_moments, plyt)
+        else:
+            M, t = ply_moments[item], plyt
+        moments.append((M, t))
+        thickness += t
+    M = 0.
+    zbot = -thickness/2.
+    for Mi, t in moments:
+        M = M + _shift_matrix(zbot + t/2.) @ Mi
+        zbot += t
+    if sublam.repeat > 1:
+        M = _repeat_matrix(thickness, sublam.repeat) @ M
+        thickness *= sublam.repeat
+    if sublam.symmetric:
+        # NOTE mirroring with exact cancellation of the odd moments
+        M = _shift_matrix(-thickness/2.) @ M
+        M = M + _MIRROR*M
+        thickness *= 2
+    return M, thickness
+
+
+def _laminate_from_moments(M, h, offset):
+    r"""Create a :class:`.Laminate` from moments about its mid-plane"""
+    lam = Laminate()
+    if offset != 0.:
+        M = _shift_matrix(offset) @ M
+    lam.h = h
+    lam.offset = offset
+    for n, prefix in enumerate(_INPLANE_PREFIX):
+        for j, ij in enumerate(_INPLANE):
+            setattr(lam, prefix + ij, M[n, j])
+    for n, prefix in enumerate(_TRANS_PREFIX):
+        for j, ij in enumerate(_TRANS):
+            setattr(lam, prefix + ij, M[n, 6 + j])
+    lam.intrho = M[0, 9]
+    lam.intrhoz = M[1, 9]
+    lam.intrhoz2 = M[2, 9]
+    return lam
+
+
+def laminate_from_stack_notation(notation, plyt, laminaprop, rho=0.,
+        offset=0., calc_scf=True):
+    r"""Create a :class:`.Laminate` from the stacking sequence notation
+
+    Only the distinct plies of the notation are integrated, and the
+    repetitions and symmetries are summed in closed form, such that the
+    cost of the constitutive terms does not depend on the number of
+    repetitions. The ``stack`` and ``plies`` lists and the shear correction
+    factors are still built ply by ply. Symmetric laminates, such as
+    ``[(±45/0/90)_4]_s``, have exactly `B_{ij} = 0` when ``offset=0``.
+
+    Parameters
+    ----------
+    notation : str or :class:`.SubLaminate`
+        Stacking sequence notation, see :func:`.parse_stack_notation`.
+    plyt : float
+        Ply thickness, common to all plies.
+    laminaprop : tuple
+        Material properties, common to all plies, see
+        :func:`composites.utils.read_laminaprop`.
+    rho : float, optional
+        Material density.
+    offset : float, optional
+        Offset along the normal axis about the mid-surface.
+    calc_scf : bool, optional
+        If True, use :meth:`.Laminate.calc_scf` to compute shear correction
+        factors, otherwise the default value of 5/6 is used.
+
+    Returns
+    -------
+    lam : :class:`.Laminate`
+        The laminate, whose ``plies`` list contains shared
+        :class:`.Lamina` objects, one for each distinct angle.
+
+    """
+    if isinstance(notation, SubLaminate):
+        sublam = notation
+    else:
+        sublam = parse_stack_notation(notation)
+    matlamina = read_laminaprop(laminaprop, rho)
+    plies = {}
+    ply_moments = {}
+    for thetadeg in sublam.angles():
+        ply = Lamina()
+        ply.thetadeg = float(thetadeg)
+        ply.h = plyt
+        ply.matlamina = matlamina
+        ply.rebuild()
+        plies[thetadeg] = ply
+        ply_moments[thetadeg] = _ply_moments(ply, rho)
+    M, h = _sublaminate_moments(sublam, ply_moments, plyt)
+    lam = _laminate_from_moments(M, h, offset)
+    lam.stack = sublam.expand()
+    lam.plies = [plies[thetadeg] for thetadeg in lam.stack]
+    lam.calc_equivalent_properties()
+    if calc_scf:
+        lam.calc_scf()
+    return lam
+
+
+def blended_laminates(guide, drop_order, num_plies):
+    r"""Stiffness and lamination parameters of blended panels
+
+    In a blended design all panels share a guide laminate, and each panel is
+    obtained by dropping plies from the guide following a common drop order
+    (stacking sequence table). A panel with ``num_plies[i]`` plies is
+    obtained by dropping the first ``len(guide.plies) - num_plies[i]`` plies
+    of ``drop_order``.
+
+    The guide laminate is evaluated once with a single incremental pass
+    over the drop order, see :func:`composites.core.taper_ABD`, and each
+    panel is then a lookup, such that the cost is independent of the number
+    of panels sharing the same number of plies. Since dropping a ply moves
+    all the plies on one side of it, the pass is not a prefix sum, and it
+    costs `O(n_{guide} n_{drops})` in the worst case, for a total cost of
+    `O(n_{guide} n_{drops} + n_{panels})`.
+
+    Parameters
+    ----------
+    guide : :class:`.Laminate`
+        The guide laminate, containing all plies.
+    drop_order : array-like
+        Indices of the plies of the guide laminate, in the order they are
+        dropped.
+    num_plies : array-like
+        Number of plies of each panel, with ``shape=(n_panels,)``.
+
+    Returns
+    -------
+    ABD, lp : tuple of arrays
+        The ``ABD`` matrices with ``shape=(n_panels, 6, 6)`` and the
+        lamination parameters with ``shape=(n_panels, 14)``, ordered as in
+        :func:`composites.core.taper_lamination_parameters`.
+
+    """
+    num_guide = len(guide.plies)
+    num_plies = np.asarray(num_plies, dtype=np.intp)
+    drop_order = np.asarray(drop_order, dtype=np.intp)
+    if num_plies.size == 0:
+        return np.zeros((0, 6, 6)), np.zeros((0, 14))
+    num_drops = num_guide - num_plies
+    if num_drops.min() < 0 or num_drops.max() > drop_order.shape[0]:
+        raise ValueError('num_plies must be between %d and %d' % (num_guide
+            - drop_order.shape[0], num_guide))
+    drop_order = drop_order[:num_drops.max()]
+    ABD = taper_ABD(guide, drop_order)
+    lp = taper_lamination_parameters(guide, drop_order)
+    return ABD[num_drops], lp[num_drops]
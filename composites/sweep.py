@@ -0,0 +1,320 @@
+r"""
+================================
+Sweeps (:mod:`composites.sweep`)
+================================
+
+.. currentmodule::composites.sweep
+
+Resumable evaluation of all the stacking sequences with a given number of
+plies and a given set of ply angles.
+
+The enumeration space is split into deterministic shards of consecutive
+stacking sequences. Each shard is evaluated with
+:func:`composites.batch.evaluate_stacks` and written atomically to the
+directory of the sweep, next to a ``manifest.json`` file with the
+parameters of the sweep. Running the sweep again skips the shards already
+written, such that an interrupted sweep resumes where it stopped.
+
+Several processes, on one or more machines sharing the directory, can run
+the same sweep at the same time. A shard is claimed by creating a claim
+file exclusively, without any coordinating service, and claims older than
+``claim_timeout`` are considered abandoned and taken over::
+
+    from composites.sweep import Sweep
+
+    sweep = Sweep('sweep_16plies', [0, 45, -45, 90], 16, plyt=0.125e-3,
+                  laminaprop=laminaprop, symmetric=True)
+    sweep.run()
+    if sweep.is_complete():
+        results = sweep.load()
+
+or from the command line, in as many processes as desired::
+
+    python -m composites sweep sweep_16plies --angles 0 45 -45 90 --num-plies 16 --plyt 0.125e-3 --laminaprop 142.5e9 8.7e9 0.28 5.1e9 5.1e9 5.1e9 --symmetric
+
+"""
+import json
+import os
+import socket
+import time
+import uuid
+
+import numpy as np
+
+from .batch import evaluate_stacks, result_dtype
+from .utils import read_laminaprop
+
+
+_MANIFEST = 'manifest.json'
+
+
+def _atomic_write(path, write):
+    # NOTE os.replace is atomic, such that readers see either no file or
+    #      the complete file
+    tmp = '%s.%s.%d.tmp' % (path, socket.gethostname(), os.getpid())
+    with open(tmp, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def stacks_from_indices(indices, angles, num_plies):
+    r"""Stacking sequences of the enumeration of all the combinations
+
+    Parameters
+    ----------
+    indices : array-like
+        Indices between ``0`` and ``len(angles)**num_plies - 1``.
+    angles : array-like
+        The possible ply angles.
+    num_plies : int
+        Number of plies.
+
+    Returns
+    -------
+    stacks : array
+        The ply angles with ``shape=(len(indices), num_plies)``, with the
+        first ply varying slowest.
+
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    angles = np.asarray(angles, dtype=np.float64)
+    powers = len(angles)**np.arange(num_plies - 1, -1, -1, dtype=np.int64)
+    return angles[(indices[:, None]//powers) % len(angles)]
+
+
+class Sweep(object):
+    r"""Sharded and resumable sweep over all the stacking sequences
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the sweep, created if needed. If it already contains a
+        sweep, the parameters must be the same.
+    angles : list
+        The possible ply angles in degrees.
+    num_plies : int
+        Number of plies.
+    plyt : float
+        Ply thickness.
+    laminaprop : tuple
+        Material of all plies, see :func:`composites.utils.read_laminaprop`.
+    rho : float, optional
+        Material density.
+    offset : float, optional
+        Offset along the normal axis about the mid-surface.
+    symmetric : bool, optional
+        If only symmetric stacking sequences are enumerated, with
+        ``num_plies`` even.
+    shard_size : int, optional
+        Number of stacking sequences of each shard.
+    float32 : bool, optional
+        If the results are stored in single precision.
+    claim_timeout : float, optional
+        Time in seconds after which a claim is considered abandoned, which
+        must be larger than the time to evaluate one shard.
+
+    Attributes
+    ----------
+    num_stacks : int
+        Number of stacking sequences of the sweep.
+    num_shards : int
+        Number of shards.
+
+    """
+    def __init__(self, directory, angles, num_plies, plyt, laminaprop,
+            rho=0., offset=0., symmetric=False, shard_size=100000,
+            float32=False, claim_timeout=3600.):
+        if symmetric and num_plies % 2 != 0:
+            raise ValueError('num_plies must be even for symmetric sweeps')
+        mat = read_laminaprop(laminaprop)
+        self.directory = directory
+        self.claim_timeout = claim_timeout
+        self._claims = {}
+        num_free = num_plies//2 if symmetric else num_plies
+        self.num_stacks = len(angles)**num_free
+        self.num_shards = -(-self.num_stacks//shard_size)
+        self.manifest = dict(
+            angles=[float(angle) for angle in angles],
+            num_plies=int(num_plies),
+            plyt=float(plyt),
+            laminaprop=[mat.e1, mat.e2, mat.nu12, mat.g12, mat.g13, mat.g23],
+            rho=float(rho),
+            offset=float(offset),
+            symmetric=bool(symmetric),
+            shard_size=int(shard_size),
+            float32=bool(float32),
+            num_stacks=self.num_stacks,
+            num_shards=self.num_shards,
+            )
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, _MANIFEST)
+        if not os.path.exists(path):
+            _atomic_write(path, lambda f: f.write(
+                json.dumps(self.manifest, indent=2).encode()))
+        with open(path) as f:
+            if json.load(f) != self.manifest:
+                raise ValueError('The directory %s contains a different sweep'
+                                 % directory)
+
+    def shard_path(self, shard):
+        r"""Path of the results of a shard"""
+        return os.path.join(self.directory, 'shard_%06d.npy' % shard)
+
+    def _claim_path(self, shard):
+        return os.path.join(self.directory, 'shard_%06d.claim' % shard)
+
+    def done_shards(self):
+        r"""Sorted list of the shards already written"""
+        return [shard for shard in range(self.num_shards)
+                if os.path.exists(self.shard_path(shard))]
+
+    def is_complete(self):
+        r"""If all the shards are written"""
+        return len(self.done_shards()) == self.num_shards
+
+    def stacks(self, shard):
+        r"""Stacking sequences of a shard
+
+        Returns
+        -------
+        stacks : array
+            The ply angles with ``shape=(n, num_plies)``.
+
+        """
+        m = self.manifest
+        start = shard*m['shard_size']
+        stop = min(start + m['shard_size'], self.num_stacks)
+        indices = np.arange(start, stop, dtype=np.int64)
+        if m['symmetric']:
+            half = stacks_from_indices(indices, m['angles'],
+                                       m['num_plies']//2)
+            return np.hstack((half, half[:, ::-1]))
+        return stacks_from_indices(indices, m['angles'], m['num_plies'])
+
+    def _try_claim(self, shard):
+        path = self._claim_path(shard)
+        uid = uuid.uuid4().hex
+        try:
+            age = time.time() - os.path.getmtime(path)
+        except FileNotFoundError:
+            age = None
+        if age is not None:
+            if age < self.claim_timeout:
+                return False
+            # NOTE only one process succeeds to move an abandoned claim, but
+            #      a process seeing it late may move the fresh claim of the
+            #      process that took it over, which is then put back
+            stale = '%s.%s.stale' % (path, uid)
+            try:
+                os.rename(path, stale)
+            except FileNotFoundError:
+                return False
+            try:
+                age = time.time() - os.path.getmtime(stale)
+                fresh = age < self.claim_timeout
+                if fresh:
+                    try:
+                        os.link(stale, path)
+                    except OSError:
+                        pass
+            finally:
+                os.remove(stale)
+            if fresh:
+                return False
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        token = '%s %d %s\n' % (socket.gethostname(), os.getpid(), uid)
+        with os.fdopen(fd, 'w') as f:
+            f.write(token)
+        self._claims[shard] = token
+        return True
+
+    def _release(self, shard):
+        path = self._claim_path(shard)
+        token = self._claims.pop(shard, None)
+        # NOTE a claim taken over by another process after claim_timeout is
+        #      kept
+        try:
+            with open(path) as f:
+                if f.read() != token:
+                    return
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def evaluate(self, shard):
+        r"""Evaluate a shard without writing it
+
+        Returns
+        -------
+        results : array
+            Structured array with dtype
+            :func:`composites.batch.result_dtype`.
+
+        """
+        m = self.manifest
+        stacks = self.stacks(shard)
+        n, num_plies = stacks.shape
+        rows = np.hstack((stacks, np.full((n, num_plies), m['plyt']),
+                          np.zeros((n, 1)), np.full((n, 1), m['offset'])))
+        materials = [m['laminaprop'] + [m['rho']]]
+        return evaluate_stacks(rows, materials, float32=m['float32'])
+
+    def run(self, max_shards=None):
+        r"""Evaluate and write the shards not yet written or claimed
+
+        Parameters
+        ----------
+        max_shards : int or None, optional
+            Maximum number of shards evaluated by this call.
+
+        Returns
+        -------
+        num : int
+            Number of shards evaluated by this call.
+
+        """
+        num = 0
+        for shard in range(self.num_shards):
+            if max_shards is not None and num >= max_shards:
+                break
+            path = self.shard_path(shard)
+            if os.path.exists(path) or not self._try_claim(shard):
+                continue
+            try:
+                # NOTE another process may have finished the shard before
+                #      this claim
+                if not os.path.exists(path):
+                    results = self.evaluate(shard)
+                    _atomic_write(path, lambda f: np.save(f, results))
+                    num += 1
+            finally:
+                self._release(shard)
+        return num
+
+    def load(self, shards=None):
+        r"""Load the results of written shards
+
+        Parameters
+        ----------
+        shards : list or None, optional
+            The shards, all of them by default.
+
+        Returns
+        -------
+        results : array
+            Structured array with dtype
+            :func:`composites.batch.result_dtype`, in the order of the
+            enumeration.
+
+        """
+        if shards is None:
+            shards = range(self.num_shards)
+        results = [np.load(self.shard_path(shard)) for shard in shards]
+        if not results:
+            return np.zeros(0, dtype=result_dtype(self.manifest['float32']))
+        return np.concatenate(results)
@@ -0,0 +1,198 @@
+r"""
+=========================================
+Thermal loads (:mod:`composites.thermal`)
+=========================================
+
+.. currentmodule::composites.thermal
+
+Thermal force and moment resultants and residual ply stresses of laminates
+using the expansion coefficients ``a1`` and ``a2`` and the reference
+temperature ``tref`` of each :class:`.MatLamina`.
+
+The temperature through the thickness is linear, `T(z) = T + z
+\partial T/\partial z`, with `z` measured from the reference surface of the
+``ABD`` matrix. All responses are then affine functions of `(T, \partial
+T/\partial z)`, and :class:`.ThermalLaminate` integrates the plies only
+once, such that each additional temperature state, for instance at each
+node of a finite element model, costs only a scaling::
+
+    from composites.thermal import ThermalLaminate
+
+    for ply in lam.plies:
+        ply.matlamina.a1 = -0.3e-6
+        ply.matlamina.a2 = 28.e-6
+        ply.matlamina.tref = 180.
+    thermal = ThermalLaminate(lam)
+    NT, MT = thermal.calc_resultants(T_nodes)
+    stresses = thermal.calc_ply_stresses(20.)
+
+"""
+import numpy as np
+
+
+_POSITIONS = {'bottom': 0., 'mid': 0.5, 'top': 1.}
+
+
+class ThermalLaminate(object):
+    r"""Thermal response of a laminate for many temperature states
+
+    Parameters
+    ----------
+    lam : :class:`.Laminate`
+        The laminate, with plies. The plies must not change after creating
+        this object.
+
+    Attributes
+    ----------
+    z : array
+        Coordinates of the ply interfaces, with ``shape=(n_plies + 1,)``.
+    alpha : array
+        Expansion coefficients `(\alpha_{xx}, \alpha_{yy}, \gamma_{xy})` of
+        each ply in the laminate coordinates, with ``shape=(n_plies, 3)``.
+
+    """
+    def __init__(self, lam):
+        if len(lam.plies) == 0:
+            raise ValueError('The laminate must have plies')
+        plies = lam.plies
+        h = np.array([ply.h for ply in plies])
+        self.z = np.concatenate(([-lam.h/2. + lam.offset],
+                                 -lam.h/2. + lam.offset + np.cumsum(h)))
+        thetarad = np.deg2rad([ply.thetadeg for ply in plies])
+        self._c = np.cos(thetarad)
+        self._s = np.sin(thetarad)
+        mats = [ply.matlamina for ply in plies]
+        a1 = np.array([mat.a1 for mat in mats])
+        a2 = np.array([mat.a2 for mat in mats])
+        self._a12 = np.stack((a1, a2, np.zeros_like(a1)), axis=1)
+        self._tref = np.array([mat.tref for mat in mats])
+        c2 = self._c**2
+        s2 = self._s**2
+        sc = self._s*self._c
+        self.alpha = np.stack((a1*c2 + a2*s2, a1*s2 + a2*c2, 2*(a1 - a2)*sc),
+                              axis=1)
+        self._Qbar = np.array([np.asarray(ply.get_constitutive_matrix())[:3, :3]
+                               for ply in plies])
+        den = 1 - np.array([mat.nu12*mat.nu21 for mat in mats])
+        self._Q = np.zeros((len(plies), 3, 3))
+        self._Q[:, 0, 0] = [mat.e1 for mat in mats]/den
+        self._Q[:, 1, 1] = [mat.e2 for mat in mats]/den
+        self._Q[:, 0, 1] = [mat.nu12*mat.e2 for mat in mats]/den
+        self._Q[:, 1, 0] = self._Q[:, 0, 1]
+        self._Q[:, 2, 2] = [mat.g12 for mat in mats]
+        self._abd = np.linalg.inv(np.asarray(lam.ABD))
+
+        # NOTE responses to the basis states (T, dTdz, 1), the last one
+        #      containing the terms of the reference temperatures
+        basis = np.eye(3)
+        NT, MT = self._integrate(basis)
+        self._NT = NT
+        self._MT = MT
+        self._strains = np.concatenate((NT, MT), axis=1) @ self._abd.T
+        self._ply_stresses = {position: self._stresses(basis, frac)
+                              for position, frac in _POSITIONS.items()}
+
+    def _integrate(self, states):
+        z1 = self.z[:-1]
+        z2 = self.z[1:]
+        Qa = np.einsum('kij,kj->ki', self._Qbar, self.alpha)
+        T, dTdz, const = states.T
+        # temperature difference integrated with weights 1 and z in each ply
+        dT0 = (T[:, None] - const[:, None]*self._tref)*(z2 - z1)
+        dT1 = (T[:, None] - const[:, None]*self._tref)*(z2**2 - z1**2)/2.
+        dT0 += dTdz[:, None]*(z2**2 - z1**2)/2.
+        dT1 += dTdz[:, None]*(z2**3 - z1**3)/3.
+        return dT0 @ Qa, dT1 @ Qa
+
+    def _stresses(self, states, frac):
+        z = self.z[:-1] + frac*(self.z[1:] - self.z[:-1])
+        T, dTdz, const = states.T
+        strains = (np.concatenate(self._integrate(states), axis=1)
+                   @ self._abd.T)
+        # laminate strains at z, transformed to the material coordinates
+        exx, eyy, gxy = np.moveaxis(strains[:, None, :3]
+                                    + z[None, :, None]*strains[:, None, 3:],
+                                    -1, 0)
+        c2 = self._c**2
+        s2 = self._s**2
+        sc = self._s*self._c
+        e12 = np.stack((c2*exx + s2*eyy + sc*gxy,
+                        s2*exx + c2*eyy - sc*gxy,
+                        -2*sc*exx + 2*sc*eyy + (c2 - s2)*gxy), axis=-1)
+        dT = (T[:, None] + dTdz[:, None]*z[None, :]
+              - const[:, None]*self._tref[None, :])
+        e12 -= dT[:, :, None]*self._a12[None, :, :]
+        return np.einsum('kij,skj->ski', self._Q, e12)
+
+    @staticmethod
+    def _states(T, dTdz):
+        T, dTdz = np.broadcast_arrays(np.asarray(T, dtype=np.float64),
+                                      np.asarray(dTdz, dtype=np.float64))
+        return np.stack((T, dTdz, np.ones_like(T)), axis=-1)
+
+    def calc_resultants(self, T, dTdz=0.):
+        r"""Thermal force and moment resultants
+
+        Parameters
+        ----------
+        T : float or array-like
+            Temperature at the reference surface of each state.
+        dTdz : float or array-like, optional
+            Temperature gradient through the thickness of each state,
+            broadcast with ``T``.
+
+        Returns
+        -------
+        NT, MT : tuple of arrays
+            The resultants `(N_{xx}, N_{yy}, N_{xy})^T` and `(M_{xx},
+            M_{yy}, M_{xy})^T` with ``shape=T.shape + (3,)``.
+
+        """
+        states = self._states(T, dTdz)
+        return states @ self._NT, states @ self._MT
+
+    def calc_free_strains(self, T, dTdz=0.):
+        r"""Strains and curvatures of the unrestrained laminate
+
+        Parameters
+        ----------
+        T, dTdz : float or array-like
+            See :meth:`.calc_resultants`.
+
+        Returns
+        -------
+        strains : array
+            The mid-surface strains `(\epsilon_{xx}, \epsilon_{yy},
+            \gamma_{xy})` followed by the curvatures `(\kappa_{xx},
+            \kappa_{yy}, \kappa_{xy})`, with ``shape=T.shape + (6,)``.
+
+        """
+        return self._states(T, dTdz) @ self._strains
+
+    def calc_ply_stresses(self, T, dTdz=0., position='mid'):
+        r"""Residual ply stresses of the unrestrained laminate
+
+        These are the curing residual stresses when ``tref`` is the stress
+        free temperature of the cure.
+
+        Parameters
+        ----------
+        T, dTdz : float or array-like
+            See :meth:`.calc_resultants`.
+        position : str, optional
+            Where the stresses are evaluated through the thickness of each
+            ply, ``'bottom'``, ``'mid'`` or ``'top'``.
+
+        Returns
+        -------
+        stresses : array
+            The stresses `(\sigma_{11}, \sigma_{22}, \tau_{12})` in the
+            material coordinates of each ply, with ``shape=T.shape +
+            (n_plies, 3)``.
+
+        """
+        if position not in _POSITIONS:
+            raise ValueError('position must be one of %s'
+                             % ', '.join(_POSITIONS))
+        return np.einsum('...k,kpi->...pi', self._states(T, dTdz),
+                         self._ply_stresses[position])
@@ -98,8 +98,208 @@ def read_laminaprop(laminaprop, rho=0):
     return matlam
 
 
+# inputs and stages on which each stage of LazyLaminate depends
+_LAZY_DEPENDS = dict(
+    thickness=('plies',),
+    mass=('plies', 'offset', 'thickness'),
+    constitutive=('plies', 'offset'),
+    equivalent=('constitutive', 'thickness'),
+    scf=('plies', 'offset', 'thickness'),
+    )
+
+
+def _lazy_dependents(name):
+    dependents = set()
+    for stage, depends in _LAZY_DEPENDS.items():
+        if name in depends:
+            dependents.add(stage)
+            dependents |= _lazy_dependents(stage)
+    return frozenset(dependents)
+
+
+_LAZY_DEPENDENTS = {name: _lazy_dependents(name)
+                    for name in ('plies', 'offset') + tuple(_LAZY_DEPENDS)}
+
+_LAZY_ATTRIBUTES = dict(
+    thickness=('h',),
+    mass=('intrho', 'intrhoz', 'intrhoz2'),
+    constitutive=tuple(m + ij for m in 'ABDEFGH'
+                       for ij in ('11', '12', '16', '22', '26', '66'))
+                 + tuple(m + ij for m in 'ABDEF' for ij in ('44', '45', '55'))
+                 + ('A', 'B', 'D', 'E', 'F', 'H', 'Atrans', 'Dtrans', 'Ftrans',
+                    'ABD'),
+    equivalent=('e1', 'e2', 'g12', 'nu12', 'nu21'),
+    scf=('scf_k13', 'scf_k23'),
+    )
+
+
+class LazyLaminate(Laminate):
+    r"""Laminate computing its derived quantities on first access
+
+    Same as :class:`.Laminate`, but the total thickness ``h``, the mass
+    integrals ``intrho``, ``intrhoz`` and ``intrhoz2``, the constitutive
+    terms (``A11``, ..., ``ABD``), the equivalent properties (``e1``, ...)
+    and the shear correction factors are computed when first accessed, and
+    memoized. Assigning ``plies`` or ``offset`` invalidates only the
+    quantities that depend on them, for instance a new ``offset`` keeps
+    ``h``, and assigning a derived attribute invalidates the quantities
+    computed from it.
+
+    The plies are not observed, such that :meth:`.invalidate` must be
+    called after modifying the ``plies`` list or the plies in place.
+
+    Parameters
+    ----------
+    calc_scf : bool, optional
+        If False, the shear correction factors keep the default value of
+        5/6, see :func:`.laminated_plate`.
+
+    """
+    def __init__(self, calc_scf=True):
+        Laminate.__init__(self)
+        self._calc_scf = calc_scf
+        self._valid = set()
+
+    def _require(self, stage):
+        if stage in self._valid:
+            return
+        for name in _LAZY_DEPENDS[stage]:
+            if name in _LAZY_DEPENDS:
+                self._require(name)
+        if stage == 'thickness':
+            Laminate.h.__set__(self, sum(ply.h for ply in self.plies))
+        elif stage == 'mass':
+            intrho = intrhoz = intrhoz2 = 0.
+            zbot = -self.h/2. + self.offset
+            for ply in self.plies:
+                ztop = zbot + ply.h
+                rho = ply.matlamina.rho
+                intrho += rho*(ztop - zbot)
+                intrhoz += rho*(ztop**2 - zbot**2)/2.
+                intrhoz2 += rho*(ztop**3 - zbot**3)/3.
+                zbot = ztop
+            Laminate.intrho.__set__(self, intrho)
+            Laminate.intrhoz.__set__(self, intrhoz)
+            Laminate.intrhoz2.__set__(self, intrhoz2)
+        elif stage == 'constitutive':
+            Laminate.calc_constitutive_matrix(self)
+            self._valid.update(('thickness', 'mass'))
+        elif stage == 'equivalent':
+            Laminate.calc_equivalent_properties(self)
+        elif stage == 'scf':
+            if self._calc_scf:
+                Laminate.calc_scf(self)
+            else:
+                Laminate.scf_k13.__set__(self, 5/6.)
+                Laminate.scf_k23.__set__(self, 5/6.)
+        self._valid.add(stage)
+
+    def _modified(self, name):
+        self._valid.difference_update(_LAZY_DEPENDENTS[name])
+
+    def _computed(self, *stages):
+        for stage in stages:
+            self._modified(stage)
+        self._valid.update(stages)
+
+    def invalidate(self):
+        r"""Discard all the memoized quantities"""
+        self._valid.clear()
+
+    def calc_constitutive_matrix(self):
+        Laminate.calc_constitutive_matrix(self)
+        self._computed('thickness', 'mass', 'constitutive')
+
+    def _require_constitutive(self):
+        self._require('constitutive')
+
+    def calc_equivalent_properties(self):
+        self._require('constitutive')
+        self._require('thickness')
+        Laminate.calc_equivalent_properties(self)
+        self._computed('equivalent')
+
+    def calc_scf(self):
+        self._require('thickness')
+        Laminate.calc_scf(self)
+        self._computed('scf')
+
+    def get_ABD_into(self, ABD, Atrans=None):
+        self._require('constitutive')
+        Laminate.get_ABD_into(self, ABD, Atrans)
+
+    def make_balanced(self):
+        self._require('constitutive')
+        Laminate.make_balanced(self)
+        self._modified('constitutive')
+
+    def make_orthotropic(self):
+        self._require('constitutive')
+        Laminate.make_orthotropic(self)
+        self._modified('constitutive')
+
+    def make_symmetric(self):
+        self._require('constitutive')
+        Laminate.make_symmetric(self)
+        self._modified('constitutive')
+
+    def make_smeared(self):
+        self._require('constitutive')
+        Laminate.make_smeared(self)
+        self._modified('constitutive')
+
+    def shifted(self, offset):
+        self._require('constitutive')
+        self._require('scf')
+        return Laminate.shifted(self, offset)
+
+    def shifted_ABD(self, offsets):
+        self._require('constitutive')
+        return Laminate.shifted_ABD(self, offsets)
+
+    def insert_ply(self, index, ply):
+        # NOTE the constitutive terms and the equivalent properties are
+        #      updated incrementally
+        self._require('constitutive')
+        Laminate.insert_ply(self, index, ply)
+        self._valid.discard('scf')
+
+    def drop_ply(self, index):
+        self._require('constitutive')
+        Laminate.drop_ply(self, index)
+        self._valid.discard('scf')
+
+
+def _lazy_input(name):
+    base = getattr(Laminate, name)
+    def fset(self, value):
+        base.__set__(self, value)
+        self._modified(name)
+    return property(base.__get__, fset, doc=base.__doc__)
+
+
+def _lazy_attribute(name, stage):
+    base = getattr(Laminate, name)
+    def fget(self):
+        self._require(stage)
+        return base.__get__(self)
+    def fset(self, value):
+        self._require(stage)
+        base.__set__(self, value)
+        self._modified(stage)
+    return property(fget, fset, doc=base.__doc__)
+
+
+for _name in ('plies', 'offset'):
+    setattr(LazyLaminate, _name, _lazy_input(_name))
+for _stage, _names in _LAZY_ATTRIBUTES.items():
+    for _name in _names:
+        setattr(LazyLaminate, _name, _lazy_attribute(_name, _stage))
+del _name, _names, _stage
+
+
 def laminated_plate(stack, plyt=None, laminaprop=None, rho=0., plyts=None,
-        laminaprops=None, rhos=None, offset=0., calc_scf=True):
+        laminaprops=None, rhos=None, offset=0., calc_scf=True, lazy=False):
     r"""Read a laminate stacking sequence data.
 
     :class:`.Laminate` object is returned based on the inputs given.
@@ -127,6 +327,10 @@ def laminated_plate(stack, plyt=None, laminaprop=None, rho=0., plyts=None,
     calc_scf : bool, optional
         If True, use :func:`.Laminate.calc_scf` to compute shear correction
         factors, otherwise the default value of 5/6 is used
+    lazy : bool, optional
+        If True, a :class:`.LazyLaminate` is returned, whose constitutive
+        terms, equivalent properties and shear correction factors are only
+        computed when accessed.
 
     Notes
     -----
@@ -142,7 +346,10 @@ def laminated_plate(stack, plyt=None, laminaprop=None, rho=0., plyts=None,
         laminaprop = (E, nu)
 
     """
-    lam = Laminate()
+    if lazy:
+        lam = LazyLaminate(calc_scf=calc_scf)
+    else:
+        lam = Laminate()
     lam.offset = offset
     lam.stack = list(stack)
 
@@ -162,18 +369,19 @@ def laminated_plate(stack, plyt=None, laminaprop=None, rho=0., plyts=None,
         rhos = [rho for i in stack]
 
     plies = []
-    lam.h = 0.
     for plyt, laminaprop, thetadeg, rho in zip(plyts, laminaprops, stack, rhos):
         laminaprop = laminaprop
         ply = Lamina()
         ply.thetadeg = float(thetadeg)
         ply.h = plyt
-        lam.h += ply.h
         ply.matlamina = read_laminaprop(laminaprop, rho)
         ply.rebuild()
         plies.append(ply)
     lam.plies = plies
+    if lazy:
+        return lam
 
+    # NOTE calc_constitutive_matrix() also computes the total thickness h
     lam.calc_constitutive_matrix()
     lam.calc_equivalent_properties()
     if calc_scf:
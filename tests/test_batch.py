@@ -0,0 +1,106 @@
+import sys
+sys.path.append('..')
+import os
+import tempfile
+
+import numpy as np
+
+from composites import laminated_plate
+from composites.records import ABD_from_records, _LP_NAMES
+from composites.batch import (evaluate_stacks, run_batch, iter_stack_chunks,
+                              read_materials, result_dtype)
+from composites.__main__ import main
+
+
+materials = np.array([[142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9, 1600.],
+                      [71e9, 71e9, 0.33, 26.7e9, 26.7e9, 26.7e9, 2700.]])
+
+
+def get_rows(num, num_plies=6, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.hstack((rng.choice([0., 45., -45., 90.], (num, num_plies)),
+                      rng.uniform(0.1e-3, 0.2e-3, (num, num_plies)),
+                      rng.integers(0, 2, (num, 1)),
+                      rng.uniform(-1e-3, 1e-3, (num, 1))))
+
+
+def test_evaluate_stacks():
+    rows = get_rows(8)
+    results = evaluate_stacks(rows, materials)
+    assert results.dtype == result_dtype()
+    ABD = ABD_from_records(results)
+    for row, result, ABDi in zip(rows, results, ABD):
+        mat = materials[int(row[12])]
+        lam = laminated_plate(row[:6], plyts=row[6:12],
+                              laminaprop=tuple(mat[:6]), rho=mat[6],
+                              offset=row[13])
+        assert np.allclose(ABDi, lam.ABD, atol=1e-10*lam.A11)
+        lp = lam.calc_lamination_parameters()
+        assert np.allclose(result['lp'],
+                           [getattr(lp, name) for name in _LP_NAMES])
+        for name in ['h', 'offset', 'intrho', 'intrhoz', 'intrhoz2', 'e1',
+                     'e2', 'g12', 'nu12', 'nu21']:
+            assert np.isclose(result[name], getattr(lam, name), atol=1e-14)
+    rows[0, 12] = 2
+    try:
+        evaluate_stacks(rows, materials)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+
+
+def test_run_batch():
+    rows = get_rows(250)
+    ref = evaluate_stacks(rows, materials)
+    with tempfile.TemporaryDirectory() as tmp:
+        npy_input = os.path.join(tmp, 'stacks.npy')
+        csv_input = os.path.join(tmp, 'stacks.csv')
+        materials_path = os.path.join(tmp, 'materials.csv')
+        np.save(npy_input, rows)
+        np.savetxt(csv_input, rows, delimiter=',', fmt='%.17g',
+                   header=','.join(['col%d' % i for i in range(14)]),
+                   comments='')
+        np.savetxt(materials_path, materials, delimiter=',',
+                   header='e1,e2,nu12,g12,g13,g23,rho', comments='')
+        assert np.all(read_materials(materials_path)
+                      == read_materials(materials))
+        chunks = list(iter_stack_chunks(csv_input, chunk_size=100))
+        assert [chunk.shape[0] for chunk in chunks] == [100, 100, 50]
+        assert np.all(np.vstack(chunks) == rows)
+        try:
+            run_batch(npy_input, os.path.join(tmp, 'results.npy'), materials,
+                      chunk_size=0)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('ValueError expected')
+
+        output = os.path.join(tmp, 'results.npy')
+        assert run_batch(npy_input, output, materials, chunk_size=64) == 250
+        results = np.load(output)
+        assert np.all(results == ref)
+        output = os.path.join(tmp, 'results2.npy')
+        assert run_batch(csv_input, output, materials_path, chunk_size=64,
+                         workers=2) == 250
+        assert np.all(np.load(output) == ref)
+
+        output = os.path.join(tmp, 'results.csv')
+        assert main(['batch', csv_input, output, '--materials',
+                     materials_path, '--chunk-size', '70',
+                     '--float32']) == 0
+        with open(output) as f:
+            header = f.readline().strip().split(',')
+        assert header[0] == 'A11' and header[-1] == 'nu21'
+        assert len(set(header)) == len(header)
+        values = np.loadtxt(output, delimiter=',', skiprows=1)
+        assert values.shape == (250, len(header))
+        assert np.allclose(values[:, header.index('D66')],
+                           ref['ABD'][:, -1], rtol=1e-6)
+        assert np.allclose(values[:, header.index('e1')], ref['e1'],
+                           rtol=1e-6)
+
+
+if __name__ == '__main__':
+    test_evaluate_stacks()
+    test_run_batch()
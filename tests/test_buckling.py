@@ -0,0 +1,60 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from composites.kassapoglou import calc_Nxx_crit
+from composites.buckling import calc_buckling_factors, ritz_tables
+
+
+def test_uniaxial():
+    D11, D12, D22, D66 = 0.66, 0.47, 0.66, 0.49
+    b = 0.254
+    for AR in [0.7, 1., 2., 3.3]:
+        a = AR*b
+        factors = calc_buckling_factors(a, b, [D11, D12, 0, D22, 0, D66],
+                                        [[1, 0, 0], [0, 1, 0]], M=8, N=8)
+        assert factors.shape == (1, 2)
+        assert np.isclose(factors[0, 0],
+                          calc_Nxx_crit(a, b, None, 1, D11, D12, D22, D66))
+        assert np.isclose(factors[0, 1],
+                          calc_Nxx_crit(b, a, None, 1, D22, D12, D11, D66))
+
+
+def test_shear():
+    # isotropic square plate, k = 9.34 from Timoshenko and Gere
+    D = 1.
+    nu = 0.3
+    a = b = 1.
+    factors = calc_buckling_factors(a, b, [D, nu*D, 0, D, 0, (1-nu)/2*D],
+                                    [[0, 0, 1], [0, 0, -1]], M=14, N=14)
+    assert np.allclose(factors*b**2/(np.pi**2*D), 9.34, rtol=2e-3)
+
+    # with D16 and D26 the sign of the shear load matters, and reversing the
+    # signs of D16, D26 and Nxy gives the same problem
+    D = np.array([[0.66, 0.47, 0.2, 0.66, 0.2, 0.49],
+                  [0.66, 0.47, -0.2, 0.66, -0.2, 0.49]])
+    loads = [[0, 0, 100], [0, 0, -100], [50, 20, 100], [50, 20, -100]]
+    factors = calc_buckling_factors(0.508, 0.254, D, loads, M=6, N=6)
+    assert factors.shape == (2, 4)
+    assert factors[0, 0] < factors[0, 1]
+    assert np.allclose(factors[0], factors[1, [1, 0, 3, 2]])
+
+    # tension only does not buckle
+    factors = calc_buckling_factors(0.508, 0.254, D, [[-100, -100, 0]])
+    assert np.all(np.isinf(factors))
+
+
+def test_ritz_tables():
+    K, KG = ritz_tables(4, 3, 1.5)
+    assert K.shape == (6, 12, 12)
+    assert KG.shape == (3, 12, 12)
+    assert np.allclose(K, K.transpose(0, 2, 1))
+    assert np.allclose(KG, KG.transpose(0, 2, 1))
+    assert ritz_tables(4, 3, 1.5)[0] is K
+
+
+if __name__ == '__main__':
+    test_uniaxial()
+    test_shear()
+    test_ritz_tables()
@@ -0,0 +1,158 @@
+import sys
+sys.path.append('..')
+import io
+import os
+import tempfile
+
+import numpy as np
+
+from composites.utils import laminated_plate, isotropic_plate
+from composites.cards import (write_nastran_pshell, write_nastran_pcomp,
+                              write_abaqus_general_sections,
+                              write_abaqus_composite_sections)
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+plyt = 0.125e-3
+
+
+def get_laminates():
+    return [
+        laminated_plate([0, 45, -45, 90, 90, -45, 45, 0], plyt=plyt,
+                        laminaprop=laminaprop, rho=1600.),
+        laminated_plate([0, 90, 30], plyt=plyt, laminaprop=laminaprop,
+                        rho=1600., offset=1e-4),
+        laminated_plate([0, 45, -45, 90, 90, -45, 45, 0], plyt=plyt,
+                        laminaprop=laminaprop, rho=1600.),
+        isotropic_plate(2e-3, 71e9, 0.33),
+        ]
+
+
+def read_large_field(text):
+    cards = []
+    for line in text.splitlines():
+        fields = [line[i:i + 16].strip() for i in range(8, len(line), 16)]
+        fields = [float(field) if field else None for field in fields]
+        fields += [None]*(4 - len(fields))
+        if line.startswith('*'):
+            cards[-1][1].extend(fields)
+        else:
+            cards.append((line[:8].rstrip('* '), fields))
+    return cards
+
+
+def test_nastran_pshell():
+    lams = get_laminates()
+    ABD = np.array([lam.ABD for lam in lams])
+    Atrans = np.array([lam.Atrans for lam in lams])
+    h = np.array([lam.h for lam in lams])
+    offset = np.array([lam.offset for lam in lams])
+    intrho = np.array([lam.intrho for lam in lams])
+    scf = np.array([[lam.scf_k13, lam.scf_k23] for lam in lams])
+    f = io.StringIO()
+    pids = write_nastran_pshell(f, ABD, h, Atrans, offset=offset,
+                                intrho=intrho, scf=scf, pid_start=10,
+                                mid_start=100)
+    assert np.all(pids == [10, 11, 10, 12])
+    cards = read_large_field(f.getvalue())
+    pshells = {int(fields[0]): fields for name, fields in cards
+               if name == 'PSHELL'}
+    mat2s = {int(fields[0]): fields for name, fields in cards
+             if name == 'MAT2'}
+    assert sorted(pshells) == [10, 11, 12]
+    # only the unsymmetric laminate has a coupling MAT2
+    assert len(mat2s) == 3*3 + 1
+
+    def G(mid):
+        g = mat2s[mid][1:7]
+        return np.array([[g[0], g[1], g[2]], [g[1], g[3], g[4]],
+                         [g[2], g[4], g[5]]])
+
+    for i, lam in enumerate(lams):
+        fields = pshells[pids[i]]
+        pid, mid1, t, mid2, ratio, mid3, ts, nsm, z1, z2, mid4 = fields[:11]
+        assert t == lam.h and ratio == 1. and ts == 1.
+        assert np.isclose(z1, -lam.h/2 + lam.offset)
+        assert np.isclose(z2, lam.h/2 + lam.offset)
+        rebuilt = np.zeros((6, 6))
+        rebuilt[:3, :3] = t*G(mid1)
+        rebuilt[3:, 3:] = t**3/12*G(mid2)
+        if mid4 is not None:
+            rebuilt[:3, 3:] = rebuilt[3:, :3] = t**2*G(mid4)
+        assert np.allclose(rebuilt, lam.ABD, rtol=1e-8, atol=1e-8*lam.A11)
+        assert np.isclose(mat2s[mid1][7]*t, lam.intrho)
+        shear = mat2s[mid3]
+        assert np.isclose(shear[1]*t, lam.scf_k13*lam.A55)
+        assert np.isclose(shear[4]*t, lam.scf_k23*lam.A44)
+
+    # chunked formatting gives the same output
+    f2 = io.StringIO()
+    write_nastran_pshell(f2, ABD, h, Atrans, offset=offset, intrho=intrho,
+                         scf=scf, pid_start=10, mid_start=100, chunk_size=1)
+    assert f2.getvalue() == f.getvalue()
+
+
+def test_nastran_pcomp():
+    lams = get_laminates()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'pcomp.bdf')
+        pids = write_nastran_pcomp(path, lams, pid_start=5)
+        with open(path) as f:
+            cards = read_large_field(f.read())
+    assert np.all(pids == [5, 6, 5, 7])
+    mat8s = [fields for name, fields in cards if name == 'MAT8']
+    pcomps = {int(fields[0]): fields for name, fields in cards
+              if name == 'PCOMP'}
+    assert len(mat8s) == 2
+    assert np.allclose(mat8s[0][1:8], [142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9,
+                                       5.1e9, 1600.])
+    for i, lam in enumerate(lams):
+        fields = pcomps[pids[i]]
+        assert np.isclose(fields[1], -lam.h/2 + lam.offset)
+        plies = np.array(fields[8:], dtype=float).reshape(-1, 4)[:, :3]
+        assert plies.shape[0] == len(lam.plies)
+        assert np.allclose(plies[:, 1], [ply.h for ply in lam.plies])
+        assert np.allclose(plies[:, 2], [ply.thetadeg for ply in lam.plies])
+        mat = mat8s[int(plies[0, 0]) - 1]
+        assert np.isclose(mat[1], lam.plies[0].matlamina.e1)
+
+
+def test_abaqus():
+    lams = get_laminates()
+    ABD = np.array([lam.ABD for lam in lams])
+    Atrans = np.array([lam.Atrans for lam in lams])
+    f = io.StringIO()
+    ids = write_abaqus_general_sections(f, ABD, Atrans, prefix='P')
+    assert np.all(ids == [1, 2, 1, 3])
+    lines = f.getvalue().splitlines()
+    assert lines.count('*TRANSVERSE SHEAR STIFFNESS') == 3
+    for i in range(3):
+        assert lines[6*i] == '*SHELL GENERAL SECTION, ELSET=P%d' % (i + 1)
+        terms = [float(v) for v in ', '.join(lines[6*i + 1:6*i + 4]
+                                             ).split(',')]
+        upper = np.zeros((6, 6))
+        k = 0
+        for col in range(6):
+            for row in range(col + 1):
+                upper[row, col] = upper[col, row] = terms[k]
+                k += 1
+        lam = lams[[0, 1, 3][i]]
+        assert np.allclose(upper, lam.ABD, rtol=1e-8, atol=1e-8*lam.A11)
+        k13, k23, k12 = [float(v) for v in lines[6*i + 5].split(',')]
+        assert np.isclose(k13, 5/6.*lam.A55)
+
+    f = io.StringIO()
+    ids = write_abaqus_composite_sections(f, lams)
+    assert np.all(ids == [1, 2, 1, 3])
+    text = f.getvalue()
+    assert text.count('*MATERIAL') == 2
+    assert text.count('*DENSITY') == 1
+    assert ('*SHELL SECTION, ELSET=LAMINATE2, COMPOSITE, OFFSET=%.9g\n'
+            % (-1e-4/(3*plyt))) in text
+    assert '0.000125, 3, MATERIAL1, 30\n' in text
+
+
+if __name__ == '__main__':
+    test_nastran_pshell()
+    test_nastran_pcomp()
+    test_abaqus()
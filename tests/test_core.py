@@ -9,7 +9,11 @@ from composites.core import (laminate_from_LaminationParameters,
                              laminate_from_lamination_parameters,
                              make_balanced_LP, make_orthotropic_LP,
                              make_symmetric_LP, Lamina, GradABD,
-                             LaminationParameters)
+                             LaminationParameters, calc_scf_batch,
+                             taper_ABD, calc_ply_grad_batch, calc_ABD_batch,
+                             calc_ABD_batch_into, calc_LP_batch,
+                             calc_ABD_from_LP_batch,
+                             calc_ABD_batch_laminaprops, calc_ABD_LP_batch)
 
 
 def test_lampar_tri_axial():
@@ -282,3 +286,277 @@ def test_laminate_LP_gradients():
     gradABD = GradABD()
     gradABD.calc_LP_grad(thickness, matlamina, lp)
     print(gradABD.gradAij)
+
+
+def test_calc_scf_batch():
+    lamprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+    matlamina = read_laminaprop(lamprop)
+    rng = np.random.default_rng(1)
+    thetadegs = rng.choice([0., 45., -45., 90., 30.], size=(20, 12))
+    plyts = rng.uniform(0.1e-3, 0.2e-3, 12)
+    for offset in [0., 0.5e-3]:
+        k13, k23 = calc_scf_batch(thetadegs, plyts, matlamina, offset)
+        assert k13.shape == k23.shape == (20,)
+        for i, stack in enumerate(thetadegs):
+            lam = laminated_plate(stack, plyts=plyts, laminaprop=lamprop,
+                                  offset=offset)
+            assert np.isclose(k13[i], lam.scf_k13)
+            assert np.isclose(k23[i], lam.scf_k23)
+    try:
+        calc_scf_batch(thetadegs, plyts[:-1], matlamina)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+
+
+def test_shifted():
+    lamprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 4.1e9, 3.1e9)
+    stack = [0, 45, -45, 90, 30, 60, -10]
+    plyt = 0.000125
+    rho = 1600.
+    lam = laminated_plate(stack, plyt, lamprop, rho=rho, offset=0.2e-3)
+    offsets = np.array([0., 1.e-3, -0.7e-3])
+    ABDs = lam.shifted_ABD(offsets)
+    assert ABDs.shape == (3, 6, 6)
+    for offset, ABD in zip(offsets, ABDs):
+        ref = laminated_plate(stack, plyt, lamprop, rho=rho, offset=offset)
+        shifted = lam.shifted(offset)
+        assert shifted.offset == offset
+        for name in ['ABD', 'A', 'B', 'D', 'E', 'F', 'H', 'Atrans', 'Dtrans',
+                     'Ftrans']:
+            value = getattr(ref, name)
+            assert np.allclose(getattr(shifted, name), value,
+                               atol=1e-9*abs(value).max())
+        for name in ['G11', 'G16', 'B44', 'B45', 'E44', 'E55']:
+            assert np.isclose(getattr(shifted, name), getattr(ref, name))
+        for name in ['intrho', 'intrhoz', 'intrhoz2']:
+            assert np.isclose(getattr(shifted, name), getattr(ref, name),
+                              atol=1e-9*ref.intrho*lam.h**2)
+        for name in ['e1', 'e2', 'g12', 'nu12', 'scf_k13', 'scf_k23']:
+            assert np.isclose(getattr(shifted, name), getattr(ref, name))
+        assert np.allclose(ABD, ref.ABD, atol=1e-9*abs(ref.ABD).max())
+
+
+def _assert_ABD_close(ABD, ref):
+    for i, j in [(0, 0), (0, 3), (3, 3)]:
+        block = ref[i:i+3, j:j+3]
+        assert np.allclose(ABD[i:i+3, j:j+3], block,
+                           atol=1e-9*abs(block).max())
+
+
+def test_insert_drop_ply():
+    lamprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 4.1e9, 3.1e9)
+    stack = [45, -45, 0, 90, 0, 30, -30, 90, 0, 45, -45, 60]
+    plyt = 0.000125
+    rho = 1500.
+    for offset in [0., 0.4e-3]:
+        for k in range(len(stack)):
+            lam = laminated_plate(stack, plyt, lamprop, rho=rho, offset=offset)
+            lam.drop_ply(k)
+            new_stack = stack[:k] + stack[k+1:]
+            ref = laminated_plate(new_stack, plyt, lamprop, rho=rho,
+                                  offset=offset)
+            assert lam.stack == new_stack
+            assert np.isclose(lam.h, ref.h)
+            _assert_ABD_close(lam.ABD, ref.ABD)
+            assert np.allclose(lam.H, ref.H, atol=1e-9*abs(ref.H).max())
+            assert np.allclose(lam.Ftrans, ref.Ftrans)
+            assert np.isclose(lam.intrhoz2, ref.intrhoz2)
+            assert np.isclose(lam.e1, ref.e1)
+        for k in range(len(stack) + 1):
+            lam = laminated_plate(stack, plyt, lamprop, rho=rho, offset=offset)
+            ply = Lamina()
+            ply.thetadeg = 22.
+            ply.h = 2*plyt
+            ply.matlamina = read_laminaprop(lamprop, 1200.)
+            lam.insert_ply(k, ply)
+            new_stack = stack[:k] + [22.] + stack[k:]
+            ref = laminated_plate(new_stack,
+                    plyts=[plyt]*k + [2*plyt] + [plyt]*(len(stack) - k),
+                    laminaprop=lamprop,
+                    rhos=[rho]*k + [1200.] + [rho]*(len(stack) - k),
+                    offset=offset)
+            assert lam.stack == new_stack
+            assert np.isclose(lam.h, ref.h)
+            _assert_ABD_close(lam.ABD, ref.ABD)
+            assert np.allclose(lam.H, ref.H, atol=1e-9*abs(ref.H).max())
+            assert np.allclose(lam.Ftrans, ref.Ftrans)
+            assert np.isclose(lam.intrhoz2, ref.intrhoz2)
+    try:
+        lam.drop_ply(len(lam.plies))
+    except IndexError:
+        pass
+    else:
+        raise AssertionError('IndexError expected')
+
+
+def test_taper_ABD():
+    lamprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 4.1e9, 3.1e9)
+    stack = [45, -45, 0, 90, 0, 30, -30, 90, 0, 45, -45, 60]
+    plyt = 0.000125
+    drops = [5, 0, 11, 3, 7, 8]
+    for offset in [0., 0.4e-3]:
+        lam = laminated_plate(stack, plyt, lamprop, offset=offset)
+        ABD = taper_ABD(lam, drops)
+        assert ABD.shape == (len(drops) + 1, 6, 6)
+        remaining = list(range(len(stack)))
+        for station in range(len(drops) + 1):
+            ref = laminated_plate([stack[i] for i in remaining], plyt,
+                                  lamprop, offset=offset)
+            _assert_ABD_close(ABD[station], ref.ABD)
+            if station < len(drops):
+                remaining.remove(drops[station])
+    try:
+        taper_ABD(lam, [1, 1])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+
+
+def test_calc_ply_grad():
+    lamprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 4.1e9, 3.1e9)
+    stack = [45, -45, 0, 90, 30, -60, 15]
+    plyts = [0.125e-3, 0.2e-3, 0.125e-3, 0.15e-3, 0.1e-3, 0.125e-3, 0.3e-3]
+    offset = 0.3e-3
+    def fd(stack, plyts, k, dtheta, dh):
+        lams = []
+        for sign in [1, -1]:
+            s = list(stack)
+            t = list(plyts)
+            s[k] += sign*dtheta
+            t[k] += sign*dh
+            lams.append(laminated_plate(s, plyts=t, laminaprop=lamprop,
+                                        offset=offset))
+        delta = 2*(dtheta + dh)
+        return ((lams[0].ABD - lams[1].ABD)/delta,
+                (lams[0].Atrans - lams[1].Atrans)/delta)
+    lam = laminated_plate(stack, plyts=plyts, laminaprop=lamprop,
+                          offset=offset)
+    dABDdt, dAtransdt, dABDdh, dAtransdh = lam.calc_ply_grad()
+    assert dABDdt.shape == dABDdh.shape == (len(stack), 6, 6)
+    assert dAtransdt.shape == dAtransdh.shape == (len(stack), 2, 2)
+    for k in range(len(stack)):
+        ABD, Atrans = fd(stack, plyts, k, 1e-4, 0.)
+        assert np.allclose(dABDdt[k], ABD, rtol=1e-6,
+                           atol=1e-8*abs(ABD).max())
+        assert np.allclose(dAtransdt[k], Atrans, rtol=1e-6,
+                           atol=1e-8*abs(Atrans).max())
+        ABD, Atrans = fd(stack, plyts, k, 0., 1e-9)
+        assert np.allclose(dABDdh[k], ABD, rtol=1e-6,
+                           atol=1e-8*abs(ABD).max())
+        assert np.allclose(dAtransdh[k], Atrans, rtol=1e-6,
+                           atol=1e-8*abs(Atrans).max())
+
+    matlamina = read_laminaprop(lamprop)
+    thetadegs = np.array([stack, stack[::-1]], dtype=float)
+    grads = calc_ply_grad_batch(thetadegs, np.array(plyts), matlamina,
+                                offset)
+    assert grads[0].shape == (2, len(stack), 6, 6)
+    assert grads[1].shape == (2, len(stack), 2, 2)
+    for g, ref in zip(grads, lam.calc_ply_grad()):
+        assert np.allclose(g[0], ref)
+
+
+def test_ABD_into():
+    lamprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 4.1e9, 3.1e9)
+    matlamina = read_laminaprop(lamprop)
+    rng = np.random.default_rng(2)
+    thetadegs = rng.choice([0., 45., -45., 90., 30.], size=(20, 9))
+    plyts = rng.uniform(0.1e-3, 0.2e-3, 9)
+    offset = 0.2e-3
+    ABD, Atrans = calc_ABD_batch(thetadegs, plyts, matlamina, offset)
+    # strided outputs, as for integration points of a larger array
+    out = np.zeros((40, 8, 8))
+    calc_ABD_batch_into(thetadegs, plyts, matlamina, out[::2, 1:7, 2:8],
+                        out[1::2, :2, :2], offset)
+    for i, stack in enumerate(thetadegs):
+        lam = laminated_plate(stack, plyts=plyts, laminaprop=lamprop,
+                              offset=offset)
+        _assert_ABD_close(ABD[i], lam.ABD)
+        assert np.allclose(Atrans[i], lam.Atrans)
+        assert np.allclose(out[2*i, 1:7, 2:8], ABD[i])
+        assert np.allclose(out[2*i + 1, :2, :2], Atrans[i])
+        ABDi = np.zeros((6, 12))
+        Atransi = np.zeros((2, 2))
+        lam.get_ABD_into(ABDi[:, ::2], Atransi)
+        assert np.all(ABDi[:, ::2] == lam.ABD)
+        assert np.all(ABDi[:, 1::2] == 0)
+        assert np.all(Atransi == lam.Atrans)
+    try:
+        lam.get_ABD_into(np.zeros((6, 5)))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+    try:
+        calc_ABD_batch_into(thetadegs, plyts, matlamina, np.zeros((19, 6, 6)))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+
+
+def test_LP_batch():
+    lamprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 4.1e9, 3.1e9)
+    matlamina = read_laminaprop(lamprop)
+    offset = 0.3e-3
+    thetadegs = np.array([[0, 45, -45, 90, 30, 0],
+                          [10, 20, 30, 40, 50, 60]], dtype=float)
+    plyts = np.array([1e-3, 1.2e-3, 0.8e-3, 1e-3, 1e-3, 1.5e-3])
+    lps = calc_LP_batch(thetadegs, plyts, offset)
+    assert lps.shape == (2, 14)
+    thickness = np.full(2, plyts.sum())
+    ABD, Atrans = calc_ABD_from_LP_batch(thickness, lps, matlamina)
+    for i, stack in enumerate(thetadegs):
+        lam = laminated_plate(stack, plyts=plyts, laminaprop=lamprop,
+                              offset=offset)
+        lp = lam.calc_lamination_parameters()
+        ref = [lp.xiA1, lp.xiA2, lp.xiA3, lp.xiA4, lp.xiB1, lp.xiB2, lp.xiB3,
+               lp.xiB4, lp.xiD1, lp.xiD2, lp.xiD3, lp.xiD4, lp.xiAtrans1,
+               lp.xiAtrans2]
+        assert np.allclose(lps[i], ref, atol=1e-14)
+        lam2 = laminate_from_LaminationParameters(thickness[i], matlamina, lp)
+        _assert_ABD_close(ABD[i], lam2.ABD)
+        assert np.allclose(Atrans[i], lam2.Atrans)
+    try:
+        calc_ABD_from_LP_batch(thickness[:1], lps, matlamina)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+
+
+def test_ABD_batch_laminaprops():
+    rng = np.random.default_rng(0)
+    nominal = np.array([142.5e9, 8.7e9, 0.28, 5.1e9, 4.1e9, 3.1e9])
+    thetadegs = rng.uniform(-90, 90, (10, 7))
+    plyts = rng.uniform(0.1e-3, 0.2e-3, (10, 7))
+    laminaprops = nominal*rng.uniform(0.9, 1.1, (10, 6))
+    offset = 0.2e-3
+    ABD, Atrans = calc_ABD_batch_laminaprops(thetadegs, plyts, laminaprops,
+                                             offset)
+    offsets = rng.uniform(-1e-3, 1e-3, 10)
+    ABD2, Atrans2, lps = calc_ABD_LP_batch(thetadegs, plyts, laminaprops,
+                                           offsets)
+    for i in range(10):
+        lam = laminated_plate(thetadegs[i], plyts=plyts[i],
+                              laminaprop=tuple(laminaprops[i]), offset=offset)
+        _assert_ABD_close(ABD[i], lam.ABD)
+        assert np.allclose(Atrans[i], lam.Atrans)
+        lam = laminated_plate(thetadegs[i], plyts=plyts[i],
+                              laminaprop=tuple(laminaprops[i]),
+                              offset=offsets[i])
+        _assert_ABD_close(ABD2[i], lam.ABD)
+        assert np.allclose(Atrans2[i], lam.Atrans)
+        lp = lam.calc_lamination_parameters()
+        assert np.allclose(lps[i], [lp.xiA1, lp.xiA2, lp.xiA3, lp.xiA4,
+            lp.xiB1, lp.xiB2, lp.xiB3, lp.xiB4, lp.xiD1, lp.xiD2, lp.xiD3,
+            lp.xiD4, lp.xiAtrans1, lp.xiAtrans2])
+    try:
+        calc_ABD_batch_laminaprops(thetadegs, plyts[:, :6], laminaprops)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
@@ -0,0 +1,79 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from composites.design_rules import (DESIGN_RULES, calc_rule_violations,
+                                     is_feasible_stack)
+
+
+def test_rule_violations():
+    stacks = [
+        # feasible
+        [45, 0, -45, 90, 90, -45, 0, 45],
+        # symmetry: 2 pairs, balance: 45 and 30, contiguity: five 0 plies,
+        # ten percent: -45, disorientation: 30/90, outer: 90
+        [45, 0, 0, 0, 0, 0, 30, 90],
+        # angles modulo 180 degrees
+        [-135, 225, 0, 270, -90, 0, 45, -45],
+        ]
+    violations = calc_rule_violations(stacks)
+    assert violations.shape == (3, len(DESIGN_RULES))
+    assert violations.dtype == np.int64
+    assert np.all(violations[0] == 0)
+    assert np.all(violations[1] == [2, 2, 1, 1, 1, 1])
+    # 90/-90 are the same direction and 0/90 need no balance
+    assert np.all(violations[2] == [1, 2, 0, 0, 3, 0])
+    assert np.all(is_feasible_stack(stacks) == [True, False, False])
+    assert np.all(is_feasible_stack(stacks, rules=('contiguity',
+                  'ten_percent', 'outer_45')) == [True, False, True])
+
+    # parameters of the rules
+    violations = calc_rule_violations([[45, 0, 0, 0, 0, 0, 0, 0, 90, -45]],
+                                      max_contiguous=5, min_fraction=0.2,
+                                      max_disorientation=90.)
+    assert np.all(violations[0] == [2, 0, 2, 3, 0, 0])
+    assert np.all(calc_rule_violations([[30]]) == [[0, 1, 0, 4, 0, 1]])
+
+    try:
+        calc_rule_violations([0, 45, 90])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+    try:
+        is_feasible_stack([[0, 45, 90]], rules=('symmetric',))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+
+
+def test_rule_violations_loop():
+    rng = np.random.default_rng(0)
+    angles = [0., 45., -45., 90., 30., -60.]
+    stacks = rng.choice(angles, (200, 12))
+    violations = calc_rule_violations(stacks)
+    for stack, v in zip(stacks, violations):
+        n = len(stack)
+        assert v[0] == sum(stack[i] != stack[n - 1 - i] for i in range(n//2))
+        balance = 0
+        for angle in (45., 30., 60.):
+            balance += abs(np.sum(stack == angle) - np.sum(stack == -angle))
+        assert v[1] == balance
+        excess = 0
+        run = 1
+        for i in range(1, n):
+            run = run + 1 if stack[i] == stack[i - 1] else 1
+            excess += run > 4
+        assert v[2] == excess
+        assert v[3] == sum(np.sum(stack == d) < 0.1*n
+                           for d in (0., 45., -45., 90.))
+        delta = np.abs(np.diff(stack)) % 180
+        assert v[4] == np.sum(np.minimum(delta, 180 - delta) > 45)
+        assert v[5] == int(abs(stack[0]) != 45) + int(abs(stack[-1]) != 45)
+
+
+if __name__ == '__main__':
+    test_rule_violations()
+    test_rule_violations_loop()
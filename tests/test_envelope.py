@@ -0,0 +1,70 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from composites import laminated_plate
+from composites.buckling import calc_buckling_factors
+from composites.envelope import calc_min_reserve_factors, FAILURE_MODES
+
+
+def _panels():
+    laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+    stacks = [[45, -45, 0, 90]*2, [0, 45, -45, 90, 0], [30, -30, 0, 0, 90]]
+    return np.array([laminated_plate(stack, plyt=0.125e-3,
+                                     laminaprop=laminaprop).ABD
+                     for stack in stacks])
+
+
+def test_calc_min_reserve_factors():
+    ABD = _panels()
+    a = np.array([0.5, 0.5, 0.4])
+    b = 0.25
+    allowables = (4500e-6, 3500e-6, 7000e-6)
+    rng = np.random.default_rng(0)
+    loads = rng.uniform(-2e4, 2e4, (37, 3, 3))
+    rf, load_case, mode = calc_min_reserve_factors(a, b, ABD, loads,
+            allowables=allowables, chunk_size=8)
+    assert rf.shape == load_case.shape == mode.shape == (3,)
+
+    # brute force
+    for p in range(3):
+        D = ABD[p, 3:, 3:][[0, 0, 0, 1, 1, 2], [0, 1, 2, 1, 2, 2]]
+        all_rf = []
+        for load in loads[:, p]:
+            buckling = calc_buckling_factors(a[p], b, D,
+                    [[-load[0], -load[1], load[2]]])[0, 0]
+            strains = np.linalg.solve(ABD[p], np.r_[load, 0, 0, 0])[:3]
+            strain_rf = [allowables[0]/e if e > 0 else -allowables[1]/e
+                         for e in strains[:2]]
+            strain_rf.append(allowables[2]/abs(strains[2]))
+            all_rf.append([buckling] + strain_rf)
+        all_rf = np.array(all_rf)
+        i, j = np.unravel_index(all_rf.argmin(), all_rf.shape)
+        assert np.isclose(rf[p], all_rf[i, j])
+        assert load_case[p] == i
+        assert mode[p] == j
+
+    # streaming chunks from an iterable and a single load case for all panels
+    rf2, load_case2, mode2 = calc_min_reserve_factors(a, b, ABD,
+            (loads[i:i+5] for i in range(0, 37, 5)), allowables=allowables)
+    assert np.allclose(rf2, rf)
+    assert np.all(load_case2 == load_case)
+    rf, load_case, mode = calc_min_reserve_factors(0.5, b, ABD,
+            [[-1e3, 0, 0], [1e3, 0, 0]])
+    assert np.all(load_case == 0)
+    assert all(FAILURE_MODES[m] == 'buckling' for m in mode)
+
+    # null strains are never critical
+    rf, load_case, mode = calc_min_reserve_factors(0.5, b, ABD[:1],
+            [[0., 0., 0.]], allowables=allowables)
+    assert np.all(rf == np.inf)
+    assert np.all(load_case == -1) and np.all(mode == -1)
+    rf, load_case, mode = calc_min_reserve_factors(0.5, b, ABD[:1],
+            [[0., 0., 0.], [0., 0., 1e3]], allowables=allowables)
+    assert 0 < rf[0] < np.inf
+    assert load_case[0] == 1
+
+
+if __name__ == '__main__':
+    test_calc_min_reserve_factors()
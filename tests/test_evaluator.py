@@ -0,0 +1,121 @@
+import sys
+sys.path.append('..')
+import asyncio
+
+import numpy as np
+
+from composites import laminated_plate
+from composites.buckling import calc_buckling_factors
+from composites.records import ABD_from_records
+from composites import evaluator as evaluator_module
+from composites.evaluator import LaminateEvaluator, _evaluate_requests
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+laminaprop2 = (71e9, 0.33)
+plyt = 0.125e-3
+
+
+def get_requests(num):
+    rng = np.random.default_rng(0)
+    requests = []
+    for i in range(num):
+        num_plies = rng.integers(1, 9)
+        request = dict(stack=rng.choice([0., 45., -45., 90.], num_plies),
+                       plyt=plyt*(1 + i % 3),
+                       laminaprop=laminaprop if i % 2 else laminaprop2,
+                       offset=rng.uniform(-1e-4, 1e-4))
+        if i % 4 == 0:
+            request.update(a=0.3 + 0.1*(i % 8 == 0), b=0.2,
+                           load=rng.uniform(0, 1000, 3))
+        requests.append(request)
+    return requests
+
+
+def test_evaluator():
+    requests = get_requests(50)
+
+    async def run():
+        async with LaminateEvaluator(max_batch_size=16,
+                                     max_delay=0.01) as evaluator:
+            results = await asyncio.gather(*(evaluator.evaluate(**request)
+                                             for request in requests))
+        return results, evaluator
+
+    results, evaluator = asyncio.run(run())
+    assert evaluator.num_requests == 50
+    assert evaluator.num_batches == 4
+    for request, result in zip(requests, results):
+        lam = laminated_plate(request['stack'], plyt=request['plyt'],
+                              laminaprop=request['laminaprop'],
+                              offset=request['offset'])
+        ABD = ABD_from_records(result)
+        assert np.allclose(ABD, lam.ABD, atol=1e-10*lam.A11)
+        assert np.isclose(result['e1'], lam.e1)
+        if 'load' in request:
+            D = [[lam.D11, lam.D12, lam.D16, lam.D22, lam.D26, lam.D66]]
+            ref = calc_buckling_factors(request['a'], request['b'], D,
+                                        [request['load']])[0, 0]
+            assert np.isclose(result['buckling'], ref)
+        else:
+            assert np.isnan(result['buckling'])
+
+
+def test_evaluator_errors():
+
+    async def run():
+        evaluator = LaminateEvaluator(max_delay=0.001)
+        good = evaluator.evaluate([0, 90], plyt=plyt, laminaprop=laminaprop)
+        bad = evaluator.evaluate([0, 90], plyts=[plyt],
+                                 laminaprop=laminaprop)
+        negative = evaluator.evaluate([0, 90], plyts=[plyt, -plyt],
+                                      laminaprop=laminaprop)
+        results = await asyncio.gather(good, bad, negative,
+                                       return_exceptions=True)
+        await evaluator.close()
+        return results
+
+    good, bad, negative = asyncio.run(run())
+    assert isinstance(bad, ValueError)
+    assert isinstance(negative, ValueError)
+    lam = laminated_plate([0, 90], plyt=plyt, laminaprop=laminaprop)
+    assert np.allclose(ABD_from_records(good), lam.ABD, atol=1e-10*lam.A11)
+
+
+def test_evaluator_failing_request():
+    # a request failing during the evaluation only fails itself
+    def evaluate_requests(requests, M, N):
+        if any(request['offset'] == 1. for request in requests):
+            raise RuntimeError('failing request')
+        return _evaluate_requests(requests, M, N)
+
+    async def run():
+        async with LaminateEvaluator(max_delay=0.01) as evaluator:
+            results = await asyncio.gather(
+                    evaluator.evaluate([0, 90], plyt=plyt,
+                                       laminaprop=laminaprop),
+                    evaluator.evaluate([0, 90], plyt=plyt,
+                                       laminaprop=laminaprop, offset=1.),
+                    evaluator.evaluate([45, -45], plyt=plyt,
+                                       laminaprop=laminaprop),
+                    return_exceptions=True)
+        return results, evaluator
+
+    evaluator_module._evaluate_requests = evaluate_requests
+    try:
+        results, evaluator = asyncio.run(run())
+    finally:
+        evaluator_module._evaluate_requests = _evaluate_requests
+    assert isinstance(results[1], RuntimeError)
+    assert evaluator.num_requests == 2
+    assert evaluator.num_batches == 2
+    for stack, result in zip([[0, 90], [45, -45]], results[::2]):
+        lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop)
+        assert np.allclose(ABD_from_records(result), lam.ABD,
+                           atol=1e-10*lam.A11)
+
+
+if __name__ == '__main__':
+    test_evaluator()
+    test_evaluator_errors()
+    test_evaluator_failing_request()
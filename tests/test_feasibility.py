@@ -0,0 +1,69 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from composites.core import calc_LP_batch
+from composites.feasibility import (LP_CONSTRAINTS, calc_lp_violations,
+                                    is_feasible_lp, sample_feasible_lp)
+
+
+def test_laminates_are_feasible():
+    rng = np.random.default_rng(0)
+    for num_plies in [1, 2, 5, 16]:
+        thetadegs = rng.uniform(-90, 90, (500, num_plies))
+        plyts = rng.uniform(0.1e-3, 0.3e-3, num_plies)
+        lp = np.asarray(calc_LP_batch(thetadegs, plyts))
+        assert np.all(is_feasible_lp(lp, tol=1e-10))
+        thetadegs = rng.choice([0., 45., -45., 90.], (500, num_plies))
+        lp = np.asarray(calc_LP_batch(thetadegs, plyts))
+        assert np.all(is_feasible_lp(lp, tol=1e-10))
+
+
+def test_infeasible():
+    lp = np.zeros((6, 14))
+    # box
+    lp[0, 4] = 1.1
+    # in-plane A: xiA3 < 2*xiA1**2 - 1
+    lp[1, [0, 2]] = [0.9, 0.]
+    # coupling A-B: all plies with the same angle have no coupling
+    lp[2, [0, 4]] = [1., 0.5]
+    # in-plane D
+    lp[3, [9, 11]] = [0.9, -0.9]
+    # coupling A-D: D1 cannot be 1 when A1 is -0.5
+    lp[4, [0, 2, 8, 10]] = [-0.5, 0.5, 1., 1.]
+    # transverse shear
+    lp[5, [12, 13]] = [0.8, 0.8]
+    violations = calc_lp_violations(lp)
+    assert violations.shape == (6, len(LP_CONSTRAINTS))
+    expected = ['box', 'A', 'AB', 'D', 'AD', 'Atrans']
+    for i, name in enumerate(expected):
+        assert violations[i, LP_CONSTRAINTS.index(name)] > 0
+    assert not np.any(is_feasible_lp(lp))
+    assert is_feasible_lp(np.zeros((1, 14)))[0]
+    try:
+        calc_lp_violations(np.zeros((2, 12)))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+
+
+def test_sample_feasible_lp():
+    lp = sample_feasible_lp(2000, rng=1, chunk_size=20000)
+    assert lp.shape == (2000, 14)
+    assert np.all(is_feasible_lp(lp))
+    assert np.all(lp[:, 12:] == lp[:, :2])
+    # uniform in a region symmetric about the origin
+    assert np.allclose(lp.mean(axis=0), 0, atol=0.05)
+    assert np.all(lp == sample_feasible_lp(2000, rng=1, chunk_size=20000))
+    lp = sample_feasible_lp(100, symmetric=True, balanced=True, rng=2)
+    assert np.all(is_feasible_lp(lp))
+    assert np.all(lp[:, 4:8] == 0)
+    assert np.all(lp[:, [1, 3, 13]] == 0)
+
+
+if __name__ == '__main__':
+    test_laminates_are_feasible()
+    test_infeasible()
+    test_sample_feasible_lp()
@@ -0,0 +1,62 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from composites import laminated_plate
+from composites.field import laminate_key, LaminateField
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+plyt = 0.125e-3
+
+
+def test_laminate_key():
+    key = laminate_key([0, 45, -45, 90], plyt=plyt, laminaprop=laminaprop)
+    assert key == laminate_key((0., 45., -45., 90.), plyts=[plyt]*4,
+                               laminaprops=[laminaprop]*4, offset=-0.)
+    assert key == laminate_key(np.array([0, 45, -45, 90]), plyt=plyt,
+                               laminaprop=list(laminaprop), rhos=[0.]*4)
+    assert key != laminate_key([0, 45, -45, 90], plyt=plyt,
+                               laminaprop=laminaprop, offset=1e-4)
+    assert key != laminate_key([0, 45, 90, -45], plyt=plyt,
+                               laminaprop=laminaprop)
+    assert key != laminate_key([0, 45, -45, 90], plyt=plyt,
+                               laminaprop=laminaprop[:2])
+    try:
+        laminate_key([0, 45], plyts=[plyt], laminaprop=laminaprop)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+
+
+def test_laminate_field():
+    stacks = [[0, 45, -45, 90], [45, -45, 0], [0, 45, -45, 90]]
+    rng = np.random.default_rng(0)
+    elements = rng.integers(0, len(stacks), 200)
+    field = LaminateField()
+    prop_ids = field.assign(dict(stack=stacks[i], plyt=plyt,
+                                 laminaprop=laminaprop) for i in elements)
+    assert len(field) == 2
+    assert np.all(field.element_property == prop_ids)
+    assert field.ABD.shape == (2, 6, 6)
+    assert field.Atrans.shape == (2, 2, 2)
+    for i, prop_id in zip(elements, prop_ids):
+        assert np.allclose(field.ABD[prop_id],
+                           laminated_plate(stacks[i], plyt=plyt,
+                                           laminaprop=laminaprop).ABD)
+    lam = field.laminates[0]
+    assert field.intern(stacks[elements[0]], plyt=plyt,
+                        laminaprop=laminaprop) == 0
+    assert field.laminates[0] is lam
+    field.assign([dict(stack=[90], plyt=plyt, laminaprop=laminaprop,
+                       offset=1e-3)])
+    assert len(field) == 3
+    assert field.element_property.shape == (201,)
+    assert field.ABD.shape == (3, 6, 6)
+
+
+if __name__ == '__main__':
+    test_laminate_key()
+    test_laminate_field()
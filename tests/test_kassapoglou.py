@@ -123,6 +123,30 @@ def test_calc_Nxx_crit_combined_shear_full():
     #plt.show()
 
 
+def test_buckling_grad():
+    D = np.array([12.3, 3.1, 0.9, 8.2, 0.7, 3.4])
+    a, b = 0.6, 0.3
+    funcs = [
+        lambda D, **kw: calc_Nxx_crit(a, b, None, 1, D[0], D[1], D[3], D[5],
+                                      **kw),
+        lambda D, **kw: calc_Nxy_crit(a, D[0], D[1], D[2], D[3], D[5], **kw),
+        lambda D, **kw: calc_Nxx_crit_combined_shear_full(500., a, b, *D,
+                                                          **kw),
+        ]
+    for func in funcs:
+        N, grad = func(D, return_grad=True)
+        assert np.isclose(N, func(D))
+        assert grad.shape == (6,)
+        eps = 1e-6*abs(D).max()
+        for k in range(6):
+            Dp = D.copy()
+            Dm = D.copy()
+            Dp[k] += eps
+            Dm[k] -= eps
+            fd = (func(Dp) - func(Dm))/(2*eps)
+            assert np.isclose(grad[k], fd, rtol=1e-4, atol=1e-6*N)
+
+
 def test_calc_beff():
     """Verificatoin based on Kassapoglou's Fig. 7.10
 
@@ -170,6 +194,7 @@ if __name__ == '__main__':
     test_calc_Nxx_crit()
     test_calc_Nxy_crit()
     test_calc_Nxx_crit_combined_shear_full()
+    test_buckling_grad()
     test_calc_beff()
 
     if False:
@@ -0,0 +1,117 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from composites.core import Lamina, taper_ABD
+from composites.stacking import blended_laminates
+from composites.utils import laminated_plate, read_laminaprop
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+stack = [0, 45, -45, 90, 30, 60]
+plyt = 0.125e-3
+names = ('h', 'intrho', 'intrhoz', 'intrhoz2', 'e1', 'e2', 'g12', 'nu12',
+         'nu21', 'scf_k13', 'scf_k23', 'A44', 'E66', 'G16', 'H22')
+
+
+def check_same(lam, ref):
+    for name in names:
+        assert np.isclose(getattr(lam, name), getattr(ref, name),
+                          rtol=1e-12, atol=0), name
+    assert np.allclose(lam.ABD, ref.ABD, rtol=1e-12, atol=0)
+    assert np.allclose(lam.Atrans, ref.Atrans, rtol=1e-12, atol=0)
+
+
+def test_lazy_laminate():
+    ref = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop, rho=1600.,
+                          offset=1e-4)
+    lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop, rho=1600.,
+                          offset=1e-4, lazy=True)
+    assert lam._valid == set()
+    assert np.isclose(lam.intrho, ref.intrho)
+    assert lam._valid == {'thickness', 'mass'}
+    assert np.isclose(lam.A11, ref.A11)
+    assert lam._valid == {'thickness', 'mass', 'constitutive'}
+    check_same(lam, ref)
+
+    # a new offset keeps the thickness only
+    lam.offset = -2e-4
+    assert lam._valid == {'thickness'}
+    check_same(lam, laminated_plate(stack, plyt=plyt, laminaprop=laminaprop,
+                                    rho=1600., offset=-2e-4))
+
+    # new plies invalidate everything
+    lam.plies = laminated_plate([0, 90], plyt=plyt, laminaprop=laminaprop,
+                                rho=1600.).plies
+    assert lam._valid == set()
+    check_same(lam, laminated_plate([0, 90], plyt=plyt,
+                                    laminaprop=laminaprop, rho=1600.,
+                                    offset=-2e-4))
+
+    # plies modified in place
+    lam.plies[0].thetadeg = 30.
+    lam.plies[0].rebuild()
+    lam.invalidate()
+    check_same(lam, laminated_plate([30, 90], plyt=plyt,
+                                    laminaprop=laminaprop, rho=1600.,
+                                    offset=-2e-4))
+
+
+def test_lazy_laminate_modifications():
+    ref = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop)
+    lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop,
+                          lazy=True)
+    # derived attributes invalidate the quantities computed from them
+    e1 = lam.e1
+    lam.A11 = 2*ref.A11
+    assert 'equivalent' not in lam._valid
+    assert lam.e1 > e1
+    assert np.isclose(lam.A11, 2*ref.A11)
+
+    lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop,
+                          lazy=True)
+    lam.make_balanced()
+    ref.make_balanced()
+    ref.calc_equivalent_properties()
+    check_same(lam, ref)
+
+    ply = Lamina()
+    ply.thetadeg = 15.
+    ply.h = plyt
+    ply.matlamina = read_laminaprop(laminaprop)
+    ply.rebuild()
+    lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop,
+                          lazy=True)
+    lam.insert_ply(2, ply)
+    assert 'scf' not in lam._valid
+    check_same(lam, laminated_plate(stack[:2] + [15] + stack[2:], plyt=plyt,
+                                    laminaprop=laminaprop))
+
+    lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop,
+                          lazy=True, calc_scf=False)
+    assert lam.scf_k13 == lam.scf_k23 == 5/6.
+    shifted = lam.shifted(1e-3)
+    assert np.allclose(shifted.ABD, laminated_plate(stack, plyt=plyt,
+                       laminaprop=laminaprop, offset=1e-3).ABD)
+
+
+def test_lazy_laminate_taper():
+    # the C-level readers compute the constitutive terms on demand
+    ref = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop, rho=1600.)
+    lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop, rho=1600.,
+                          lazy=True)
+    assert np.allclose(taper_ABD(lam, [1, 4]), taper_ABD(ref, [1, 4]),
+                       rtol=1e-12, atol=1e-9*ref.A11*plyt)
+    lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop, rho=1600.,
+                          lazy=True)
+    ABD, lp = blended_laminates(lam, [1, 4], [6, 4, 5])
+    ABD_ref, lp_ref = blended_laminates(ref, [1, 4], [6, 4, 5])
+    assert np.allclose(ABD, ABD_ref, rtol=1e-12, atol=1e-9*ref.A11*plyt)
+    assert np.allclose(lp, lp_ref)
+
+
+if __name__ == '__main__':
+    test_lazy_laminate()
+    test_lazy_laminate_modifications()
+    test_lazy_laminate_taper()
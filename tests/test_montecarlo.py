@@ -0,0 +1,86 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from composites import laminated_plate
+from composites.buckling import calc_buckling_factors
+from composites.montecarlo import (StreamingStatistics, monte_carlo,
+                                   EQUIVALENT_NAMES)
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+plyt = 0.125e-3
+stack = [0, 45, -45, 90, 90, -45, 45, 0]
+
+
+def test_streaming_statistics():
+    rng = np.random.default_rng(0)
+    samples = rng.standard_normal((1000, 2, 2))*[[1, 2], [3, 4]] + 10.
+    stats = StreamingStatistics((2, 2), reservoir_size=1000, rng=1)
+    for block in np.array_split(samples, [0, 7, 300, 301, 999]):
+        stats.update(block)
+    assert stats.num == 1000
+    assert np.allclose(stats.mean, samples.mean(axis=0))
+    assert np.allclose(stats.cov, np.cov(samples.reshape(1000, 4).T))
+    assert np.allclose(stats.std, samples.std(axis=0, ddof=1))
+    assert np.all(stats.min == samples.min(axis=0))
+    assert np.all(stats.max == samples.max(axis=0))
+    q = [0.05, 0.5, 0.95]
+    assert np.allclose(stats.quantiles(q), np.quantile(samples, q, axis=0))
+
+    # approximate quantiles with a subset of the samples
+    samples = rng.uniform(0, 1, (200000, 1))
+    stats = StreamingStatistics((1,), reservoir_size=20000, rng=2)
+    for block in np.array_split(samples, 37):
+        stats.update(block)
+    assert np.allclose(stats.quantiles(q)[:, 0], q, atol=0.01)
+    assert stats._reservoir.shape == (20000, 1)
+    try:
+        stats.update(np.zeros((10, 2)))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+
+
+def test_monte_carlo():
+    a = 0.4
+    b = 0.3
+    loads = [[1., 0, 0], [0, 0, 1.]]
+    lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop)
+    D = [[lam.D11, lam.D12, lam.D16, lam.D22, lam.D26, lam.D66]]
+    ref = calc_buckling_factors(a, b, D, loads)[0]
+
+    # no scatter
+    stats = monte_carlo(stack, plyt, laminaprop, 10, a=a, b=b, loads=loads,
+                        block_size=4)
+    assert np.allclose(stats['ABD'].mean, lam.ABD)
+    assert np.allclose(stats['ABD'].std, 0, atol=1e-8*lam.A11)
+    assert np.allclose(stats['equivalent'].mean,
+                       [getattr(lam, name) for name in EQUIVALENT_NAMES])
+    assert np.allclose(stats['buckling'].mean, ref)
+
+    stats = monte_carlo(stack, plyt, laminaprop, 2000, cv_e1=0.05,
+            cv_e2=0.05, cv_g12=0.05, cv_nu12=0.05, cv_plyt=0.03,
+            std_theta=2., a=a, b=b, loads=loads, block_size=300, rng=0)
+    assert stats['ABD'].num == 2000
+    assert np.allclose(stats['equivalent'].mean[0], lam.e1, rtol=0.01)
+    assert np.allclose(stats['buckling'].quantiles(0.5), ref, rtol=0.05)
+    assert np.all(stats['buckling'].std > 0.05*ref)
+    stats2 = monte_carlo(stack, plyt, laminaprop, 2000, cv_e1=0.05,
+            cv_e2=0.05, cv_g12=0.05, cv_nu12=0.05, cv_plyt=0.03,
+            std_theta=2., a=a, b=b, loads=loads, block_size=300, rng=0)
+    assert np.all(stats['buckling'].quantiles(0.1)
+                  == stats2['buckling'].quantiles(0.1))
+    try:
+        monte_carlo(stack, plyt, laminaprop, 10, loads=loads)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+
+
+if __name__ == '__main__':
+    test_streaming_statistics()
+    test_monte_carlo()
@@ -0,0 +1,82 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from composites import laminated_plate
+from composites.utils import read_laminaprop
+from composites.omni import (omni_strain_envelope, calc_omni_reserve_factors,
+                             _material_key, _tsai_wu_strength_ratios)
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+plyt = 0.125e-3
+
+
+def get_material():
+    matlamina = read_laminaprop(laminaprop)
+    matlamina.st1 = 2280e6
+    matlamina.sc1 = 1440e6
+    matlamina.st2 = 57e6
+    matlamina.sc2 = 228e6
+    matlamina.ss12 = 71e6
+    return matlamina
+
+
+def test_omni_envelope():
+    matlamina = get_material()
+    eI, eII = omni_strain_envelope(matlamina)
+    assert eI.shape == eII.shape == (720,)
+    # new arrays computed from the table cached per material
+    assert omni_strain_envelope(get_material())[0] is not eI
+    assert np.all(omni_strain_envelope(get_material())[0] == eI)
+    # the fiber direction under uniaxial strain is not critical
+    assert eI[360] < matlamina.st1/matlamina.e1
+    matlamina.ss12 = 0.
+    try:
+        omni_strain_envelope(matlamina)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+
+
+def test_omni_reserve_factors():
+    matlamina = get_material()
+    key = _material_key(matlamina)
+    rng = np.random.default_rng(0)
+    stacks = rng.choice([0., 45., -45., 90., 30., -60.], (20, 12))
+    loads = rng.uniform(-1e5, 1e5, (5, 3))
+    strains = []
+    for stack in stacks:
+        lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop)
+        strains.append(loads @ np.linalg.inv(lam.ABD)[:3, :3].T)
+    strains = np.array(strains)
+    rf = calc_omni_reserve_factors(matlamina, strains)
+    assert rf.shape == (20, 5)
+    for i, stack in enumerate(stacks):
+        c = np.cos(np.deg2rad(stack))[:, None]
+        s = np.sin(np.deg2rad(stack))[:, None]
+        exx, eyy, gxy = strains[i].T
+        # first ply failure of the actual stacking sequence
+        rf_ply = _tsai_wu_strength_ratios(key,
+                c**2*exx + s**2*eyy + s*c*gxy,
+                s**2*exx + c**2*eyy - s*c*gxy,
+                -2*s*c*exx + 2*s*c*eyy + (c**2 - s**2)*gxy, -0.5).min(axis=0)
+        assert np.all(rf[i] <= rf_ply*(1 + 1e-4))
+        # the omni envelope is the inner envelope of all ply angles
+        angles = np.linspace(0, np.pi, 3601)[:, None]
+        c = np.cos(angles)
+        s = np.sin(angles)
+        rf_all = _tsai_wu_strength_ratios(key,
+                c**2*exx + s**2*eyy + s*c*gxy,
+                s**2*exx + c**2*eyy - s*c*gxy,
+                -2*s*c*exx + 2*s*c*eyy + (c**2 - s**2)*gxy, -0.5).min(axis=0)
+        assert np.allclose(rf[i], rf_all, rtol=1e-3)
+    assert calc_omni_reserve_factors(matlamina, np.zeros(3)) == np.inf
+    assert np.allclose(calc_omni_reserve_factors(matlamina, 2*strains), rf/2)
+
+
+if __name__ == '__main__':
+    test_omni_envelope()
+    test_omni_reserve_factors()
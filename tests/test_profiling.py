@@ -0,0 +1,41 @@
+import sys
+sys.path.append('..')
+
+from composites import laminated_plate, profiling
+
+
+def test_profiling():
+    laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+    stack = [0, 45, -45, 90]
+    # NOTE profiling may be enabled with COMPOSITES_PROFILING=1
+    enabled = profiling.is_enabled()
+    profiling.disable()
+    try:
+        profiling.reset()
+        laminated_plate(stack, plyt=0.125e-3, laminaprop=laminaprop)
+        res = profiling.report()
+        assert all(v['ncalls'] == 0 for v in res.values())
+
+        profiling.enable()
+        try:
+            laminated_plate(stack, plyt=0.125e-3, laminaprop=laminaprop)
+        finally:
+            profiling.disable()
+        res = profiling.report()
+        assert res['MatLamina.rebuild']['ncalls'] == 4
+        assert res['Lamina.rebuild']['ncalls'] == 4
+        assert res['Laminate.calc_constitutive_matrix']['ncalls'] == 1
+        assert res['Laminate.calc_scf']['ncalls'] == 1
+        assert res['Laminate.calc_equivalent_properties']['ncalls'] == 1
+        assert all(v['time'] >= 0 for v in res.values())
+
+        profiling.reset()
+        res = profiling.report()
+        assert all(v['ncalls'] == 0 and v['time'] == 0
+                   for v in res.values())
+    finally:
+        if enabled:
+            profiling.enable()
+
+if __name__ == '__main__':
+    test_profiling()
@@ -0,0 +1,60 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from composites import laminated_plate
+from composites.records import (laminate_dtype, pack_symmetric,
+        unpack_symmetric, records_from_arrays, records_from_laminates,
+        laminate_from_record, ABD_from_records, Atrans_from_records)
+
+
+def test_pack_symmetric():
+    rng = np.random.default_rng(0)
+    M = rng.uniform(size=(4, 3, 6, 6))
+    M = M + M.transpose(0, 1, 3, 2)
+    packed = pack_symmetric(M)
+    assert packed.shape == (4, 3, 21)
+    assert np.allclose(unpack_symmetric(packed), M)
+    try:
+        unpack_symmetric(np.zeros(5))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+
+
+def test_records():
+    laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+    stacks = [[45, -45, 0, 90], [0, 30, -30], [45, 0, 0, 45, 90]]
+    lams = [laminated_plate(stack, plyt=0.125e-3, laminaprop=laminaprop,
+                            rho=1600., offset=offset)
+            for stack, offset in zip(stacks, [0., 0.1e-3, -0.2e-3])]
+    records = records_from_laminates(lams)
+    assert records.dtype == laminate_dtype()
+    assert laminate_dtype(float32=True).itemsize*2 == records.dtype.itemsize
+    ABD = ABD_from_records(records)
+    Atrans = Atrans_from_records(records)
+    for i, lam in enumerate(lams):
+        assert np.allclose(ABD[i], lam.ABD)
+        assert np.allclose(Atrans[i], lam.Atrans)
+        lp = lam.calc_lamination_parameters()
+        assert np.isclose(records['lp'][i, 8], lp.xiD1)
+        assert np.isclose(records['lp'][i, 13], lp.xiAtrans2)
+        lam2 = laminate_from_record(records[i])
+        assert np.allclose(lam2.ABD, lam.ABD)
+        assert np.allclose(lam2.Atrans, lam.Atrans)
+        for name in ['h', 'offset', 'intrho', 'intrhoz', 'intrhoz2', 'e1',
+                     'nu12']:
+            assert np.isclose(getattr(lam2, name), getattr(lam, name))
+
+    records32 = records_from_arrays(ABD, Atrans, lp=records['lp'],
+                                    h=records['h'], float32=True)
+    assert records32['ABD'].dtype == np.float32
+    assert np.allclose(ABD_from_records(records32), ABD, rtol=1e-6)
+    assert np.all(records32['intrho'] == 0)
+
+
+if __name__ == '__main__':
+    test_pack_symmetric()
+    test_records()
@@ -0,0 +1,115 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from composites.utils import laminated_plate
+from composites.stacking import (SubLaminate, parse_stack_notation,
+                                 laminate_from_stack_notation,
+                                 blended_laminates, _power_sum)
+
+
+def test_parse_stack_notation():
+    sublam = parse_stack_notation('[(±45/0/90)_4]_s')
+    assert sublam.symmetric
+    assert sublam.num_plies == 32
+    assert sublam.expand() == ([45., -45., 0., 90.]*4
+                               + [90., 0., -45., 45.]*4)
+    assert sublam.angles() == {45., -45., 0., 90.}
+    assert parse_stack_notation('[0/90]_2s').expand() == [0., 90., 0., 90.,
+                                                          90., 0., 90., 0.]
+    assert parse_stack_notation('[45/-45/0_2/90]s').expand() == [45., -45.,
+            0., 0., 90., 90., 0., 0., -45., 45.]
+    assert parse_stack_notation('[(+-30)/-+60_2]').expand() == [30., -30.,
+            -60., 60., -60., 60.]
+    assert parse_stack_notation('[0/90]_{10}s').num_plies == 40
+    assert parse_stack_notation('0') == SubLaminate([0.])
+    for notation in ['', '[0/90', '0/', '[0/90]_', '[0/a]', '[0/90]_0',
+                     '[0_0/90]', '[0/90]_{0}s']:
+        try:
+            parse_stack_notation(notation)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('ValueError expected for %r' % notation)
+
+
+def test_power_sum():
+    for p in range(10):
+        for r in range(20):
+            assert _power_sum(p, r) == sum(j**p for j in range(r))
+
+
+def test_laminate_from_stack_notation():
+    laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 4.1e9, 3.1e9)
+    plyt = 0.125e-3
+    rho = 1500.
+    for notation in ['[(±45/0/90)_4]_s', '[(+-30/0)_3/90_2/(-+60)_5]',
+                     '[(0/45)_2s/90]_3s', '[0/45/90_3]_7']:
+        stack = parse_stack_notation(notation).expand()
+        for offset in [0., 0.3e-3]:
+            lam = laminate_from_stack_notation(notation, plyt, laminaprop,
+                    rho=rho, offset=offset)
+            ref = laminated_plate(stack, plyt, laminaprop, rho=rho,
+                    offset=offset)
+            assert lam.stack == stack
+            assert len(lam.plies) == len(stack)
+            assert np.isclose(lam.h, ref.h)
+            scale = abs(ref.A).max()
+            for n, name in enumerate(['A', 'B', 'D', 'E', 'F']):
+                assert np.allclose(getattr(lam, name), getattr(ref, name),
+                                   atol=1e-9*scale*ref.h**n)
+            assert np.allclose(lam.H, ref.H, atol=1e-9*scale*ref.h**6)
+            for n, name in [(0, 'Atrans'), (2, 'Dtrans'), (4, 'Ftrans')]:
+                assert np.allclose(getattr(lam, name), getattr(ref, name),
+                                   atol=1e-9*scale*ref.h**n)
+            for n, name in enumerate(['intrho', 'intrhoz', 'intrhoz2']):
+                assert np.isclose(getattr(lam, name), getattr(ref, name),
+                                  atol=1e-12*ref.intrho*ref.h**n)
+            for name in ['e1', 'e2', 'g12', 'nu12', 'scf_k13', 'scf_k23']:
+                assert np.isclose(getattr(lam, name), getattr(ref, name))
+    lam = laminate_from_stack_notation('[(±45/0/90)_4]_s', plyt, laminaprop)
+    assert np.all(lam.B == 0)
+
+
+def test_blended_laminates():
+    laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 4.1e9, 3.1e9)
+    plyt = 0.125e-3
+    guide_stack = [45, -45, 0, 90, 0, 45, -45, 0, 90, 0, -45, 45]
+    guide = laminated_plate(guide_stack, plyt, laminaprop)
+    drop_order = [3, 8, 5, 6, 2, 9]
+    num_plies = np.array([12, 8, 10, 6, 8, 12, 11, 7, 9])
+    ABD, lp = blended_laminates(guide, drop_order, num_plies)
+    assert ABD.shape == (num_plies.shape[0], 6, 6)
+    assert lp.shape == (num_plies.shape[0], 14)
+    for i, n in enumerate(num_plies):
+        dropped = drop_order[:len(guide_stack) - n]
+        stack = [a for j, a in enumerate(guide_stack) if j not in dropped]
+        ref = laminated_plate(stack, plyt, laminaprop)
+        assert np.allclose(ABD[i, :3, :3], ref.ABD[:3, :3])
+        assert np.allclose(ABD[i, :3, 3:], ref.ABD[:3, 3:],
+                           atol=1e-9*ref.A11*plyt)
+        assert np.allclose(ABD[i, 3:, 3:], ref.ABD[3:, 3:])
+        ref_lp = ref.calc_lamination_parameters()
+        assert np.allclose(lp[i], [ref_lp.xiA1, ref_lp.xiA2, ref_lp.xiA3,
+            ref_lp.xiA4, ref_lp.xiB1, ref_lp.xiB2, ref_lp.xiB3, ref_lp.xiB4,
+            ref_lp.xiD1, ref_lp.xiD2, ref_lp.xiD3, ref_lp.xiD4,
+            ref_lp.xiAtrans1, ref_lp.xiAtrans2], atol=1e-12)
+    # the plies of the guide laminate are not rebuilt
+    guide.plies[0].cos2t = 2.
+    _, lp2 = blended_laminates(guide, drop_order, num_plies)
+    assert guide.plies[0].cos2t == 2.
+    assert np.all(lp2 == lp)
+    try:
+        blended_laminates(guide, drop_order, [5])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+
+
+if __name__ == '__main__':
+    test_parse_stack_notation()
+    test_power_sum()
+    test_laminate_from_stack_notation()
+    test_blended_laminates()
@@ -0,0 +1,127 @@
+import sys
+sys.path.append('..')
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from composites.batch import evaluate_stacks
+from composites.sweep import Sweep, stacks_from_indices
+from composites.__main__ import main
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+angles = [0, 45, -45, 90]
+plyt = 0.125e-3
+
+
+def run_sweep(directory):
+    return Sweep(directory, angles, 5, plyt, laminaprop,
+                 shard_size=100).run()
+
+
+def test_stacks_from_indices():
+    stacks = stacks_from_indices(np.arange(4**3), angles, 3)
+    assert stacks.shape == (64, 3)
+    assert len(set(map(tuple, stacks))) == 64
+    assert np.all(stacks[1] == [0, 0, 45])
+    assert np.all(stacks[-1] == [90, 90, 90])
+
+
+def test_sweep():
+    with tempfile.TemporaryDirectory() as tmp:
+        sweep = Sweep(tmp, angles, 5, plyt, laminaprop, shard_size=100)
+        assert sweep.num_stacks == 1024
+        assert sweep.num_shards == 11
+        assert sweep.run(max_shards=3) == 3
+        assert sweep.done_shards() == [0, 1, 2]
+        assert not sweep.is_complete()
+
+        # resuming, with a shard claimed by another process and an
+        # abandoned claim
+        sweep = Sweep(tmp, angles, 5, plyt, laminaprop, shard_size=100,
+                      claim_timeout=60.)
+        open(os.path.join(tmp, 'shard_000004.claim'), 'w').close()
+        stale = os.path.join(tmp, 'shard_000005.claim')
+        open(stale, 'w').close()
+        os.utime(stale, (0, 0))
+        assert sweep.run() == 7
+        assert 4 not in sweep.done_shards()
+        os.remove(os.path.join(tmp, 'shard_000004.claim'))
+        assert sweep.run() == 1
+        assert sweep.is_complete()
+        assert sweep.run() == 0
+        assert sorted(os.listdir(tmp)) == (['manifest.json']
+                + ['shard_%06d.npy' % i for i in range(11)])
+
+        results = sweep.load()
+        stacks = stacks_from_indices(np.arange(1024), angles, 5)
+        rows = np.hstack((stacks, np.full((1024, 5), plyt),
+                          np.zeros((1024, 2))))
+        assert np.all(results == evaluate_stacks(rows, [laminaprop]))
+
+        try:
+            Sweep(tmp, angles, 5, plyt, laminaprop, shard_size=200)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('ValueError expected')
+
+
+def test_sweep_claims():
+    with tempfile.TemporaryDirectory() as tmp:
+        sweep = Sweep(tmp, angles, 5, plyt, laminaprop, shard_size=100,
+                      claim_timeout=60.)
+        path = os.path.join(tmp, 'shard_000000.claim')
+        assert sweep._try_claim(0)
+        assert not sweep._try_claim(0)
+        sweep._release(0)
+        assert not os.path.exists(path)
+
+        # a claim taken over by another process is kept when released
+        assert sweep._try_claim(0)
+        os.utime(path, (0, 0))
+        other = Sweep(tmp, angles, 5, plyt, laminaprop, shard_size=100,
+                      claim_timeout=60.)
+        assert other._try_claim(0)
+        sweep._release(0)
+        assert os.path.exists(path)
+        other._release(0)
+        assert sorted(os.listdir(tmp)) == ['manifest.json']
+
+
+def test_sweep_processes():
+    with tempfile.TemporaryDirectory() as tmp:
+        with ProcessPoolExecutor(3) as executor:
+            nums = list(executor.map(run_sweep, [tmp]*3))
+        sweep = Sweep(tmp, angles, 5, plyt, laminaprop, shard_size=100)
+        assert sum(nums) == sweep.num_shards
+        assert sweep.is_complete()
+
+
+def test_sweep_symmetric_cli():
+    with tempfile.TemporaryDirectory() as tmp:
+        args = ['sweep', tmp, '--angles', '0', '45', '-45', '90',
+                '--num-plies', '6', '--plyt', str(plyt), '--laminaprop']
+        args += [str(value) for value in laminaprop]
+        args += ['--symmetric', '--shard-size', '10']
+        assert main(args + ['--max-shards', '2']) == 0
+        assert main(args) == 0
+        sweep = Sweep(tmp, angles, 6, plyt, laminaprop, symmetric=True,
+                      shard_size=10)
+        assert sweep.num_stacks == 64
+        assert sweep.is_complete()
+        stacks = np.vstack([sweep.stacks(i) for i in range(sweep.num_shards)])
+        assert np.all(stacks == stacks[:, ::-1])
+        results = sweep.load()
+        assert results.shape == (64,)
+        assert np.allclose(results['lp'][:, 4:8], 0)
+
+
+if __name__ == '__main__':
+    test_stacks_from_indices()
+    test_sweep()
+    test_sweep_claims()
+    test_sweep_processes()
+    test_sweep_symmetric_cli()
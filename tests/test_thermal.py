@@ -0,0 +1,93 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from composites import laminated_plate, isotropic_plate
+from composites.thermal import ThermalLaminate
+
+
+laminaprop = (142.5e9, 8.7e9, 0.28, 5.1e9, 5.1e9, 5.1e9)
+plyt = 0.125e-3
+
+
+def set_thermal(lam, a1, a2, tref):
+    for ply in lam.plies:
+        ply.matlamina.a1 = a1
+        ply.matlamina.a2 = a2
+        ply.matlamina.tref = tref
+
+
+def test_isotropic():
+    E = 71e9
+    nu = 0.33
+    alpha = 23e-6
+    h = 2e-3
+    lam = isotropic_plate(thickness=h, E=E, nu=nu, offset=0.5e-3)
+    set_thermal(lam, alpha, alpha, 20.)
+    thermal = ThermalLaminate(lam)
+    T = np.array([[20., 120.], [-50., 80.]])
+    dTdz = 1e4
+    NT, MT = thermal.calc_resultants(T, dTdz)
+    assert NT.shape == MT.shape == (2, 2, 3)
+    z1, z2 = thermal.z
+    for Ti, NTi, MTi in zip(T.ravel(), NT.reshape(-1, 3), MT.reshape(-1, 3)):
+        ref = E*alpha/(1 - nu)*((Ti - 20.)*h + dTdz*(z2**2 - z1**2)/2.)
+        assert np.allclose(NTi, [ref, ref, 0])
+        ref = E*alpha/(1 - nu)*((Ti - 20.)*(z2**2 - z1**2)/2.
+                                + dTdz*(z2**3 - z1**3)/3.)
+        assert np.allclose(MTi, [ref, ref, 0])
+    # a free plate with a linear temperature has no stresses
+    strains = thermal.calc_free_strains(120., dTdz)
+    assert np.allclose(strains, [alpha*100.]*2 + [0]
+                       + [alpha*dTdz]*2 + [0])
+    for position in ['bottom', 'mid', 'top']:
+        stresses = thermal.calc_ply_stresses(T, dTdz, position)
+        assert stresses.shape == (2, 2, 1, 3)
+        assert np.allclose(stresses, 0, atol=1e-6*E*alpha*100)
+
+
+def test_residual_stresses():
+    stack = [0, 45, -45, 90, 30, 90, 0]
+    lam = laminated_plate(stack, plyt=plyt, laminaprop=laminaprop,
+                          offset=0.1e-3)
+    set_thermal(lam, -0.3e-6, 28e-6, 180.)
+    thermal = ThermalLaminate(lam)
+    T = np.linspace(-55., 120., 5)
+    stresses = {position: thermal.calc_ply_stresses(T, 500., position)
+                for position in ['bottom', 'mid', 'top']}
+    NT, MT = thermal.calc_resultants(T, 500.)
+    scale = np.abs(NT).max()
+    # the residual stresses are self-equilibrated
+    N = 0
+    M = 0
+    for k, ply in enumerate(lam.plies):
+        c = np.cos(np.deg2rad(ply.thetadeg))
+        s = np.sin(np.deg2rad(ply.thetadeg))
+        Tsigma = np.array([[c**2, s**2, -2*s*c],
+                           [s**2, c**2, 2*s*c],
+                           [s*c, -s*c, c**2 - s**2]])
+        z1, z2 = thermal.z[k:k+2]
+        bot = stresses['bottom'][:, k] @ Tsigma.T
+        mid = stresses['mid'][:, k] @ Tsigma.T
+        top = stresses['top'][:, k] @ Tsigma.T
+        assert np.allclose(mid, (bot + top)/2)
+        N += (z2 - z1)*mid
+        M += (z2 - z1)*(bot*(2*z1 + z2) + top*(z1 + 2*z2))/6.
+    assert np.allclose(N, 0, atol=1e-10*scale)
+    assert np.allclose(M, 0, atol=1e-10*scale*lam.h)
+    # the stress free state
+    assert np.allclose(thermal.calc_ply_stresses(180.), 0, atol=1e-6)
+    # cooling from the cure puts the 90 deg plies in transverse tension
+    assert np.all(stresses['mid'][0, [3, 5], 1] > 0)
+    try:
+        thermal.calc_ply_stresses(20., position='middle')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+
+
+if __name__ == '__main__':
+    test_isotropic()
+    test_residual_stresses()